@@ -0,0 +1,364 @@
+"""
+Cognima API - Asyncio Client (Python)
+
+Awaitable versions of the endpoint functions from the example scripts.
+Each module mirrors the script of the same name (aio.spotify mirrors
+spotify.py, and so on) with the same function names and return shapes,
+minus the printing. All modules share one aiohttp session, so every
+coroutine on the event loop reuses one keep-alive connection pool.
+
+API calls take the same path as client.request(): lookups are answered
+from client.cache (keyed on the canonical source `url`), and the rest
+wait for quota in client.scheduler, fail fast while their circuit in
+client.breakers is open, run under their family's limiter from
+concurrency.py and are retried per retry.policy_for(). Coroutines and
+threads share those objects, so gathering any number of calls stays
+within the same limits as the sync scripts:
+
+    import asyncio
+    import aio
+    from aio import spotify
+
+    async def main():
+        # At most the 'search' family's limit is in flight at once
+        results = await asyncio.gather(*(spotify.search_spotify(q) for q in queries))
+
+    aio.run(main())
+"""
+
+import asyncio
+import contextlib
+import concurrent.futures
+import io
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+import requests
+from multidict import CIMultiDict, CIMultiDictProxy
+from requests.structures import CaseInsensitiveDict
+from yarl import URL
+
+import breaker
+import client
+import concurrency
+import retry
+from bandwidth import shaper
+from client import API_POOL_SIZE, CDN_POOL_SIZE
+
+# API Configuration
+BASE_URL = os.getenv('COGNIMA_BASE_URL', 'https://cog.api.br/api/v1')
+API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
+
+# Total socket budget and per-host cap for the shared connector
+POOL_SIZE = API_POOL_SIZE + CDN_POOL_SIZE
+TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=120)
+
+# aiohttp's connection errors and timeouts, retried like RETRY_EXCEPTIONS
+RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+class CircuitOpenError(breaker.CircuitOpenError, aiohttp.ClientConnectionError):
+    """breaker.CircuitOpenError that `except aiohttp.ClientError` also catches"""
+
+class RateLimitExceeded(retry.RateLimitExceeded, aiohttp.ClientError):
+    """retry.RateLimitExceeded that `except aiohttp.ClientError` also catches"""
+
+# Longest sleep between quota checks while the bucket is empty
+QUOTA_POLL = 1.0
+
+_session: Optional[aiohttp.ClientSession] = None
+_quota_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='aio-quota')
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared session, creating it on the running loop if needed
+
+    Returns:
+        aiohttp ClientSession
+    """
+    global _session
+
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=POOL_SIZE, limit_per_host=API_POOL_SIZE, ttl_dns_cache=300)
+        _session = aiohttp.ClientSession(connector=connector, timeout=TIMEOUT)
+
+    return _session
+
+async def close():
+    """Close the shared session and its connection pool"""
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+def run(coro) -> Any:
+    """
+    Run a coroutine on a fresh event loop and close the pool afterwards
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Whatever the coroutine returns
+    """
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await close()
+
+    return asyncio.run(_main())
+
+@contextlib.asynccontextmanager
+async def open_stream(method: str, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+    """
+    Open one API call for streaming, under the shared breaker, quota and
+    concurrency limit
+
+    Retryable statuses and connection errors are retried per
+    retry.policy_for() before the response is handed over; once the
+    caller reads the body there are no more retries. Nothing is cached.
+
+    Args:
+        method: HTTP method
+        url: Absolute API URL
+        **kwargs: Passed through to aiohttp (params, json, headers...)
+
+    Yields:
+        aiohttp ClientResponse, body not yet read
+
+    Raises:
+        CircuitOpenError: While the endpoint's circuit is open
+        RateLimitExceeded: If a 429 asks for a longer wait than the
+            endpoint's retry policy accepts
+    """
+    policy = retry.policy_for(url)
+    policy.budget.deposit()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                response = await stack.enter_async_context(_admitted(method, url, kwargs))
+            except CircuitOpenError:
+                raise
+            except RETRY_EXCEPTIONS:
+                if not policy.retry_errors or not policy._may_retry(attempt):
+                    raise
+                delay = policy.backoff(attempt)
+            else:
+                delay = None
+                if response.status in policy.statuses:
+                    # Error bodies are small: read one so the policy can judge it
+                    judged = _as_response(response, await response.read())
+                    client._track_limits(judged)
+                    try:
+                        delay = policy._retry_delay(judged, attempt)
+                    except retry.RateLimitExceeded as e:
+                        raise RateLimitExceeded(str(e), response=e.response, wait=e.wait) from None
+                if delay is None:
+                    yield response
+                    return
+        await asyncio.sleep(delay)
+
+@contextlib.asynccontextmanager
+async def _admitted(method: str, url: str, kwargs: Dict) -> AsyncIterator[aiohttp.ClientResponse]:
+    """One attempt of open_stream()"""
+    circuit = client.breakers.for_url(url)
+    try:
+        await _admit(circuit, url)
+    except breaker.CircuitOpenError as e:
+        raise CircuitOpenError(str(e)) from None
+
+    limiter = concurrency.limiter_for(url)
+    await limiter.acquire_async()
+    start = time.monotonic()
+    overloaded = False
+    status = None
+
+    try:
+        async with get_session().request(method, url, **kwargs) as response:
+            status = response.status
+            overloaded = status in concurrency.OVERLOAD_STATUSES
+            yield response
+    except Exception as e:
+        overloaded = overloaded or isinstance(e, asyncio.TimeoutError)
+        # Errors raised while the caller reads the body count by status
+        circuit.record(status is not None and status < 500)
+        raise
+    else:
+        circuit.record(status < 500)
+    finally:
+        limiter.release(time.monotonic() - start, overloaded)
+
+async def _admit(circuit: breaker.CircuitBreaker, url: str):
+    """Breaker check and quota wait of client.request(), off the event loop when they may block"""
+    if circuit.state == breaker.CLOSED:
+        circuit.before_call()
+    else:
+        # A half-open breaker runs a health check (a network call)
+        await asyncio.to_thread(circuit.before_call)
+
+    scheduler = client.scheduler
+    if scheduler is None or url.startswith(f'{client.BASE_URL}/status'):
+        return
+
+    # Wait for quota on the event loop: only the /status re-read leaves
+    # it, on a one-thread executor, so a drained bucket can't tie up the
+    # default executor's threads
+    while not scheduler.try_acquire():
+        bucket = scheduler.stats()
+        if bucket['tokens'] is None or bucket['refill_in'] <= 0:
+            await asyncio.get_running_loop().run_in_executor(_quota_executor, scheduler.refresh_if_stale)
+        else:
+            # Poll so a refill from another caller's 429 body is seen early
+            await asyncio.sleep(min(bucket['refill_in'], QUOTA_POLL))
+
+async def request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Awaitable client.request(), sharing its cache, quota, breakers,
+    concurrency limits and retry policies
+
+    The body is read in full; use open_stream() for large downloads.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        **kwargs: Passed through to aiohttp (params, json, headers...)
+
+    Returns:
+        requests Response, so the shared policies can judge it
+
+    Raises:
+        CircuitOpenError: While the endpoint's circuit is open
+        RateLimitExceeded: If a 429 asks for a longer wait than the
+            endpoint's retry policy accepts
+    """
+    if not client.is_api_url(url):
+        async with get_session().request(method, url, **kwargs) as response:
+            return _as_response(response, await response.read())
+    cache = client.cache
+    ttl = cache.ttl_for(url) if cache is not None and method in ('GET', 'POST') else 0
+
+    if ttl:
+        key = client._request_key(method, url, kwargs)
+        hit = await asyncio.to_thread(cache.get, key)
+        if hit is not None:
+            return hit.to_response(url)
+
+    async def send() -> requests.Response:
+        # Inner breaker errors aren't aiohttp errors, so they aren't retried
+        circuit = client.breakers.for_url(url)
+        await _admit(circuit, url)
+
+        async def attempt() -> requests.Response:
+            async with get_session().request(method, url, **kwargs) as response:
+                return _as_response(response, await response.read())
+
+        try:
+            response = await concurrency.limited_async(url, attempt)
+        except Exception:
+            circuit.record(False)
+            raise
+
+        circuit.record(response.status_code < 500)
+        return response
+
+    try:
+        response = await retry.policy_for(url).call_async(send, on_response=client._track_limits,
+                                                          errors=RETRY_EXCEPTIONS)
+    except breaker.CircuitOpenError as e:
+        raise CircuitOpenError(str(e)) from None
+    except retry.RateLimitExceeded as e:
+        raise RateLimitExceeded(str(e), response=e.response, wait=e.wait) from None
+
+    if ttl and client._cacheable(response):
+        await asyncio.to_thread(cache.put, key, response, ttl)
+
+    return response
+
+def _as_response(response: aiohttp.ClientResponse, body: bytes) -> requests.Response:
+    """Wrap an aiohttp response and its body as a requests Response"""
+    result = requests.Response()
+    result.status_code = response.status
+    result.reason = response.reason
+    result.headers = CaseInsensitiveDict(response.headers)
+    result.url = str(response.url)
+    result.encoding = response.charset
+    result.raw = io.BytesIO(body)
+    result._content = body
+    return result
+
+def _raise_for_status(method: str, response: requests.Response):
+    """Raise aiohttp.ClientResponseError for 4xx/5xx, as aiohttp's raise_for_status() does"""
+    if response.status_code < 400:
+        return
+
+    url = URL(response.url)
+    headers = CIMultiDictProxy(CIMultiDict(response.headers))
+    info = aiohttp.RequestInfo(url, method, CIMultiDictProxy(CIMultiDict()), url)
+    raise aiohttp.ClientResponseError(info, (), status=response.status_code,
+                                      message=response.reason or '', headers=headers)
+
+async def request_json(method: str, path: str, raise_for_status: bool = True, **kwargs) -> Dict:
+    """
+    Send an API request (see request()) and parse the JSON body
+
+    Args:
+        method: HTTP method
+        path: Path under BASE_URL (e.g. '/spotify/search') or absolute URL
+        raise_for_status: Raise aiohttp.ClientResponseError on 4xx/5xx
+        **kwargs: Passed through to aiohttp (params, json, headers...)
+
+    Returns:
+        Parsed JSON body
+    """
+    url = path if path.startswith('http') else f'{BASE_URL}{path}'
+
+    response = await request(method, url, **kwargs)
+    if raise_for_status:
+        _raise_for_status(method, response)
+    return response.json()
+
+async def get_json(path: str, **kwargs) -> Dict:
+    """Send a GET request and parse the JSON body"""
+    return await request_json('GET', path, **kwargs)
+
+async def post_json(path: str, **kwargs) -> Dict:
+    """Send a POST request and parse the JSON body"""
+    return await request_json('POST', path, **kwargs)
+
+async def download_to_file(url: str, output_path: str, chunk_size: int = 65536,
+                           job_class: str = 'interactive', **kwargs) -> int:
+    """
+    Stream a URL to disk
+
+    API URLs go through open_stream(), so they count against the
+    shared quota and concurrency limits like any other API call.
+
+    Args:
+        url: File URL (usually a downloadUrl returned by the API)
+        output_path: Where to save the file
+        chunk_size: Read size in bytes
+        job_class: Bandwidth class ('interactive' or 'bulk')
+        **kwargs: Passed through to aiohttp (params, headers...)
+
+    Returns:
+        Number of bytes written
+    """
+    written = 0
+
+    opened = open_stream('GET', url, **kwargs) if client.is_api_url(url) else get_session().get(url, **kwargs)
+
+    async with opened as response:
+        response.raise_for_status()
+        with open(output_path, 'wb') as f:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                await shaper.acquire_async(len(chunk), response.url.host, job_class)
+                f.write(chunk)
+                written += len(chunk)
+
+    return written
@@ -0,0 +1,59 @@
+"""
+Cognima API - Universal Download (AllDL) Examples (Python, asyncio)
+
+Awaitable mirror of alldl.py.
+"""
+
+import formats
+from aio import get_json
+
+async def download_all_media(url: str) -> dict:
+    """
+    Download all available media from any URL
+
+    Args:
+        url: Any URL supported by yt-dlp
+
+    Returns:
+        dict: All media data or None if error
+    """
+    try:
+        data = await get_json('/alldl', params={'url': url}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def download_by_type(url: str, media_type: str) -> dict:
+    """
+    Download media filtered by type
+
+    Args:
+        url: Any URL supported by yt-dlp
+        media_type: Media type - 'video', 'audio', or 'image'
+
+    Returns:
+        dict: Filtered media data or None if error
+    """
+    try:
+        data = await get_json('/alldl/type', params={'url': url, 'type': media_type}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_best_quality(url: str, spec: str = 'best') -> dict:
+    """
+    Get the media item that best matches a format spec
+
+    Args:
+        url: Any URL supported by yt-dlp
+        spec: Format spec (see formats.parse); the default 'best' is
+            the item the API marks isBest
+
+    Returns:
+        dict: Selected media or None if error or nothing matches
+    """
+    result = await download_all_media(url)
+    if not result:
+        return None
+
+    return formats.select(result['media'], spec)
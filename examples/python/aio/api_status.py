@@ -0,0 +1,22 @@
+"""
+Cognima API - API Status Examples (Python, asyncio)
+
+Awaitable mirror of api_status.py. Each function returns the response
+`data` instead of printing it.
+"""
+
+from aio import API_KEY, get_json
+
+headers = {
+    'X-API-Key': API_KEY
+}
+
+async def get_status() -> dict:
+    """Get API key usage and limits"""
+    result = await get_json('/status', headers=headers)
+    return result['data']
+
+async def get_models_stats(days: int = 7) -> dict:
+    """Get model usage statistics"""
+    result = await get_json('/status/models', params={'days': days}, headers=headers)
+    return result['data']
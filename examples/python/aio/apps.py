@@ -0,0 +1,38 @@
+"""
+Cognima API - App Store Search Examples (Python, asyncio)
+
+Awaitable mirror of apps.py.
+"""
+
+import aiohttp
+
+from aio import API_KEY, get_json
+
+headers = {'Authorization': f'Bearer {API_KEY}'}
+
+async def _get_data(path: str, params: dict):
+    try:
+        data = await get_json(path, params=params, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def search_all_stores(query: str, num: int = 10, country: str = 'br'):
+    """Pesquisar apps em ambas as lojas (Google Play + App Store)"""
+    return await _get_data('/apps/search', {'q': query, 'num': num, 'country': country})
+
+async def search_playstore(query: str, num: int = 10, country: str = 'br', lang: str = 'pt'):
+    """Pesquisar apenas na Google Play Store"""
+    return await _get_data('/apps/playstore', {'q': query, 'num': num, 'country': country, 'lang': lang})
+
+async def search_appstore(query: str, num: int = 10, country: str = 'br'):
+    """Pesquisar apenas na Apple App Store"""
+    return await _get_data('/apps/appstore', {'q': query, 'num': num, 'country': country})
+
+async def get_app_details(app_id: str, store: str = 'playStore', country: str = 'br'):
+    """Obter detalhes de um app específico"""
+    return await _get_data('/apps/details', {'appId': app_id, 'store': store, 'country': country})
+
+async def get_similar_apps(app_id: str, store: str = 'playStore', num: int = 10):
+    """Obter apps similares"""
+    return await _get_data('/apps/similar', {'appId': app_id, 'store': store, 'num': num})
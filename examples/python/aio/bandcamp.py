@@ -0,0 +1,55 @@
+"""
+Cognima API - Bandcamp Examples (Python, asyncio)
+
+Awaitable mirror of bandcamp.py.
+"""
+
+from aio import get_json
+
+async def download_bandcamp(url: str) -> dict:
+    """
+    Download track/album from Bandcamp
+
+    Args:
+        url: Bandcamp track or album URL
+
+    Returns:
+        dict: Download data or None if error
+    """
+    try:
+        data = await get_json('/bandcamp/download', params={'url': url}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_bandcamp_formats(url: str) -> list:
+    """
+    Get available formats for Bandcamp track/album
+
+    Args:
+        url: Bandcamp track or album URL
+
+    Returns:
+        list: Available formats or None if error
+    """
+    try:
+        data = await get_json('/bandcamp/formats', params={'url': url}, raise_for_status=False)
+        return data['formats'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_bandcamp_info(url: str) -> dict:
+    """
+    Get information about Bandcamp track/album
+
+    Args:
+        url: Bandcamp track or album URL
+
+    Returns:
+        dict: Information or None if error
+    """
+    try:
+        data = await get_json('/bandcamp/info', params={'url': url}, raise_for_status=False)
+        return data['info'] if data.get('success') else None
+    except Exception:
+        return None
@@ -0,0 +1,26 @@
+"""
+Cognima API - Chat Completion Examples (Python, asyncio)
+
+Awaitable mirror of chat_completion.py. Returns the full response body
+(`data` and `usage`) instead of printing it.
+"""
+
+from typing import Dict, List
+
+from aio import API_KEY, post_json
+
+headers = {
+    'X-API-Key': API_KEY,
+    'Content-Type': 'application/json'
+}
+
+async def chat_completion(messages: List[Dict], model: str = 'microsoft/phi-3-medium-128k-instruct',
+                          max_tokens: int = 500, temperature: float = 0.7) -> dict:
+    """Create a chat completion"""
+    data = {
+        'model': model,
+        'messages': messages,
+        'max_tokens': max_tokens,
+        'temperature': temperature
+    }
+    return await post_json('/completion', json=data, headers=headers)
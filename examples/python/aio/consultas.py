@@ -0,0 +1,89 @@
+"""
+Cognima API - Data Queries (Python, asyncio)
+
+Awaitable mirror of consultas.py. Queries go to the consultas host
+instead of BASE_URL and return the full response body; HTTP errors
+(403 for keys without the required plan, 400 for invalid data) raise
+aiohttp.ClientResponseError instead of being printed.
+"""
+
+from typing import Dict
+
+from aio import API_KEY, get_json
+
+BASE_URL = 'https://consultas.cog.api.br/api/v1'
+
+headers = {'X-API-Key': API_KEY}
+
+async def check_status() -> Dict:
+    """Check Telegram bot connection status"""
+    return await get_json(f'{BASE_URL}/consulta/status', headers=headers)
+
+async def perform_query(query_type: str, data: str) -> Dict:
+    """
+    Perform a data query
+
+    Args:
+        query_type: Query type (cpf, nome, telefone, etc.)
+        data: Data to query
+
+    Returns:
+        Query result dictionary
+    """
+    return await get_json(f'{BASE_URL}/consulta', params={'type': query_type, 'dados': data}, headers=headers)
+
+async def query_by_cpf(cpf: str) -> Dict:
+    """Query by CPF"""
+    return await perform_query('cpf', cpf)
+
+async def query_by_name(name: str) -> Dict:
+    """Query by name"""
+    return await perform_query('nome', name)
+
+async def query_by_phone(phone: str) -> Dict:
+    """Query by phone"""
+    return await perform_query('telefone', phone)
+
+async def query_by_email(email: str) -> Dict:
+    """Query by email"""
+    return await perform_query('email', email)
+
+async def query_by_plate(plate: str) -> Dict:
+    """Query by vehicle plate"""
+    return await perform_query('placa', plate)
+
+async def query_by_cnpj(cnpj: str) -> Dict:
+    """Query by CNPJ"""
+    return await perform_query('cnpj', cnpj)
+
+async def query_neighbors(cpf: str) -> Dict:
+    """Query neighbors by CPF"""
+    return await perform_query('vizinhos', cpf)
+
+async def query_relatives(cpf: str) -> Dict:
+    """Query relatives by CPF"""
+    return await perform_query('parentes', cpf)
+
+async def query_addresses(cpf: str) -> Dict:
+    """Query addresses by CPF"""
+    return await perform_query('enderecos', cpf)
+
+async def query_jobs(cpf: str) -> Dict:
+    """Query jobs by CPF"""
+    return await perform_query('empregos', cpf)
+
+async def query_vaccines(cpf: str) -> Dict:
+    """Query vaccines by CPF"""
+    return await perform_query('vacinas', cpf)
+
+async def query_benefits(cpf: str) -> Dict:
+    """Query benefits by CPF"""
+    return await perform_query('beneficios', cpf)
+
+async def query_score(cpf: str) -> Dict:
+    """Query credit score by CPF"""
+    return await perform_query('score', cpf)
+
+async def query_cnh(cpf: str) -> Dict:
+    """Query driver's license by CPF"""
+    return await perform_query('cnh', cpf)
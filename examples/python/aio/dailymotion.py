@@ -0,0 +1,55 @@
+"""
+Cognima API - Dailymotion Examples (Python, asyncio)
+
+Awaitable mirror of dailymotion.py.
+"""
+
+from aio import get_json
+
+async def download_dailymotion(url: str) -> dict:
+    """
+    Download video from Dailymotion
+
+    Args:
+        url: Dailymotion video URL
+
+    Returns:
+        dict: Download data or None if error
+    """
+    try:
+        data = await get_json('/dailymotion/download', params={'url': url}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_dailymotion_formats(url: str) -> list:
+    """
+    Get available formats for Dailymotion video
+
+    Args:
+        url: Dailymotion video URL
+
+    Returns:
+        list: Available formats or None if error
+    """
+    try:
+        data = await get_json('/dailymotion/formats', params={'url': url}, raise_for_status=False)
+        return data['formats'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_dailymotion_info(url: str) -> dict:
+    """
+    Get information about Dailymotion video
+
+    Args:
+        url: Dailymotion video URL
+
+    Returns:
+        dict: Information or None if error
+    """
+    try:
+        data = await get_json('/dailymotion/info', params={'url': url}, raise_for_status=False)
+        return data['info'] if data.get('success') else None
+    except Exception:
+        return None
@@ -0,0 +1,166 @@
+"""
+Cognima API - Facebook Download Examples (Python, asyncio)
+
+Awaitable mirror of facebook.py.
+"""
+
+import asyncio
+from typing import List, Dict
+
+from aio import API_KEY, get_json
+from facebook import pick_quality
+
+# Configure headers
+headers = {
+    'apikey': API_KEY
+}
+
+async def download_facebook_video(url: str) -> List[Dict]:
+    """
+    Download Facebook video (all quality options)
+
+    Args:
+        url: Facebook video URL
+
+    Returns:
+        List of video quality options
+    """
+    data = await get_json('/facebook/download', params={'url': url}, headers=headers)
+    return data['videos'] if data['success'] else []
+
+async def download_facebook_video_hd(url: str) -> Dict:
+    """
+    Download Facebook video in best quality (HD preferred)
+
+    Args:
+        url: Facebook video URL
+
+    Returns:
+        Best quality video information
+    """
+    data = await get_json('/facebook/download-hd', params={'url': url}, headers=headers)
+    return data['video'] if data['success'] else {}
+
+async def download_multiple_videos(urls: List[str]) -> List[Dict]:
+    """
+    Download multiple Facebook videos
+
+    Args:
+        urls: List of Facebook video URLs
+
+    Returns:
+        List of download results, in the same order as urls
+    """
+    async def _one(url: str) -> Dict:
+        try:
+            data = await get_json('/facebook/download-hd', params={'url': url}, headers=headers)
+            return {'url': url, 'success': True, 'video': data['video']}
+        except Exception as e:
+            return {'url': url, 'success': False, 'error': str(e)}
+
+    return list(await asyncio.gather(*(_one(u) for u in urls)))
+
+async def download_specific_quality(url: str, preferred_resolution: str) -> Dict:
+    """
+    Get specific quality from Facebook video
+
+    Args:
+        url: Facebook video URL
+        preferred_resolution: Preferred resolution (see facebook.pick_quality)
+
+    Returns:
+        Video information for preferred quality
+    """
+    videos = await download_facebook_video(url)
+    if not videos:
+        return {}
+
+    return pick_quality(videos, preferred_resolution)
+
+async def get_video_info(url: str) -> Dict:
+    """
+    Get video information without downloading
+
+    Args:
+        url: Facebook video URL
+
+    Returns:
+        Dictionary with video information
+    """
+    videos = await download_facebook_video(url)
+    if not videos:
+        return {}
+
+    best_quality = (
+        next((v for v in videos if '1080p' in v['resolution']), None) or
+        next((v for v in videos if '720p' in v['resolution']), None) or
+        videos[0]
+    )
+
+    return {
+        'totalQualities': len(videos),
+        'qualities': [v['resolution'] for v in videos],
+        'bestQuality': best_quality['resolution']
+    }
+
+async def compare_qualities(url: str) -> List[Dict]:
+    """
+    Download and compare qualities
+
+    Args:
+        url: Facebook video URL
+
+    Returns:
+        List of quality comparisons
+    """
+    videos = await download_facebook_video(url)
+
+    return [
+        {
+            'resolution': video['resolution'],
+            'hasThumbnail': bool(video['thumbnail']),
+            'needsRender': video['shouldRender'],
+            'isDirectLink': not video['shouldRender']
+        }
+        for video in videos
+    ]
+
+async def download_best_from_multiple_sources(urls: List[str]) -> List[Dict]:
+    """
+    Download best quality from multiple Facebook video URLs
+
+    Args:
+        urls: List of Facebook video URLs
+
+    Returns:
+        List of best quality videos, in the same order as urls
+    """
+    async def _one(url: str) -> Dict:
+        try:
+            return {'url': url, 'video': await download_facebook_video_hd(url), 'success': True}
+        except Exception as e:
+            return {'url': url, 'error': str(e), 'success': False}
+
+    return list(await asyncio.gather(*(_one(u) for u in urls)))
+
+async def filter_by_resolution(url: str, min_resolution: str = '720p') -> List[Dict]:
+    """
+    Filter video qualities by minimum resolution
+
+    Args:
+        url: Facebook video URL
+        min_resolution: Minimum resolution required
+
+    Returns:
+        List of filtered video qualities
+    """
+    videos = await download_facebook_video(url)
+
+    resolution_order = {'1080p': 3, '720p': 2, '480p': 1, '360p': 0}
+    min_value = resolution_order.get(min_resolution, 1)
+
+    return [
+        v for v in videos
+        if any(res in v['resolution'] for res in resolution_order.keys()
+               if resolution_order[res] >= min_value)
+    ]
@@ -0,0 +1,56 @@
+"""
+Cognima API - Free Fire Likes Examples (Python, asyncio)
+
+Awaitable mirror of freefire.py.
+"""
+
+import asyncio
+from typing import Dict, List
+
+from aio import API_KEY, get_json
+
+headers = {'X-API-Key': API_KEY}
+
+async def get_service_info() -> Dict:
+    """Get Free Fire Likes service information"""
+    return await get_json('/freefire/info', headers=headers)
+
+async def send_likes(player_id: str) -> Dict:
+    """
+    Send likes to a Free Fire player
+
+    Args:
+        player_id: Player UID (8-10 digits)
+
+    Returns:
+        Response data dictionary
+    """
+    return await get_json('/freefire/sendlikes', params={'playerId': player_id}, headers=headers)
+
+async def send_likes_to_multiple_players(player_ids: List[str]) -> Dict[str, List[str]]:
+    """
+    Send likes to multiple players
+
+    Args:
+        player_ids: List of player UIDs
+
+    Returns:
+        Dictionary with successful, failed, and not counted player IDs
+    """
+    results = {
+        'successful': [],
+        'failed': [],
+        'not_counted': []
+    }
+
+    responses = await asyncio.gather(*(send_likes(p) for p in player_ids), return_exceptions=True)
+
+    for player_id, result in zip(player_ids, responses):
+        if isinstance(result, BaseException) or not result.get('success'):
+            results['failed'].append(player_id)
+        elif result.get('data', {}).get('usageCounted'):
+            results['successful'].append(player_id)
+        else:
+            results['not_counted'].append(player_id)
+
+    return results
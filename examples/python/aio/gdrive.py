@@ -0,0 +1,36 @@
+"""
+Cognima API - Google Drive Examples (Python, asyncio)
+
+Awaitable mirror of gdrive.py. The example URL the sync script hard-codes
+is a parameter here.
+"""
+
+import aiohttp
+
+from aio import API_KEY, get_json, download_to_file
+
+headers = {'Authorization': f'Bearer {API_KEY}'}
+
+async def get_gdrive_info(url: str):
+    """Obter informações de arquivo do Google Drive"""
+    try:
+        data = await get_json('/gdrive/info', params={'url': url}, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def download_gdrive(url: str):
+    """Obter link de download do Google Drive"""
+    try:
+        data = await get_json('/gdrive/download', params={'url': url}, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def download_file_to_disk(gdrive_url: str, output_path: str):
+    """Baixar arquivo diretamente para o disco"""
+    try:
+        data = await get_json('/gdrive/download', params={'url': gdrive_url}, headers=headers)
+        await download_to_file(data['data']['downloadUrl'], output_path)
+    except aiohttp.ClientError:
+        return None
@@ -0,0 +1,19 @@
+"""
+Cognima API - Instagram Examples (Python, asyncio)
+
+Awaitable mirror of instagram.py. The example input the sync script
+hard-codes is a parameter here, and each function returns the response
+`data` instead of printing it.
+"""
+
+from aio import API_KEY, post_json
+
+headers = {
+    'X-API-Key': API_KEY,
+    'Content-Type': 'application/json'
+}
+
+async def download_instagram(url: str) -> dict:
+    """Download an Instagram post"""
+    result = await post_json('/instagram/download', json={'url': url}, headers=headers)
+    return result['data']
@@ -0,0 +1,39 @@
+"""
+Cognima API - Likee Examples (Python, asyncio)
+
+Awaitable mirror of likee.py.
+"""
+
+from aio import get_json
+
+async def download_likee(url: str) -> dict:
+    """
+    Download video from Likee
+
+    Args:
+        url: Likee video URL
+
+    Returns:
+        dict: Download data or None if error
+    """
+    try:
+        data = await get_json('/likee/download', params={'url': url}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_likee_info(url: str) -> dict:
+    """
+    Get information about Likee video
+
+    Args:
+        url: Likee video URL
+
+    Returns:
+        dict: Information or None if error
+    """
+    try:
+        data = await get_json('/likee/info', params={'url': url}, raise_for_status=False)
+        return data['info'] if data.get('success') else None
+    except Exception:
+        return None
@@ -0,0 +1,19 @@
+"""
+Cognima API - Lyrics Examples (Python, asyncio)
+
+Awaitable mirror of lyrics.py. The example input the sync script
+hard-codes is a parameter here, and each function returns the response
+`data` instead of printing it.
+"""
+
+from aio import API_KEY, post_json
+
+headers = {
+    'X-API-Key': API_KEY,
+    'Content-Type': 'application/json'
+}
+
+async def search_lyrics(query: str) -> dict:
+    """Search song lyrics"""
+    result = await post_json('/lyrics/search', json={'query': query}, headers=headers)
+    return result['data']
@@ -0,0 +1,36 @@
+"""
+Cognima API - MediaFire Examples (Python, asyncio)
+
+Awaitable mirror of mediafire.py. The example URL the sync script hard-codes
+is a parameter here.
+"""
+
+import aiohttp
+
+from aio import API_KEY, get_json, download_to_file
+
+headers = {'Authorization': f'Bearer {API_KEY}'}
+
+async def get_mediafire_info(url: str):
+    """Obter informações de arquivo do MediaFire"""
+    try:
+        data = await get_json('/mediafire/info', params={'url': url}, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def download_mediafire(url: str):
+    """Obter link de download do MediaFire"""
+    try:
+        data = await get_json('/mediafire/download', params={'url': url}, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def download_file_to_disk(mediafire_url: str, output_path: str):
+    """Baixar arquivo diretamente para o disco"""
+    try:
+        data = await get_json('/mediafire/download', params={'url': mediafire_url}, headers=headers)
+        await download_to_file(data['data']['downloadUrl'], output_path)
+    except aiohttp.ClientError:
+        return None
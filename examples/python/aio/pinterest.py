@@ -0,0 +1,24 @@
+"""
+Cognima API - Pinterest Examples (Python, asyncio)
+
+Awaitable mirror of pinterest.py. The example input the sync script
+hard-codes is a parameter here, and each function returns the response
+`data` instead of printing it.
+"""
+
+from aio import API_KEY, post_json
+
+headers = {
+    'X-API-Key': API_KEY,
+    'Content-Type': 'application/json'
+}
+
+async def search_pinterest(query: str) -> dict:
+    """Search images on Pinterest"""
+    result = await post_json('/pinterest/search', json={'query': query}, headers=headers)
+    return result['data']
+
+async def download_pinterest(url: str) -> dict:
+    """Download media from a Pinterest pin"""
+    result = await post_json('/pinterest/download', json={'url': url}, headers=headers)
+    return result['data']
@@ -0,0 +1,39 @@
+"""
+Cognima API - Reddit Examples (Python, asyncio)
+
+Awaitable mirror of reddit.py.
+"""
+
+from aio import get_json
+
+async def download_reddit(url: str) -> dict:
+    """
+    Download media from a Reddit post
+
+    Args:
+        url: Reddit post URL
+
+    Returns:
+        dict: Download data or None if error
+    """
+    try:
+        data = await get_json('/reddit/download', params={'url': url}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_reddit_info(url: str) -> dict:
+    """
+    Get information about a Reddit post
+
+    Args:
+        url: Reddit post URL
+
+    Returns:
+        dict: Information or None if error
+    """
+    try:
+        data = await get_json('/reddit/info', params={'url': url}, raise_for_status=False)
+        return data['info'] if data.get('success') else None
+    except Exception:
+        return None
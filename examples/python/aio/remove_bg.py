@@ -0,0 +1,20 @@
+"""
+Cognima API - Remove Background (Python, asyncio)
+
+Awaitable mirror of remove_bg.py. The image URL the sync script
+hard-codes is a parameter here, and the response body is returned
+instead of printed (`result.download` holds the processed image link).
+"""
+
+from typing import Dict
+
+from aio import API_KEY, post_json
+
+headers = {
+    'X-API-Key': API_KEY,
+    'Content-Type': 'application/json'
+}
+
+async def remove_background(image_url: str) -> Dict:
+    """Remove the background of an image"""
+    return await post_json('/image/remove-bg', json={'url': image_url}, headers=headers)
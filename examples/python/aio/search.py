@@ -0,0 +1,41 @@
+"""
+Cognima API - Web Search Examples (Python, asyncio)
+
+Awaitable mirror of search.py.
+"""
+
+import asyncio
+
+import aiohttp
+
+from aio import API_KEY, get_json
+
+headers = {'Authorization': f'Bearer {API_KEY}'}
+
+async def search_web(query: str, max_results: int = 10):
+    """Pesquisa web geral usando DuckDuckGo"""
+    try:
+        data = await get_json('/search', params={'q': query, 'max': max_results}, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def search_news(query: str, max_results: int = 10):
+    """Pesquisa de notícias"""
+    try:
+        data = await get_json('/search/news', params={'q': query, 'max': max_results}, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def multi_search(queries: list):
+    """Pesquisa múltipla (consultas em paralelo)"""
+    async def _one(query: str) -> list:
+        try:
+            data = await get_json('/search', params={'q': query, 'max': 3}, headers=headers)
+            return data['data']['results']
+        except Exception:
+            return []
+
+    results = await asyncio.gather(*(_one(q) for q in queries))
+    return dict(zip(queries, results))
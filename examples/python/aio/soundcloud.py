@@ -0,0 +1,150 @@
+"""
+Cognima API - SoundCloud Examples (Python, asyncio)
+
+Awaitable mirror of soundcloud.py. Batch helpers run their searches
+concurrently instead of sleeping between them.
+"""
+
+import asyncio
+from typing import List, Dict
+
+from aio import API_KEY, get_json
+
+# Configure headers
+headers = {
+    'apikey': API_KEY
+}
+
+async def search_soundcloud(query: str, limit: int = 10) -> List[Dict]:
+    """
+    Search for tracks on SoundCloud
+
+    Args:
+        query: Track name or artist
+        limit: Number of results
+
+    Returns:
+        List of tracks
+    """
+    data = await get_json('/soundcloud/search', params={'q': query, 'limit': limit}, headers=headers)
+    return data['results']
+
+async def search_one_track(query: str) -> Dict:
+    """
+    Search for a specific track (returns only the first result)
+
+    Args:
+        query: Track name or artist
+
+    Returns:
+        First track found
+    """
+    data = await get_json('/soundcloud/search-one', params={'q': query}, headers=headers)
+    return data['result']
+
+async def search_multiple_tracks(queries: List[str]) -> List[Dict]:
+    """
+    Search for multiple different tracks
+
+    Args:
+        queries: List of track names
+
+    Returns:
+        List of tracks found, in the same order as queries
+    """
+    return list(await asyncio.gather(*(search_one_track(q) for q in queries)))
+
+async def get_recommendations(query: str, count: int = 5) -> List[Dict]:
+    """
+    Get track recommendations based on a search
+
+    Args:
+        query: Track name or artist
+        count: Number of recommendations
+
+    Returns:
+        List of recommended tracks
+    """
+    return await search_soundcloud(query, count)
+
+async def download_track(url: str) -> Dict:
+    """
+    Download track from SoundCloud by URL
+
+    Args:
+        url: SoundCloud track URL
+
+    Returns:
+        Dictionary with download information
+    """
+    data = await get_json('/soundcloud/download', params={'url': url}, headers=headers)
+    return data['data'] if data['success'] else {}
+
+async def search_and_download(query: str) -> Dict:
+    """
+    Search and download track automatically
+
+    Args:
+        query: Track name or artist
+
+    Returns:
+        Dictionary with track and download information
+    """
+    data = await get_json('/soundcloud/search-download', params={'q': query}, headers=headers)
+    if data['success']:
+        return {'track': data['track'], 'download': data['download']}
+
+    return {}
+
+async def search_by_genre(genre: str, limit: int = 10) -> List[Dict]:
+    """
+    Search by genre and get top tracks
+
+    Args:
+        genre: Genre name
+        limit: Number of results
+
+    Returns:
+        List of tracks from the genre
+    """
+    return await search_soundcloud(genre, limit)
+
+async def get_trending_tracks(query: str, limit: int = 10) -> List[Dict]:
+    """
+    Get trending tracks based on play count
+
+    Args:
+        query: Search query
+        limit: Number of results
+
+    Returns:
+        List of trending tracks
+    """
+    results = await search_soundcloud(query, limit)
+    return sorted(results, key=lambda x: x['playback_count'], reverse=True)
+
+async def download_multiple_tracks(queries: List[str]) -> List[Dict]:
+    """
+    Search and download multiple tracks
+
+    Args:
+        queries: List of track searches
+
+    Returns:
+        List of download results (failed queries are left out)
+    """
+    results = await asyncio.gather(*(search_and_download(q) for q in queries), return_exceptions=True)
+    return [r for r in results if not isinstance(r, BaseException)]
+
+async def create_playlist_from_searches(queries: List[str]) -> List[Dict]:
+    """
+    Create a playlist by searching for multiple tracks
+
+    Args:
+        queries: List of track searches
+
+    Returns:
+        List of tracks for the playlist
+    """
+    results = await asyncio.gather(*(search_one_track(q) for q in queries), return_exceptions=True)
+    return [r for r in results if not isinstance(r, BaseException)]
@@ -0,0 +1,170 @@
+"""
+Cognima API - Spotify Examples (Python, asyncio)
+
+Awaitable mirror of spotify.py. Batch helpers run their searches
+concurrently instead of sleeping between them.
+"""
+
+import asyncio
+import os
+from typing import List, Dict, Optional
+
+from aio import BASE_URL, get_json, open_stream
+from bandwidth import shaper
+
+async def search_spotify(query: str, limit: int = 10) -> List[Dict]:
+    """
+    Search for tracks on Spotify
+
+    Args:
+        query: Track name or artist
+        limit: Number of results (default: 10, max: 50)
+
+    Returns:
+        List of tracks
+    """
+    data = await get_json('/spotify/search', params={'q': query, 'limit': limit})
+    return data['results'] if data['success'] else []
+
+async def search_one_track(query: str) -> Optional[Dict]:
+    """
+    Search for a specific track (returns first result)
+
+    Args:
+        query: Track name or artist
+
+    Returns:
+        Dictionary with track info or None
+    """
+    data = await get_json('/spotify/search-one', params={'q': query})
+    return data['result'] if data['success'] else None
+
+async def search_multiple_tracks(queries: List[str]) -> List[Dict]:
+    """
+    Search for multiple tracks from different artists
+
+    Args:
+        queries: List of search queries
+
+    Returns:
+        List of results, in the same order as queries
+    """
+    async def _one(query: str) -> Dict:
+        try:
+            return {'query': query, 'result': await search_one_track(query)}
+        except Exception as e:
+            return {'query': query, 'error': str(e)}
+
+    return list(await asyncio.gather(*(_one(q) for q in queries)))
+
+async def get_recommendations(query: str, count: int = 5) -> List[Dict]:
+    """
+    Get track recommendations based on a search
+
+    Args:
+        query: Track name or artist
+        count: Number of recommendations
+
+    Returns:
+        List of recommended tracks
+    """
+    data = await get_json('/spotify/search', params={'q': query, 'limit': count})
+    return data['results']
+
+async def create_playlist_from_searches(queries: List[str]) -> List[Dict]:
+    """
+    Create a playlist by searching multiple tracks
+
+    Args:
+        queries: List of track searches
+
+    Returns:
+        List of tracks for playlist
+    """
+    results = await search_multiple_tracks(queries)
+    return [r['result'] for r in results if r.get('result')]
+
+async def search_by_artist(artist: str, limit: int = 10) -> List[Dict]:
+    """
+    Search tracks by artist name
+
+    Args:
+        artist: Artist name
+        limit: Number of results
+
+    Returns:
+        List of tracks from the artist
+    """
+    results = await search_spotify(artist, limit)
+    return [track for track in results if artist.lower() in track['artists'].lower()]
+
+async def download_track(url: str, output_path: Optional[str] = None) -> Dict:
+    """
+    Download track from Spotify by URL
+
+    Args:
+        url: Spotify track URL
+        output_path: Optional path to save file
+
+    Returns:
+        Dictionary with download information
+    """
+    size = 0
+    async with open_stream('GET', f'{BASE_URL}/spotify/download', params={'url': url}) as response:
+        response.raise_for_status()
+
+        if output_path:
+            with open(output_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(65536):
+                    await shaper.acquire_async(len(chunk), response.url.host)
+                    f.write(chunk)
+                    size += len(chunk)
+        else:
+            size = len(await response.read())
+
+        return {
+            'success': True,
+            'size': size,
+            'content_type': response.headers.get('content-type'),
+            'filename': response.headers.get('content-disposition', '').split('filename=')[-1].strip('"') or 'track.mp3'
+        }
+
+async def search_and_download(query: str, output_path: Optional[str] = None) -> Dict:
+    """
+    Search and download track automatically
+
+    Args:
+        query: Track name or artist
+        output_path: Optional path to save file
+
+    Returns:
+        Dictionary with track and download information
+    """
+    track = await search_one_track(query)
+    if not track:
+        return {}
+
+    download_result = await download_track(track['link'], output_path)
+    return {'track': track, 'download': download_result}
+
+async def download_multiple_tracks(queries: List[str], output_dir: str = './downloads') -> List[Dict]:
+    """
+    Search and download multiple tracks
+
+    Args:
+        queries: List of track searches
+        output_dir: Directory to save files
+
+    Returns:
+        List of download results (failed queries are left out)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    async def _one(i: int, query: str) -> Optional[Dict]:
+        try:
+            return await search_and_download(query, os.path.join(output_dir, f'track_{i}.mp3'))
+        except Exception:
+            return None
+
+    results = await asyncio.gather(*(_one(i, q) for i, q in enumerate(queries, 1)))
+    return [r for r in results if r]
@@ -0,0 +1,55 @@
+"""
+Cognima API - Streamable Examples (Python, asyncio)
+
+Awaitable mirror of streamable.py.
+"""
+
+from aio import get_json
+
+async def download_streamable(url: str) -> dict:
+    """
+    Download video from Streamable
+
+    Args:
+        url: Streamable video URL
+
+    Returns:
+        dict: Download data or None if error
+    """
+    try:
+        data = await get_json('/streamable/download', params={'url': url}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_streamable_formats(url: str) -> list:
+    """
+    Get available formats for Streamable video
+
+    Args:
+        url: Streamable video URL
+
+    Returns:
+        list: Available formats or None if error
+    """
+    try:
+        data = await get_json('/streamable/formats', params={'url': url}, raise_for_status=False)
+        return data['formats'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_streamable_info(url: str) -> dict:
+    """
+    Get information about Streamable video
+
+    Args:
+        url: Streamable video URL
+
+    Returns:
+        dict: Information or None if error
+    """
+    try:
+        data = await get_json('/streamable/info', params={'url': url}, raise_for_status=False)
+        return data['info'] if data.get('success') else None
+    except Exception:
+        return None
@@ -0,0 +1,24 @@
+"""
+Cognima API - TikTok Examples (Python, asyncio)
+
+Awaitable mirror of tiktok.py. The example input the sync script
+hard-codes is a parameter here, and each function returns the response
+`data` instead of printing it.
+"""
+
+from aio import API_KEY, post_json
+
+headers = {
+    'X-API-Key': API_KEY,
+    'Content-Type': 'application/json'
+}
+
+async def download_tiktok(url: str) -> dict:
+    """Download a TikTok video"""
+    result = await post_json('/tiktok/download', json={'url': url}, headers=headers)
+    return result['data']
+
+async def search_tiktok(query: str) -> dict:
+    """Search TikTok videos"""
+    result = await post_json('/tiktok/search', json={'query': query}, headers=headers)
+    return result['data']
@@ -0,0 +1,55 @@
+"""
+Cognima API - Twitch Examples (Python, asyncio)
+
+Awaitable mirror of twitch.py.
+"""
+
+from aio import get_json
+
+async def download_twitch(url: str) -> dict:
+    """
+    Download Twitch clip or VOD
+
+    Args:
+        url: Twitch clip or VOD URL
+
+    Returns:
+        dict: Download data or None if error
+    """
+    try:
+        data = await get_json('/twitch/download', params={'url': url}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_twitch_formats(url: str) -> list:
+    """
+    Get available formats for Twitch clip or VOD
+
+    Args:
+        url: Twitch clip or VOD URL
+
+    Returns:
+        list: Available formats or None if error
+    """
+    try:
+        data = await get_json('/twitch/formats', params={'url': url}, raise_for_status=False)
+        return data['formats'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_twitch_info(url: str) -> dict:
+    """
+    Get information about Twitch clip or VOD
+
+    Args:
+        url: Twitch clip or VOD URL
+
+    Returns:
+        dict: Information or None if error
+    """
+    try:
+        data = await get_json('/twitch/info', params={'url': url}, raise_for_status=False)
+        return data['info'] if data.get('success') else None
+    except Exception:
+        return None
@@ -0,0 +1,38 @@
+"""
+Cognima API - Twitter/X Examples (Python, asyncio)
+
+Awaitable mirror of twitter.py. The example URL the sync script
+hard-codes is a parameter here.
+"""
+
+import aiohttp
+
+from aio import API_KEY, get_json, download_to_file
+
+headers = {'Authorization': f'Bearer {API_KEY}'}
+
+async def get_tweet_info(url: str):
+    """Obter informações completas de um tweet"""
+    try:
+        data = await get_json('/twitter/info', params={'url': url}, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def download_twitter_media(url: str):
+    """Obter links de download direto"""
+    try:
+        data = await get_json('/twitter/download', params={'url': url}, headers=headers)
+        return data['data']
+    except aiohttp.ClientError:
+        return None
+
+async def download_video_to_disk(tweet_url: str, output_path: str):
+    """Baixar vídeo do tweet para o disco"""
+    try:
+        data = await get_json('/twitter/download', params={'url': tweet_url}, headers=headers)
+        downloads = data['data']['downloads']
+        if downloads:
+            await download_to_file(downloads[0]['url'], output_path)
+    except aiohttp.ClientError:
+        return None
@@ -0,0 +1,20 @@
+"""
+Cognima API - Image Upscale (Python, asyncio)
+
+Awaitable mirror of upscale.py. The image URL and scale the sync script
+hard-codes are parameters here, and the response body is returned
+instead of printed (`result.download` holds the upscaled image link).
+"""
+
+from typing import Dict
+
+from aio import API_KEY, post_json
+
+headers = {
+    'X-API-Key': API_KEY,
+    'Content-Type': 'application/json'
+}
+
+async def upscale_image(image_url: str, scale: int = 2) -> Dict:
+    """Upscale an image"""
+    return await post_json('/image/upscale', json={'url': image_url, 'scale': scale}, headers=headers)
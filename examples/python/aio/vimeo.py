@@ -0,0 +1,55 @@
+"""
+Cognima API - Vimeo Examples (Python, asyncio)
+
+Awaitable mirror of vimeo.py.
+"""
+
+from aio import get_json
+
+async def download_vimeo(url: str) -> dict:
+    """
+    Download video from Vimeo
+
+    Args:
+        url: Vimeo video URL
+
+    Returns:
+        dict: Download data or None if error
+    """
+    try:
+        data = await get_json('/vimeo/download', params={'url': url}, raise_for_status=False)
+        return data['data'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_vimeo_formats(url: str) -> list:
+    """
+    Get available formats for Vimeo video
+
+    Args:
+        url: Vimeo video URL
+
+    Returns:
+        list: Available formats or None if error
+    """
+    try:
+        data = await get_json('/vimeo/formats', params={'url': url}, raise_for_status=False)
+        return data['formats'] if data.get('success') else None
+    except Exception:
+        return None
+
+async def get_vimeo_info(url: str) -> dict:
+    """
+    Get information about Vimeo video
+
+    Args:
+        url: Vimeo video URL
+
+    Returns:
+        dict: Information or None if error
+    """
+    try:
+        data = await get_json('/vimeo/info', params={'url': url}, raise_for_status=False)
+        return data['info'] if data.get('success') else None
+    except Exception:
+        return None
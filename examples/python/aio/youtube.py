@@ -0,0 +1,62 @@
+"""
+Cognima API - YouTube Examples (Python, asyncio)
+
+Awaitable mirror of youtube.py. The example URL and query the sync
+script hard-codes are parameters here, and each function returns the
+response `data` instead of printing it.
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+import jsonstream
+from aio import API_KEY, BASE_URL, open_stream, post_json
+from youtube import safe_path
+
+headers = {
+    'X-API-Key': API_KEY,
+    'Content-Type': 'application/json'
+}
+
+async def search_youtube(query: str) -> dict:
+    """Search YouTube videos"""
+    result = await post_json('/youtube/search', json={'query': query}, headers=headers)
+    return result['data']
+
+async def download_mp3(url: str, output_path: Optional[str] = None) -> dict:
+    """
+    Download audio as MP3 and save the decoded buffer to disk
+
+    The base64 `buffer` is decoded in blocks as the body arrives (see
+    jsonstream.py), so it is returned as ''. Like youtube.save_buffer(),
+    the returned data has `path` (output_path, or a sanitized
+    `data.filename` in the current directory) and `size` (bytes written)
+    entries.
+    """
+    directory = os.path.dirname(output_path or '') or '.'
+
+    async with open_stream('POST', f'{BASE_URL}/youtube/mp3', json={'url': url}, headers=headers) as response:
+        response.raise_for_status()
+        with tempfile.NamedTemporaryFile(dir=directory, suffix='.part', delete=False) as f:
+            try:
+                parser = jsonstream.Base64FieldParser('buffer', f)
+                async for chunk in response.content.iter_chunked(jsonstream.READ_SIZE):
+                    parser.feed(chunk)
+                result, size = parser.close()
+            except Exception:
+                os.remove(f.name)
+                raise
+
+    data = result['data']
+    # The filename is only known once the metadata has been parsed
+    path = output_path or safe_path(directory, data.get('filename'), 'download.mp3')
+    os.replace(f.name, path)
+    data['path'] = path
+    data['size'] = size
+    return data
+
+async def download_mp4(url: str, quality: str = '720p') -> dict:
+    """Download video as MP4"""
+    result = await post_json('/youtube/mp4', json={'url': url, 'quality': quality}, headers=headers)
+    return result['data']
@@ -1,4 +1,5 @@
-import requests
+import client
+import formats
 
 API_BASE = 'https://cog.api.br/api/v1'
 
@@ -13,8 +14,7 @@ def download_all_media(url: str) -> dict:
         dict: All media data or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/alldl', params={'url': url})
-        data = response.json()
+        data = client.get_json(f'{API_BASE}/alldl', params={'url': url}, raise_for_status=False)
         
         if data.get('success'):
             result = data['data']
@@ -66,8 +66,7 @@ def download_by_type(url: str, media_type: str) -> dict:
         dict: Filtered media data or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/alldl/type', params={'url': url, 'type': media_type})
-        data = response.json()
+        data = client.get_json(f'{API_BASE}/alldl/type', params={'url': url, 'type': media_type}, raise_for_status=False)
         
         if data.get('success'):
             result = data['data']
@@ -110,26 +109,28 @@ def download_by_type(url: str, media_type: str) -> dict:
         print(f'Request Error: {str(e)}')
         return None
 
-def get_best_quality(url: str) -> dict:
+def get_best_quality(url: str, spec: str = 'best') -> dict:
     """
-    Get only the best quality video
+    Get the media item that best matches a format spec
     
     Args:
         url: Any URL supported by yt-dlp
+        spec: Format spec (see formats.parse); the default 'best' is
+            the item the API marks isBest, others look like
+            'smallest <=720p h264 under 200MB'
         
     Returns:
-        dict: Best quality media or None if error
+        dict: Selected media or None if error or nothing matches
     """
     try:
-        response = requests.get(f'{API_BASE}/alldl', params={'url': url})
-        data = response.json()
+        data = client.get_json(f'{API_BASE}/alldl', params={'url': url}, raise_for_status=False)
         
         if data.get('success'):
             media = data['data']['media']
-            best = next((m for m in media if m.get('isBest')), None)
+            best = formats.select(media, spec)
             
             if best:
-                print('=== BEST QUALITY ===')
+                print(f'=== SELECTED ({spec}) ===')
                 print(f"Type: {best['type']}")
                 print(f"Quality: {best['quality']}")
                 print(f"Format: {best['format']}")
@@ -1,4 +1,4 @@
-import requests
+import client
 import os
 
 API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -10,7 +10,7 @@ def get_status():
         'X-API-Key': API_KEY
     }
     
-    response = requests.get(url, headers=headers)
+    response = client.get(url, headers=headers)
     
     if response.status_code == 200:
         result = response.json()
@@ -44,7 +44,7 @@ def get_models_stats():
         'X-API-Key': API_KEY
     }
     
-    response = requests.get(url, headers=headers)
+    response = client.get(url, headers=headers)
     
     if response.status_code == 200:
         result = response.json()
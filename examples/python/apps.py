@@ -1,4 +1,5 @@
 import requests
+import client
 import os
 
 API_KEY = os.environ.get('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -7,7 +8,7 @@ BASE_URL = 'https://cog.api.br/api/v1'
 def search_all_stores(query: str, num: int = 10, country: str = 'br'):
     """Pesquisar apps em ambas as lojas (Google Play + App Store)"""
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/apps/search',
             params={'q': query, 'num': num, 'country': country},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -41,7 +42,7 @@ def search_all_stores(query: str, num: int = 10, country: str = 'br'):
 def search_playstore(query: str, num: int = 10, country: str = 'br', lang: str = 'pt'):
     """Pesquisar apenas na Google Play Store"""
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/apps/playstore',
             params={'q': query, 'num': num, 'country': country, 'lang': lang},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -65,7 +66,7 @@ def search_playstore(query: str, num: int = 10, country: str = 'br', lang: str =
 def search_appstore(query: str, num: int = 10, country: str = 'br'):
     """Pesquisar apenas na Apple App Store"""
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/apps/appstore',
             params={'q': query, 'num': num, 'country': country},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -90,7 +91,7 @@ def search_appstore(query: str, num: int = 10, country: str = 'br'):
 def get_app_details(app_id: str, store: str = 'playStore', country: str = 'br'):
     """Obter detalhes de um app específico"""
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/apps/details',
             params={'appId': app_id, 'store': store, 'country': country},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -114,7 +115,7 @@ def get_app_details(app_id: str, store: str = 'playStore', country: str = 'br'):
 def get_similar_apps(app_id: str, store: str = 'playStore', num: int = 10):
     """Obter apps similares"""
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/apps/similar',
             params={'appId': app_id, 'store': store, 'num': num},
             headers={'Authorization': f'Bearer {API_KEY}'}
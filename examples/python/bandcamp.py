@@ -1,4 +1,5 @@
-import requests
+import client
+import formats
 
 API_BASE = 'https://cog.api.br/api/v1'
 
@@ -13,7 +14,7 @@ def download_bandcamp(url: str) -> dict:
         dict: Download data or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/bandcamp/download', params={'url': url})
+        response = client.get(f'{API_BASE}/bandcamp/download', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -48,7 +49,7 @@ def get_bandcamp_formats(url: str) -> list:
         list: Available formats or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/bandcamp/formats', params={'url': url})
+        response = client.get(f'{API_BASE}/bandcamp/formats', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -68,6 +69,35 @@ def get_bandcamp_formats(url: str) -> list:
         print(f'Request Error: {str(e)}')
         return None
 
+def select_bandcamp_format(url: str, spec: str = 'best') -> dict:
+    """
+    Pick one format for a Bandcamp track
+    
+    Args:
+        url: Bandcamp track URL
+        spec: Format spec (see formats.parse), e.g. 'smallest >=128kbps'
+        
+    Returns:
+        dict: Selected format (with its url) or None if error or nothing matches
+    """
+    try:
+        data = client.get_json(f'{API_BASE}/bandcamp/formats', params={'url': url}, raise_for_status=False)
+        
+        if data.get('success'):
+            selected = formats.select(data['formats'], spec)
+            if selected:
+                print(f"Selected ({spec}): {selected['formatId']}")
+            else:
+                print(f'No format matches: {spec}')
+            return selected
+        else:
+            print(f"Error: {data.get('error')}")
+            return None
+            
+    except Exception as e:
+        print(f'Request Error: {str(e)}')
+        return None
+
 def get_bandcamp_info(url: str) -> dict:
     """
     Get information about Bandcamp track/album
@@ -79,7 +109,7 @@ def get_bandcamp_info(url: str) -> dict:
         dict: Track information or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/bandcamp/info', params={'url': url})
+        response = client.get(f'{API_BASE}/bandcamp/info', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -120,3 +150,8 @@ if __name__ == '__main__':
     # Example 3: Get track info
     print(f'Getting track info: {bandcamp_url}')
     get_bandcamp_info(bandcamp_url)
+    
+    print('\n=== Bandcamp Format Selection Example ===\n')
+    
+    # Example 4: Pick the format to download
+    select_bandcamp_format(bandcamp_url, 'smallest >=128kbps')
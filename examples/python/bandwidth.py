@@ -0,0 +1,199 @@
+"""
+Cognima API - Bandwidth Shaper (Python)
+
+A process-wide governor for download bodies. A token bucket caps total
+bytes per second, optional per-host buckets cap individual CDNs, and
+when transfers compete for the global budget each job class gets a
+weighted share (weighted fair queueing): by default an `interactive`
+download gets four times the bandwidth of a `bulk` one. API calls are
+never shaped, so lookups keep their headroom while bulk transfers use
+what is left.
+
+Configured from the environment (rates in bytes/s, K/M/G suffixes):
+
+    COGNIMA_BANDWIDTH=50M
+    COGNIMA_HOST_BANDWIDTH=download.mediafire.com=10M,video.twimg.com=20M
+    COGNIMA_BANDWIDTH_WEIGHTS=interactive=4,bulk=1
+
+Shaping is off when none of these is set.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_WEIGHTS = {'interactive': 4.0, 'bulk': 1.0}
+
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+def parse_rate(value: str) -> float:
+    """
+    Parse a rate such as "512K" or "20M" into bytes per second
+
+    Args:
+        value: Number with an optional K, M or G suffix
+
+    Returns:
+        Bytes per second
+    """
+    value = value.strip().upper().rstrip('B')
+    unit = value[-1] if value and value[-1] in _UNITS else ''
+    return float(value[:len(value) - len(unit)]) * _UNITS[unit]
+
+def parse_pairs(value: str, parse: Callable[[str], float] = float) -> Dict[str, float]:
+    """Parse "name=value,name=value" into a dict"""
+    pairs = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        name, _, amount = item.partition('=')
+        pairs[name.strip()] = parse(amount)
+    return pairs
+
+class TokenBucket:
+    """
+    Byte bucket that may go into debt, so one large read never deadlocks
+
+    Not thread-safe; the owner holds a lock around it.
+
+    Args:
+        rate: Bytes per second
+        burst: Most bytes saved up while idle (default: a quarter second)
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or max(64 * 1024, rate / 4)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Seconds until the bucket is out of debt (0 if it has tokens)"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return 0.0 if self._tokens > 0 else -self._tokens / self.rate
+
+    def take(self, n: int):
+        self._tokens -= n
+
+class BandwidthShaper:
+    """
+    Shares a global byte rate between job classes, with per-host caps
+
+    Args:
+        rate: Total bytes per second (None = unlimited)
+        host_rates: Bytes per second per hostname
+        weights: Relative share per job class when classes compete
+    """
+
+    def __init__(self, rate: Optional[float] = None, host_rates: Optional[Dict[str, float]] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.stats: Dict[str, int] = {}
+
+        self._global = TokenBucket(rate) if rate else None
+        self._hosts = {host.lower(): TokenBucket(r) for host, r in (host_rates or {}).items()}
+        self._cond = threading.Condition()
+        self._host_lock = threading.Lock()
+
+        # Weighted fair queueing state: waiters ordered by finish tag
+        self._waiters = []
+        self._seq = itertools.count()
+        self._virtual = 0.0
+        self._class_tags: Dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls) -> 'BandwidthShaper':
+        """Build a shaper from the COGNIMA_*BANDWIDTH* variables"""
+        rate = os.getenv('COGNIMA_BANDWIDTH')
+        return cls(
+            rate=parse_rate(rate) if rate else None,
+            host_rates=parse_pairs(os.getenv('COGNIMA_HOST_BANDWIDTH', ''), parse_rate),
+            weights=parse_pairs(os.getenv('COGNIMA_BANDWIDTH_WEIGHTS', ''))
+        )
+
+    def applies_to(self, host: Optional[str]) -> bool:
+        """Check whether transfers from a host are shaped at all"""
+        return self._global is not None or (host or '').lower() in self._hosts
+
+    def acquire(self, n: int, host: Optional[str] = None, job_class: str = 'interactive'):
+        """
+        Account for n bytes, blocking while over the host or global rate
+
+        Args:
+            n: Bytes just read (or about to be)
+            host: Source hostname, for per-host caps
+            job_class: Key of weights
+        """
+        bucket = self._hosts.get((host or '').lower())
+        if bucket is not None:
+            self._wait_host(bucket, n)
+
+        with self._cond:
+            self.stats[job_class] = self.stats.get(job_class, 0) + n
+            if self._global is None:
+                return
+
+            weight = self.weights.get(job_class, 1.0)
+            tag = max(self._virtual, self._class_tags.get(job_class, 0.0)) + n / weight
+            self._class_tags[job_class] = tag
+            entry = (tag, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+
+            try:
+                while True:
+                    # Only the waiter with the smallest tag may take bytes
+                    if self._waiters[0] is entry:
+                        delay = self._global.wait_time()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(timeout=delay)
+                    else:
+                        self._cond.wait()
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._waiters)
+            self._virtual = tag
+            self._global.take(n)
+            self._cond.notify_all()
+
+    async def acquire_async(self, n: int, host: Optional[str] = None, job_class: str = 'interactive'):
+        """acquire() for coroutines (waits on a worker thread)"""
+        if self.applies_to(host):
+            await asyncio.to_thread(self.acquire, n, host, job_class)
+
+    def _wait_host(self, bucket: TokenBucket, n: int):
+        while True:
+            with self._host_lock:
+                delay = bucket.wait_time()
+                if delay <= 0:
+                    bucket.take(n)
+                    return
+            time.sleep(delay)
+
+# Shared by every download path in the examples
+shaper = BandwidthShaper.from_env()
+
+def throttle_for(url: str, job_class: str = 'interactive') -> Optional[Callable[[int], None]]:
+    """
+    Get the per-read callback for a transfer, or None if it isn't shaped
+
+    Args:
+        url: Download URL (its host picks the per-host cap)
+        job_class: 'interactive', 'bulk' or another key of the weights
+
+    Returns:
+        Callable taking a byte count, or None
+    """
+    host = urlsplit(url).hostname
+    if not shaper.applies_to(host):
+        return None
+    return lambda n: shaper.acquire(n, host, job_class)
@@ -0,0 +1,187 @@
+"""
+Cognima API - Offline Benchmarks (Python)
+
+Starts the local API stand-in (mock_server.py), points the example
+scripts at it and measures the batch paths:
+
+- throughput (items per second)
+- p50 / p95 / p99 latency of individual API and CDN calls
+- peak Python heap (tracemalloc) per scenario
+
+    python benchmarks/bench.py
+    python benchmarks/bench.py --items 100 --error-rate 0.05 --json bench.json
+    python benchmarks/bench.py --scenario spotify --latency 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mock_server import MockConfig, MockServer
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+def scenarios(n: int, workdir: str) -> Dict[str, Callable[[], object]]:
+    """
+    Build the benchmark scenarios
+
+    Args:
+        n: Items per batch
+        workdir: Directory for downloaded files
+
+    Returns:
+        Dictionary of scenario name to callable
+    """
+    import facebook
+    import gdrive
+    import mediafire
+    import search
+    import soundcloud
+    import spotify
+    import twitter
+
+    queries = [f'track {i}' for i in range(n)]
+    fb_urls = [f'https://www.facebook.com/watch?v={i}' for i in range(n)]
+    files = max(1, n // 10)
+
+    def download_files(module, fn_name: str, url_fmt: str):
+        def run():
+            for i in range(files):
+                getattr(module, fn_name)(url_fmt.format(i), os.path.join(workdir, f'{module.__name__}_{i}.bin'))
+        return run
+
+    return {
+        'spotify.search_multiple_tracks': lambda: spotify.search_multiple_tracks(queries),
+        'spotify.create_playlist_from_searches': lambda: spotify.create_playlist_from_searches(queries),
+        'spotify.download_multiple_tracks': lambda: spotify.download_multiple_tracks(queries, os.path.join(workdir, 'spotify')),
+        'soundcloud.search_multiple_tracks': lambda: soundcloud.search_multiple_tracks(queries),
+        'soundcloud.download_multiple_tracks': lambda: soundcloud.download_multiple_tracks(queries, os.path.join(workdir, 'soundcloud')),
+        'facebook.download_multiple_videos': lambda: facebook.download_multiple_videos(fb_urls),
+        'facebook.download_best_from_multiple_sources': lambda: facebook.download_best_from_multiple_sources(fb_urls),
+        'search.multi_search': lambda: search.multi_search(queries),
+        'gdrive.download_file_to_disk': download_files(gdrive, 'download_file_to_disk', 'https://drive.google.com/file/d/{}/view'),
+        'mediafire.download_file_to_disk': download_files(mediafire, 'download_file_to_disk', 'https://www.mediafire.com/file/{}/f.zip/file'),
+        'twitter.download_video_to_disk': download_files(twitter, 'download_video_to_disk', 'https://x.com/u/status/{}'),
+    }
+
+def run_scenario(name: str, fn: Callable, items: int, latencies: List[float]) -> Dict:
+    """
+    Run one scenario and collect its numbers
+
+    Args:
+        name: Scenario name
+        fn: Scenario callable
+        items: Items the scenario processes (for throughput)
+        latencies: Shared list the request timer appends to
+
+    Returns:
+        Dictionary of results
+    """
+    latencies.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'scenario': name,
+        'items': items,
+        'seconds': round(elapsed, 3),
+        'items_per_sec': round(items / elapsed, 2) if elapsed else 0.0,
+        'requests': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'peak_heap_mb': round(peak / 1024 / 1024, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the example batch paths against a local mock API')
+    parser.add_argument('--items', type=int, default=30, help='Items per batch')
+    parser.add_argument('--scenario', default='', help='Only run scenarios containing this text')
+    parser.add_argument('--latency', type=float, default=MockConfig.latency)
+    parser.add_argument('--jitter', type=float, default=MockConfig.jitter)
+    parser.add_argument('--slow-latency', type=float, default=MockConfig.slow_latency)
+    parser.add_argument('--tail-rate', type=float, default=MockConfig.tail_rate)
+    parser.add_argument('--tail-latency', type=float, default=MockConfig.tail_latency)
+    parser.add_argument('--error-rate', type=float, default=MockConfig.error_rate)
+    parser.add_argument('--rate-limit-rate', type=float, default=MockConfig.rate_limit_rate)
+    parser.add_argument('--payload-size', type=int, default=MockConfig.payload_size)
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache enabled')
+    parser.add_argument('--json', help='Also write results to this file')
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency, jitter=args.jitter, slow_latency=args.slow_latency,
+        tail_rate=args.tail_rate, tail_latency=args.tail_latency, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, payload_size=args.payload_size
+    )
+
+    with MockServer(config) as server, tempfile.TemporaryDirectory() as workdir:
+        # Must be set before the example modules (and client) are imported
+        os.environ['COGNIMA_BASE_URL'] = server.base_url
+        if not args.cache:
+            os.environ['COGNIMA_CACHE'] = '0'
+
+        import client
+
+        latencies: List[float] = []
+        send = client.request
+
+        def timed_request(method, url, **kwargs):
+            start = time.perf_counter()
+            try:
+                return send(method, url, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+        client.request = timed_request
+
+        all_scenarios = scenarios(args.items, workdir)
+        for module in list(sys.modules.values()):
+            for attr in ('BASE_URL', 'API_BASE'):
+                if getattr(module, attr, None) == 'https://cog.api.br/api/v1':
+                    setattr(module, attr, server.base_url)
+
+        results = []
+        print(f"{'scenario':<46}{'items/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'heap MB':>10}")
+        for name, fn in all_scenarios.items():
+            if args.scenario not in name:
+                continue
+            items = max(1, args.items // 10) if 'to_disk' in name else args.items
+            result = run_scenario(name, fn, items, latencies)
+            results.append(result)
+            print(f"{name:<46}{result['items_per_sec']:>10}{result['p50_ms']:>10}"
+                  f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['peak_heap_mb']:>10}")
+
+        max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f'\nPeak RSS: {max_rss_mb:.1f} MB')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'config': vars(config), 'results': results, 'max_rss_mb': round(max_rss_mb, 1)}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,379 @@
+"""
+Cognima API - Local API Stand-in (Python)
+
+A small threaded HTTP server that answers the endpoints used by the
+example scripts with the response shapes documented in README.md. It
+runs two listeners: one playing cog.api.br and one playing the CDN that
+`downloadUrl` links point to. Latency, error rates and payload sizes
+are configurable so benchmarks can reproduce slow or flaky conditions
+offline.
+
+    python benchmarks/mock_server.py --latency 0.05 --error-rate 0.02
+"""
+
+import argparse
+import base64
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+@dataclass
+class MockConfig:
+    latency: float = 0.02          # base latency per API call (seconds)
+    jitter: float = 0.01           # uniform extra latency
+    slow_latency: float = 0.5      # base latency for yt-dlp style endpoints
+    tail_rate: float = 0.0         # fraction of calls that hit tail latency
+    tail_latency: float = 1.0      # extra seconds for tail calls
+    error_rate: float = 0.0        # fraction of calls answered with 502
+    rate_limit_rate: float = 0.0   # fraction of calls answered with 429
+    payload_size: int = 1024 * 1024  # bytes served per downloaded file
+    results: int = 10              # items per search result list
+    cdn_bandwidth: float = 0.0     # bytes/s per connection (0 = unlimited)
+
+SLOW_PREFIXES = ('/alldl', '/twitch/download', '/vimeo/download', '/dailymotion/download')
+CHUNK = 64 * 1024
+
+# File bodies repeat this pattern, so byte i is always PATTERN[i % 251]
+# and ranged or resumed downloads can be checked byte for byte
+PATTERN = bytes(range(251))
+PATTERN_BLOCK = PATTERN * (CHUNK // len(PATTERN) + 2)
+
+def expected_file(size: int) -> bytes:
+    """Full body the CDN listener serves for a file of this size"""
+    return (PATTERN * (size // len(PATTERN) + 1))[:size]
+
+def _track(i: int, query: str) -> Dict:
+    return {
+        'index': i,
+        'name': f'{query} #{i}',
+        'artists': 'Mock Artist',
+        'link': f'https://open.spotify.com/track/mock{i:04d}'
+    }
+
+def _sc_track(i: int, query: str) -> Dict:
+    return {
+        'title': f'{query} #{i}',
+        'artist': 1000 + i,
+        'duration': 180 + i,
+        'playback_count': 10000 * i,
+        'likes_count': 100 * i,
+        'genre': 'Mock',
+        'permalink_url': f'https://soundcloud.com/mock/track-{i}'
+    }
+
+def _formats(cdn: str, size: int) -> list:
+    return [
+        {'formatId': 'source', 'quality': '1920x1080', 'ext': 'mp4', 'filesize': size, 'url': f'{cdn}/files/source.mp4'},
+        {'formatId': '720p', 'quality': '1280x720', 'ext': 'mp4', 'filesize': size // 2, 'url': f'{cdn}/files/720.mp4'},
+        {'formatId': '480p', 'quality': '854x480', 'ext': 'mp4', 'filesize': size // 4, 'url': f'{cdn}/files/480.mp4'},
+    ]
+
+def _media(cdn: str, size: int) -> list:
+    return [
+        {'type': 'video', 'url': f'{cdn}/files/best.mp4', 'quality': 'best', 'format': 'mp4',
+         'filesize': size, 'resolution': '1920x1080', 'isBest': True},
+        {'type': 'video', 'url': f'{cdn}/files/1080.mp4', 'quality': '1920x1080', 'format': 'mp4',
+         'filesize': size, 'resolution': '1920x1080', 'fps': 30, 'vcodec': 'h264', 'acodec': 'aac', 'formatId': '137+140'},
+        {'type': 'video', 'url': f'{cdn}/files/720.mp4', 'quality': '1280x720', 'format': 'mp4',
+         'filesize': size // 2, 'resolution': '1280x720', 'fps': 30, 'vcodec': 'h264', 'acodec': 'aac', 'formatId': '136+140'},
+        {'type': 'audio', 'url': f'{cdn}/files/audio.m4a', 'quality': '128kbps', 'format': 'm4a',
+         'filesize': size // 16, 'acodec': 'aac', 'abr': 128, 'asr': 44100, 'formatId': '140'},
+        {'type': 'image', 'url': f'{cdn}/files/thumb.jpg', 'quality': '1280x720', 'format': 'jpg',
+         'width': 1280, 'height': 720, 'id': 'maxresdefault'},
+    ]
+
+def _info(path: str) -> Dict:
+    return {
+        'title': f'Mock {path}', 'author': 'Mock Author', 'streamer': 'mock', 'type': 'clip',
+        'game': 'Mock', 'views': 1000, 'likes': 10, 'comments': 1, 'duration': 60,
+        'description': 'Mock description', 'width': 1920, 'height': 1080, 'quality': '1080p',
+        'filesize': 25000000, 'artist': 'Mock Artist', 'album': 'Mock Album', 'genre': 'Mock',
+        'releaseDate': '2024-01-01', 'subreddit': 'mock', 'upvotes': 10, 'isVideo': True,
+        'url': 'https://example.com/mock'
+    }
+
+def api_response(path: str, query: Dict[str, str], body: Dict, cfg: MockConfig, cdn: str) -> Tuple[int, object]:
+    """
+    Build the response for an API path
+
+    Args:
+        path: Path under /api/v1
+        query: Query parameters
+        body: JSON body (POST)
+        cfg: Mock configuration
+        cdn: Base URL of the CDN listener
+
+    Returns:
+        (status, JSON-able body or raw bytes)
+    """
+    q = query.get('q') or query.get('query') or body.get('query') or 'mock'
+    url = query.get('url') or body.get('url') or ''
+    size = cfg.payload_size
+    n = cfg.results
+    file_url = f'{cdn}/files/{abs(hash(url or q)) % 10 ** 8}.bin'
+
+    if path == '/status':
+        return 200, {'success': True, 'data': {'limits': {
+            'hourly': {'limit': 10 ** 6, 'used': 0, 'remaining': 10 ** 6,
+                       'reset_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() + 3600))},
+            'daily': {'requests': {'limit': 10 ** 7, 'used': 0, 'remaining': 10 ** 7}}}}}
+    if path == '/status/health':
+        return 200, {'success': True, 'status': 'healthy'}
+
+    if path == '/spotify/search':
+        return 200, {'success': True, 'platform': 'Spotify', 'query': q, 'total': n,
+                     'results': [_track(i, q) for i in range(1, n + 1)]}
+    if path == '/spotify/search-one':
+        return 200, {'success': True, 'platform': 'Spotify', 'query': q, 'result': _track(1, q)}
+    if path == '/spotify/download':
+        return 200, b'\0' * size
+    if path == '/spotify/search-download':
+        return 200, {'success': True, 'platform': 'Spotify', 'query': q, 'track': _track(1, q),
+                     'download': {'title': q, 'artists': ['Mock Artist'], 'duration': '3:00', 'downloadUrl': file_url}}
+
+    if path == '/soundcloud/search':
+        return 200, {'success': True, 'total': n, 'results': [_sc_track(i, q) for i in range(1, n + 1)]}
+    if path == '/soundcloud/search-one':
+        return 200, {'success': True, 'result': _sc_track(1, q)}
+    if path in ('/soundcloud/download', '/soundcloud/search-download'):
+        download = {'title': q, 'artist': 'Mock Artist', 'thumbnail': f'{cdn}/files/thumb.jpg', 'downloadUrl': file_url}
+        if path == '/soundcloud/download':
+            return 200, {'success': True, 'data': download}
+        return 200, {'success': True, 'track': _sc_track(1, q), 'download': download}
+
+    if path in ('/facebook/download', '/facebook/download-hd'):
+        videos = [{'resolution': r, 'url': f'{cdn}/files/fb{r}.mp4', 'thumbnail': f'{cdn}/files/thumb.jpg',
+                   'shouldRender': False} for r in ('1080p (HD)', '720p', '360p (SD)')]
+        if path == '/facebook/download':
+            return 200, {'success': True, 'videos': videos}
+        return 200, {'success': True, 'video': videos[0], 'allQualities': videos}
+
+    if path in ('/search', '/search/news'):
+        return 200, {'success': True, 'data': {'query': q, 'totalResults': n, 'results': [
+            {'title': f'{q} result {i}', 'url': f'https://example.com/{i}', 'displayUrl': 'example.com',
+             'description': 'Mock search result ' * 5} for i in range(1, n + 1)]}}
+
+    if path in ('/alldl', '/alldl/type'):
+        media = _media(cdn, size)
+        if query.get('type'):
+            media = [m for m in media if m['type'] == query['type']]
+        return 200, {'success': True, 'data': {
+            'metadata': {'title': 'Mock Video', 'platform': 'youtube', 'duration': 213, 'views': 1000, 'uploader': 'Mock'},
+            'media': media, 'totalItems': len(media),
+            'videoCount': sum(m['type'] == 'video' for m in media),
+            'audioCount': sum(m['type'] == 'audio' for m in media),
+            'imageCount': sum(m['type'] == 'image' for m in media)}}
+
+    platform = path.split('/')[1] if path.count('/') >= 2 else ''
+    if path.endswith('/formats'):
+        return 200, {'success': True, 'platform': platform, 'formats': _formats(cdn, size)}
+    if path.endswith('/info') and platform not in ('gdrive', 'mediafire', 'twitter'):
+        return 200, {'success': True, 'info': _info(path)}
+
+    if platform in ('gdrive', 'mediafire') and path.endswith(('/info', '/download')):
+        return 200, {'success': True, 'data': {'fileName': 'mock.bin', 'fileSize': f'{size} B', 'fileSizeBytes': size, 'filesize': size,
+                                                'mimetype': 'application/octet-stream', 'extension': 'bin',
+                                                'uploadDate': '2024-01-01', 'downloadUrl': file_url}}
+    if path == '/twitter/download':
+        return 200, {'success': True, 'data': {'tweetId': '1', 'author': 'mock', 'type': 'video',
+                                                'downloads': [{'type': 'video', 'resolution': '1280x720', 'url': file_url}]}}
+    if path.endswith('/download') and platform:
+        return 200, {'success': True, 'data': dict(_info(path), downloadUrl=file_url, ext='mp4')}
+
+    if path in ('/youtube/mp3', '/youtube/mp4'):
+        return 200, {'success': True, 'data': {'title': 'Mock', 'duration': 213, 'quality': '720p',
+                                                'filename': 'mock.mp3', 'buffer': base64.b64encode(b'\0' * size).decode()}}
+    if path == '/youtube/search':
+        return 200, {'success': True, 'data': {'count': n, 'results': [
+            {'title': f'{q} #{i}', 'channel': {'name': 'Mock'}, 'views': 1000 * i, 'duration': 200 + i,
+             'url': f'https://www.youtube.com/watch?v=mock{i:05d}'} for i in range(1, n + 1)]}}
+
+    if path == '/completion':
+        return 200, {'success': True, 'data': {'model': body.get('model', 'mock'),
+                                                'choices': [{'message': {'role': 'assistant', 'content': 'Mock answer.'}}]},
+                     'usage': {'total_tokens': 42, 'estimated_cost': 0.000042}}
+
+    return 404, {'success': False, 'error': 'Not Found', 'message': f'No mock for {path}'}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server_version = 'CognimaMock/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_HEAD(self):
+        self._handle(head=True)
+
+    def _send(self, status: int, payload, headers: Optional[Dict] = None):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream' if isinstance(payload, bytes) else 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, head: bool = False):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        if self.server.role == 'cdn':
+            return self._serve_file(head)
+
+        cfg = self.server.config
+        parts = urlsplit(self.path)
+        path = parts.path[len('/api/v1'):] if parts.path.startswith('/api/v1') else parts.path
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        body = json.loads(raw) if raw else {}
+
+        base = cfg.slow_latency if path.startswith(SLOW_PREFIXES) else cfg.latency
+        delay = base + random.uniform(0, cfg.jitter)
+        if cfg.tail_rate and random.random() < cfg.tail_rate:
+            delay += cfg.tail_latency
+        time.sleep(delay)
+
+        if not path.startswith('/status'):
+            roll = random.random()
+            if roll < cfg.rate_limit_rate:
+                reset = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() + 1))
+                return self._send(429, {'success': False, 'error': 'Rate limit exceeded',
+                                        'message': 'Hourly rate limit exceeded',
+                                        'limits': {'hourly': {'limit': 100, 'used': 100, 'remaining': 0, 'reset_at': reset}}})
+            if roll < cfg.rate_limit_rate + cfg.error_rate:
+                return self._send(502, {'success': False, 'error': 'Bad Gateway', 'message': 'External service error'})
+
+        status, payload = api_response(path, query, body, cfg, self.server.cdn_url)
+        self._send(status, payload)
+
+    def _serve_file(self, head: bool):
+        cfg = self.server.config
+        size = cfg.payload_size
+        start, end = 0, size - 1
+        status = 200
+        headers = {'Accept-Ranges': 'bytes', 'ETag': f'"mock-{size}"',
+                   'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+
+        range_header = self.headers.get('Range')
+        if range_header and range_header.startswith('bytes='):
+            first, _, last = range_header[6:].partition('-')
+            start = int(first) if first else max(0, size - int(last))
+            end = min(size - 1, int(last)) if first and last else size - 1
+            if start >= size:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(length))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        if head:
+            return
+
+        sent = 0
+        began = time.monotonic()
+        while sent < length:
+            n = min(CHUNK, length - sent)
+            offset = (start + sent) % len(PATTERN)
+            self.wfile.write(PATTERN_BLOCK[offset:offset + n])
+            sent += n
+            if cfg.cdn_bandwidth:
+                ahead = sent / cfg.cdn_bandwidth - (time.monotonic() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-transfer is expected (aborted or hedged calls)
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+class MockServer:
+    """
+    API + CDN stand-in running on background threads
+
+    Args:
+        config: MockConfig (defaults if omitted)
+        host: Interface to bind
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = '127.0.0.1'):
+        self.config = config or MockConfig()
+        self._servers = []
+        for role in ('api', 'cdn'):
+            server = _Server((host, 0), _Handler)
+            server.daemon_threads = True
+            server.role = role
+            server.config = self.config
+            self._servers.append(server)
+
+        api, cdn = self._servers
+        self.base_url = f'http://{host}:{api.server_address[1]}/api/v1'
+        self.cdn_url = f'http://{host}:{cdn.server_address[1]}'
+        api.cdn_url = cdn.cdn_url = self.cdn_url
+
+    def start(self) -> 'MockServer':
+        for server in self._servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the local Cognima API stand-in')
+    parser.add_argument('--latency', type=float, default=MockConfig.latency)
+    parser.add_argument('--jitter', type=float, default=MockConfig.jitter)
+    parser.add_argument('--slow-latency', type=float, default=MockConfig.slow_latency)
+    parser.add_argument('--tail-rate', type=float, default=MockConfig.tail_rate)
+    parser.add_argument('--tail-latency', type=float, default=MockConfig.tail_latency)
+    parser.add_argument('--error-rate', type=float, default=MockConfig.error_rate)
+    parser.add_argument('--rate-limit-rate', type=float, default=MockConfig.rate_limit_rate)
+    parser.add_argument('--payload-size', type=int, default=MockConfig.payload_size)
+    args = parser.parse_args()
+
+    config = MockConfig(**{k: v for k, v in vars(args).items()})
+    server = MockServer(config).start()
+    print(f'API: {server.base_url}')
+    print(f'CDN: {server.cdn_url}')
+    print(f'\nexport COGNIMA_BASE_URL={server.base_url}')
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
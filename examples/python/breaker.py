@@ -0,0 +1,162 @@
+"""
+Cognima API - Circuit Breakers (Python)
+
+One breaker per endpoint path. When an upstream platform breaks (for
+example /facebook/download-hd or /reddit/download returning 502 over
+and over) its breaker opens and further calls fail immediately with
+CircuitOpenError instead of waiting out the failure. After a cool-down
+the breaker goes half-open and lets a single probe through; the API's
+GET /status/health is checked first as an extra signal.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while its breaker is open"""
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one endpoint
+
+    Args:
+        name: Endpoint path, used in error messages
+        failure_rate: Fraction of failed calls that opens the breaker
+        min_calls: Calls needed in the window before the rate counts
+        window: Number of recent calls considered
+        open_seconds: Cool-down before a half-open probe
+        health_check: Optional callable returning False when the API is down
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, min_calls: int = 5, window: int = 20,
+                 open_seconds: float = 30.0, health_check: Optional[Callable[[], bool]] = None):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.health_check = health_check
+
+        self.state = CLOSED
+        self._results = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Check whether a call may go out
+
+        Raises:
+            CircuitOpenError: While open, or while a half-open probe is running
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    raise CircuitOpenError(f'Circuit open for {self.name}')
+                self.state = HALF_OPEN
+                self._probing = False
+
+            if self._probing:
+                raise CircuitOpenError(f'Circuit half-open for {self.name}, probe in flight')
+            self._probing = True
+
+        # Health check outside the lock: it is a network call
+        if self.health_check is not None and not self.health_check():
+            with self._lock:
+                self._trip()
+            raise CircuitOpenError(f'Circuit open for {self.name} (API health check failed)')
+
+    def record(self, success: bool):
+        """
+        Record the outcome of a call
+
+        Args:
+            success: False for 5xx responses, connection errors and timeouts
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if success:
+                    self.state = CLOSED
+                    self._results.clear()
+                else:
+                    self._trip()
+                return
+
+            self._results.append(success)
+            failures = self._results.count(False)
+            if len(self._results) >= self.min_calls and failures / len(self._results) >= self.failure_rate:
+                self._trip()
+
+    def stats(self) -> Dict:
+        """
+        Get the breaker state
+
+        Returns:
+            Dictionary with state and recent failure count
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'calls': len(self._results),
+                'failures': self._results.count(False)
+            }
+
+    def _trip(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+
+class BreakerRegistry:
+    """
+    Creates and holds one CircuitBreaker per endpoint path
+
+    Args:
+        health_check: Passed to every breaker for half-open probing
+        **options: Default CircuitBreaker options
+    """
+
+    def __init__(self, health_check: Optional[Callable[[], bool]] = None, **options):
+        self.health_check = health_check
+        self.options = options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """
+        Get the breaker for a URL's endpoint path
+
+        Args:
+            url: Absolute API URL
+
+        Returns:
+            CircuitBreaker for that path
+        """
+        path = urlsplit(url).path
+        with self._lock:
+            if path not in self._breakers:
+                self._breakers[path] = CircuitBreaker(path, health_check=self.health_check, **self.options)
+            return self._breakers[path]
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Get the state of every breaker
+
+        Returns:
+            Dictionary of endpoint path to breaker stats
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {path: b.stats() for path, b in breakers.items()}
@@ -0,0 +1,293 @@
+"""
+Cognima API - Response Cache (Python)
+
+Two-tier cache for API lookups:
+
+- a bounded in-memory LRU (entries and bytes)
+- an on-disk SQLite store that survives restarts
+
+Each endpoint has its own TTL; endpoints without one (downloads, chat,
+anything returning signed or one-off data) are never cached. That rules
+out every response carrying media links that expire: /alldl,
+/facebook/download, the */formats lists and /twitter/info (per-format
+CDN `url`s) and /mediafire/info (a direct downloadN.mediafire.com link).
+The SQLite file is only created when the first response is stored.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# TTL in seconds by path prefix under /api/v1 (longest prefix wins).
+# Only endpoints whose answers hold no signed or expiring media URLs.
+ENDPOINT_TTLS: Dict[str, float] = {
+    '/apps': 6 * HOUR,
+    '/apps/details': DAY,
+    '/lyrics/search': 7 * DAY,
+    '/spotify/search': DAY,
+    '/spotify/search-one': DAY,
+    '/soundcloud/search': DAY,
+    '/soundcloud/search-one': DAY,
+    '/search': HOUR,
+    '/search/news': 15 * MINUTE,
+    '/youtube/search': 6 * HOUR,
+    '/gdrive/info': HOUR,
+    '/vimeo/info': HOUR,
+    '/dailymotion/info': HOUR,
+    '/twitch/info': HOUR,
+    '/streamable/info': HOUR,
+    '/bandcamp/info': DAY,
+    '/likee/info': HOUR,
+    '/reddit/info': 10 * MINUTE,
+}
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    expires_at: float
+
+    def to_response(self, url: str) -> requests.Response:
+        """Rebuild a requests Response from the cached entry"""
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.url = url
+        response.encoding = 'utf-8'
+        return response
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU bounded by entry count and total bytes
+
+    Args:
+        max_entries: Most entries kept
+        max_bytes: Most body bytes kept
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> Dict:
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), bytes=self._bytes)
+
+    def _remove(self, key: str):
+        self._bytes -= len(self._entries.pop(key).body)
+
+class SQLiteCache:
+    """
+    Persistent cache tier in a single SQLite file
+
+    Args:
+        path: Database file
+        max_bytes: Oldest-expiring entries are dropped above this size
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        # Opened on first use, so merely configuring a cache creates no file
+        self._db: Optional[sqlite3.Connection] = None
+        # Running SUM(size), so put() doesn't scan the table
+        self._size = 0
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Open the database (call with the lock held); None if it doesn't exist and create is False"""
+        if self._db is not None:
+            return self._db
+        if not create and not os.path.exists(self.path):
+            return None
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, status INTEGER, headers TEXT, body BLOB,'
+            ' size INTEGER, expires_at REAL)'
+        )
+        db.execute('CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at)')
+        db.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time(),))
+        db.commit()
+        self._size = db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        self._db = db
+        return db
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            db = self._connect(create=False)
+            row = None
+            if db is not None:
+                row = db.execute(
+                    'SELECT status, headers, body, expires_at FROM responses WHERE key = ? AND expires_at > ?',
+                    (key, time.time())
+                ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            return CachedResponse(row[0], json.loads(row[1]), bytes(row[2]), row[3])
+
+    def put(self, key: str, entry: CachedResponse):
+        with self._lock:
+            db = self._connect(create=True)
+            replaced = db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                (key, entry.status, json.dumps(entry.headers), entry.body, len(entry.body), entry.expires_at)
+            )
+            self._size += len(entry.body) - (replaced[0] if replaced else 0)
+            while self._size > self.max_bytes:
+                victim = db.execute(
+                    'SELECT key, size FROM responses ORDER BY expires_at LIMIT 1'
+                ).fetchone()
+                if victim is None:
+                    break
+                db.execute('DELETE FROM responses WHERE key = ?', (victim[0],))
+                self._size -= victim[1]
+                self.stats['evictions'] += 1
+            db.commit()
+
+    def clear(self):
+        with self._lock:
+            db = self._connect(create=False)
+            if db is not None:
+                db.execute('DELETE FROM responses')
+                db.commit()
+            self._size = 0
+
+    def info(self) -> Dict:
+        with self._lock:
+            db = self._connect(create=False)
+            entries = db.execute('SELECT COUNT(*) FROM responses').fetchone()[0] if db is not None else 0
+            return dict(self.stats, entries=entries, bytes=self._size)
+
+class ResponseCache:
+    """
+    Memory LRU in front of a SQLite store, with per-endpoint TTLs
+
+    Args:
+        path: SQLite file, or None for memory only
+        ttls: TTL table by path prefix (defaults to ENDPOINT_TTLS)
+        default_ttl: TTL for endpoints not in the table (0 = don't cache)
+        memory_entries: Memory tier entry limit
+        memory_bytes: Memory tier byte limit
+    """
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 0, memory_entries: int = 1024, memory_bytes: int = 64 * 1024 * 1024):
+        self.ttls = dict(ENDPOINT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.memory = LRUCache(memory_entries, memory_bytes)
+        self.disk = SQLiteCache(path) if path else None
+
+    def ttl_for(self, url: str) -> float:
+        """
+        Get the TTL for a URL
+
+        Args:
+            url: Absolute API URL
+
+        Returns:
+            Seconds to keep the response (0 means don't cache)
+        """
+        path = urlsplit(url).path
+        if path.startswith('/api/v1'):
+            path = path[len('/api/v1'):]
+
+        best = None
+        for prefix in self.ttls:
+            if (path == prefix or path.startswith(prefix + '/')) and (best is None or len(prefix) > len(best)):
+                best = prefix
+
+        return self.ttls[best] if best else self.default_ttl
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Look a key up in memory, then on disk (promoting disk hits)"""
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.put(key, entry)
+        return entry
+
+    def put(self, key: str, response: requests.Response, ttl: float):
+        """Store a response in both tiers"""
+        entry = CachedResponse(
+            response.status_code,
+            {k: v for k, v in response.headers.items() if k.lower() == 'content-type'},
+            response.content,
+            time.time() + ttl
+        )
+        self.memory.put(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, entry)
+
+    def clear(self):
+        """Drop everything from both tiers"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict:
+        """
+        Get hit, miss, eviction and size counters for each tier
+
+        Returns:
+            Dictionary with `memory` and `disk` stats
+        """
+        return {
+            'memory': self.memory.info(),
+            'disk': self.disk.info() if self.disk is not None else None
+        }
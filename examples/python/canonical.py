@@ -0,0 +1,146 @@
+"""
+Cognima API - URL Canonicalization (Python)
+
+The same media reaches us under many spellings: twitter.com, x.com and
+twitter.com/i/status links to one tweet, YouTube watch?v= and youtu.be
+links, share links with tracking parameters. Caches, request coalescing
+and dedup indexes keyed on raw URLs miss on all of them.
+
+canonicalize() rewrites a URL to one stable spelling the API accepts,
+and media_key() reduces it to a "platform:id" key:
+
+    canonicalize('https://youtu.be/dQw4w9WgXcQ?si=abc')
+        -> 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+    media_key('https://x.com/someone/status/123?s=20')
+        -> 'twitter:123'
+
+client.request keys its cache and request coalescing on the
+canonicalize()d `url` parameter of API calls, while the API still gets
+the caller's URL (COGNIMA_CANONICALIZE=0 turns that off). Unknown sites only lose tracking parameters; the rest of their
+query string is kept exactly as written, since its order or encoding
+may matter to the site.
+"""
+
+import functools
+import re
+from typing import List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+# Query parameters that never change what a URL points to
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'igshid', 'igsh',
+    'mc_cid', 'mc_eid', '_hsenc', '_hsmi', 'mkt_tok', 'ref_src', 'ref_url'
+})
+TRACKING_PREFIXES = ('utm_',)
+
+_HOST_PREFIXES = ('www.', 'm.', 'mobile.')
+
+# (platform, pattern over "host/path?query", canonical URL template or
+# None to keep the cleaned URL). The `id` group is the media ID; other
+# named groups are access tokens the template keeps (unlisted Vimeo
+# hashes, Drive resource keys, SoundCloud secret links). Known platforms
+# lose the rest of their query string.
+RULES: List[Tuple[str, str, Optional[str]]] = [
+    ('youtube', r'(?:music\.)?youtube\.com/watch\?(?:[^#]*&)?v=(?P<id>[\w-]{11})',
+     'https://www.youtube.com/watch?v={id}'),
+    ('youtube', r'(?:youtu\.be|youtube(?:-nocookie)?\.com/(?:shorts|embed|live|v))/(?P<id>[\w-]{11})',
+     'https://www.youtube.com/watch?v={id}'),
+    ('twitter', r'(?:twitter|x|fxtwitter|vxtwitter)\.com/(?:\w+|i(?:/web)?)/status(?:es)?/(?P<id>\d+)',
+     'https://twitter.com/i/status/{id}'),
+    ('instagram', r'instagram\.com/(?:[\w.]+/)?(?:p|reels?|tv)/(?P<id>[\w-]+)',
+     'https://www.instagram.com/p/{id}/'),
+    ('tiktok', r'tiktok\.com/@[\w.-]+/(?:video|photo)/(?P<id>\d+)', None),
+    ('spotify', r'open\.spotify\.com/(?:intl-[\w-]+/)?(?P<id>(?:track|album|playlist|artist|episode)/\w+)',
+     'https://open.spotify.com/{id}'),
+    ('soundcloud', r'soundcloud\.com/(?P<id>[\w-]+/(?!sets/)[\w-]+(?:/s-\w+)?)', 'https://soundcloud.com/{id}'),
+    ('vimeo', r'(?:player\.)?vimeo\.com/(?:video/|channels/[\w-]+/)?(?P<id>\d+)/?\?(?:[^#]*&)?h=(?P<hash>[\da-f]+)',
+     'https://vimeo.com/{id}/{hash}'),
+    ('vimeo', r'vimeo\.com/(?:channels/[\w-]+/)?(?P<id>\d+)/(?P<hash>[\da-f]{6,})(?!\w)', 'https://vimeo.com/{id}/{hash}'),
+    ('vimeo', r'(?:player\.)?vimeo\.com/(?:video/|channels/[\w-]+/)?(?P<id>\d+)', 'https://vimeo.com/{id}'),
+    ('dailymotion', r'(?:dailymotion\.com/video|dai\.ly)/(?P<id>[a-z0-9]+)',
+     'https://www.dailymotion.com/video/{id}'),
+    ('twitch', r'(?:clips\.twitch\.tv/|twitch\.tv/\w+/clip/)(?P<id>[\w-]+)', 'https://clips.twitch.tv/{id}'),
+    ('twitch', r'twitch\.tv/(?P<id>videos/\d+)', 'https://www.twitch.tv/{id}'),
+    ('streamable', r'streamable\.com/(?:[eo]/)?(?P<id>\w+)', 'https://streamable.com/{id}'),
+    ('bandcamp', r'(?P<id>[\w-]+\.bandcamp\.com/(?:track|album)/[\w-]+)', 'https://{id}'),
+    ('reddit', r'(?:old\.|new\.)?reddit\.com/r/\w+/comments/(?P<id>\w+)', None),
+    ('reddit', r'redd\.it/(?P<id>\w+)', 'https://www.reddit.com/comments/{id}/'),
+    ('facebook', r'facebook\.com/(?:watch/?\?(?:[^#]*&)?v=|[\w.]+/videos/(?:[\w.-]+/)?|reel/)(?P<id>\d+)',
+     'https://www.facebook.com/watch/?v={id}'),
+    ('pinterest', r'pinterest\.[a-z.]+/pin/(?P<id>\d+)', 'https://www.pinterest.com/pin/{id}/'),
+    ('gdrive', r'(?:drive|docs)\.google\.com/(?=(?:file/d/|(?:open|uc)\?(?:[^#]*&)?id=)(?P<id>[\w-]{10,}))'
+               r'[^?#]*\?(?:[^#]*&)?resourcekey=(?P<resourcekey>[\w-]+)',
+     'https://drive.google.com/file/d/{id}/view?resourcekey={resourcekey}'),
+    ('gdrive', r'(?:drive|docs)\.google\.com/(?:file/d/|(?:open|uc)\?(?:[^#]*&)?id=)(?P<id>[\w-]{10,})',
+     'https://drive.google.com/file/d/{id}/view'),
+    ('mediafire', r'mediafire\.com/(?:file|view|download)/(?P<id>\w+)', None),
+]
+
+_RULES = [(platform, re.compile(pattern, re.IGNORECASE), template) for platform, pattern, template in RULES]
+
+class Canonical(NamedTuple):
+    platform: Optional[str]
+    id: Optional[str]
+    url: str
+
+    @property
+    def key(self) -> str:
+        """Stable "platform:id" key ("url:<url>" for unknown sites)"""
+        return f'{self.platform}:{self.id}' if self.platform else f'url:{self.url}'
+
+def _clean(url: str, keep_query: bool) -> str:
+    """Lowercase scheme and host, drop default ports, fragment and tracking parameters"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower() or 'https'
+    host = (parts.hostname or '').lower()
+    if parts.port and (scheme, parts.port) not in (('http', 80), ('https', 443)):
+        host = f'{host}:{parts.port}'
+
+    query = ''
+    if keep_query:
+        # Drop tracking pairs but leave the others untouched (order and encoding)
+        query = '&'.join(pair for pair in parts.query.split('&') if pair and not _is_tracking(pair))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+def _is_tracking(pair: str) -> bool:
+    name = unquote_plus(pair.split('=', 1)[0]).lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+@functools.lru_cache(maxsize=4096)
+def parse(url: str) -> Canonical:
+    """
+    Identify the platform and media ID of a URL
+
+    Args:
+        url: Any URL (the scheme may be missing)
+
+    Returns:
+        Canonical(platform, id, url); platform and id are None for
+        sites without a rule
+    """
+    url = url.strip()
+    if '://' not in url:
+        url = f'https://{url}'
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    target = f'{host}{parts.path}?{parts.query}'
+
+    for platform, pattern, template in _RULES:
+        match = pattern.match(target)
+        if match:
+            media_id = match.group('id')
+            canonical = template.format(**match.groupdict()) if template else _clean(url, keep_query=False)
+            return Canonical(platform, media_id, canonical)
+    return Canonical(None, None, _clean(url, keep_query=True))
+
+def canonicalize(url: str) -> str:
+    """Rewrite a URL to its canonical spelling (see the module docstring)"""
+    return parse(url).url
+
+def media_key(url: str) -> str:
+    """Reduce a URL to a stable "platform:id" key for caches and dedup"""
+    return parse(url).key
@@ -1,4 +1,4 @@
-import requests
+import client
 import os
 
 API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -20,7 +20,7 @@ def chat_completion():
         'temperature': 0.7
     }
     
-    response = requests.post(url, json=data, headers=headers)
+    response = client.post(url, json=data, headers=headers)
     
     if response.status_code == 200:
         result = response.json()
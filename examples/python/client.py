@@ -0,0 +1,297 @@
+"""
+Cognima API - Shared HTTP Client (Python)
+
+This module holds the keep-alive connection pools used by every
+example script. API calls to cog.api.br and file transfers from CDN
+hosts use separate pools, so large downloads never hold the sockets
+that lookups need.
+"""
+
+import os
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import canonical
+import concurrency
+import hedging
+import retry
+import singleflight
+from breaker import BreakerRegistry
+from cache import ResponseCache
+from quota import QuotaScheduler
+
+# API Configuration
+API_HOST = 'cog.api.br'
+BASE_URL = os.getenv('COGNIMA_BASE_URL', 'https://cog.api.br/api/v1')
+API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
+
+# Pool sizing: connections kept alive per host, and how many hosts
+# each session keeps pools for
+API_POOL_SIZE = int(os.getenv('COGNIMA_API_POOL_SIZE', '32'))
+CDN_POOL_SIZE = int(os.getenv('COGNIMA_CDN_POOL_SIZE', '16'))
+CDN_POOL_HOSTS = int(os.getenv('COGNIMA_CDN_POOL_HOSTS', '32'))
+
+def _make_session(pool_hosts: int, pool_size: int) -> requests.Session:
+    """
+    Create a session with a keep-alive connection pool
+
+    Args:
+        pool_hosts: Number of per-host pools to keep
+        pool_size: Connections kept alive per host
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size, pool_block=True)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# One session for the API hosts (cog.api.br, consultas.cog.api.br)
+api_session = _make_session(4, API_POOL_SIZE)
+
+# One session for everything else (downloadUrl, CDN and media hosts)
+cdn_session = _make_session(CDN_POOL_HOSTS, CDN_POOL_SIZE)
+
+def is_api_url(url: str) -> bool:
+    """
+    Check whether a URL points at the Cognima API
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        True for cog.api.br, its subdomains and COGNIMA_BASE_URL
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host == API_HOST or host.endswith('.' + API_HOST):
+        return True
+
+    # A stand-in API (COGNIMA_BASE_URL) counts as the API too
+    base = urlsplit(BASE_URL)
+    return parts.netloc == base.netloc and parts.path.startswith(base.path)
+
+def session_for(url: str) -> requests.Session:
+    """
+    Pick the pooled session for a URL
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        The API session or the CDN session
+    """
+    return api_session if is_api_url(url) else cdn_session
+
+def fetch_limits() -> dict:
+    """
+    Read the current quota from GET /status
+
+    Returns:
+        The `limits` block (hourly and daily counters)
+    """
+    response = api_session.get(f'{BASE_URL}/status', headers={'X-API-Key': API_KEY}, timeout=15)
+    response.raise_for_status()
+    return response.json()['data']['limits']
+
+_health = {'ok': True, 'checked_at': 0.0}
+
+def check_health(max_age: float = 10.0) -> bool:
+    """
+    Check GET /status/health (cached for a few seconds)
+
+    Args:
+        max_age: Seconds a previous answer stays valid
+
+    Returns:
+        True if the API reports itself healthy
+    """
+    if time.monotonic() - _health['checked_at'] > max_age:
+        try:
+            response = api_session.get(f'{BASE_URL}/status/health', headers={'X-API-Key': API_KEY}, timeout=5)
+            _health['ok'] = response.status_code == 200
+        except requests.exceptions.RequestException:
+            _health['ok'] = False
+        _health['checked_at'] = time.monotonic()
+
+    return _health['ok']
+
+# Quota-aware scheduler shared by every API call (COGNIMA_QUOTA=0 disables it)
+scheduler = QuotaScheduler(fetch_limits) if os.getenv('COGNIMA_QUOTA', '1') != '0' else None
+
+# One circuit breaker per endpoint path
+breakers = BreakerRegistry(health_check=check_health)
+
+# Identical in-flight JSON lookups share one call
+inflight = singleflight.Group()
+
+# Optional hedging of slow metadata lookups (COGNIMA_HEDGE=1 enables it)
+hedger = hedging.Hedger() if os.getenv('COGNIMA_HEDGE', '0') == '1' else None
+
+# Response cache: memory LRU + SQLite file, created when the first response
+# is stored (COGNIMA_CACHE=0 disables it)
+CACHE_PATH = os.getenv('COGNIMA_CACHE_PATH', os.path.expanduser('~/.cache/cognima/responses.sqlite'))
+cache = ResponseCache(CACHE_PATH) if os.getenv('COGNIMA_CACHE', '1') != '0' else None
+
+# Key cache lookups and coalescing on the canonical spelling of the
+# source `url` of API calls (COGNIMA_CANONICALIZE=0 disables). The API
+# itself always gets the caller's URL unchanged.
+CANONICALIZE = os.getenv('COGNIMA_CANONICALIZE', '1') != '0'
+
+def _canonical_kwargs(kwargs: dict) -> dict:
+    """Canonicalize a `url` in the query params or JSON body (see canonical.py)"""
+    for name in ('params', 'json'):
+        value = kwargs.get(name)
+        if isinstance(value, dict) and isinstance(value.get('url'), str):
+            kwargs = dict(kwargs, **{name: dict(value, url=canonical.canonicalize(value['url']))})
+    return kwargs
+
+def _request_key(method: str, url: str, kwargs: dict) -> str:
+    """Cache and coalescing key of a call, with its source `url` canonicalized"""
+    if CANONICALIZE and is_api_url(url):
+        kwargs = _canonical_kwargs(kwargs)
+    return singleflight.request_key(method, url, kwargs.get('params'), kwargs.get('json'), kwargs.get('headers'))
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send a request through the shared connection pools
+
+    API lookups are answered from the response cache when possible
+    (keyed on the canonical spelling of their source `url` parameter,
+    which is itself sent unchanged).
+    Otherwise they fail fast while their endpoint's circuit is open,
+    wait for quota, run under their endpoint family's adaptive
+    concurrency limit and are retried per retry.policy_for(). Slow
+    metadata lookups may be hedged when COGNIMA_HEDGE=1. CDN transfers
+    go straight to the download pool.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        **kwargs: Passed through to requests (params, json, headers, stream...)
+
+    Returns:
+        requests Response
+
+    Raises:
+        retry.RateLimitExceeded: If a 429 asks for a longer wait than the
+            endpoint's retry policy accepts
+    """
+    if not is_api_url(url):
+        return cdn_session.request(method, url, **kwargs)
+    ttl = 0
+    if cache is not None and method in ('GET', 'POST') and not kwargs.get('stream'):
+        ttl = cache.ttl_for(url)
+
+    if ttl:
+        key = _request_key(method, url, kwargs)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit.to_response(url)
+
+    circuit = breakers.for_url(url)
+
+    def send() -> requests.Response:
+        circuit.before_call()
+        if scheduler is not None and not url.startswith(f'{BASE_URL}/status'):
+            scheduler.acquire()
+
+        def attempt() -> requests.Response:
+            return concurrency.limited(url, lambda: api_session.request(method, url, **kwargs))
+
+        try:
+            if hedger is not None and hedger.applies_to(url) and not kwargs.get('stream'):
+                permit = scheduler.try_acquire if scheduler is not None else None
+                response = hedger.call(url, attempt, permit=permit)
+            else:
+                response = attempt()
+        except Exception:
+            circuit.record(False)
+            raise
+
+        circuit.record(response.status_code < 500)
+        return response
+
+    response = retry.policy_for(url).call(send, on_response=_track_limits)
+
+    if ttl and _cacheable(response):
+        cache.put(key, response, ttl)
+
+    return response
+
+def _cacheable(response: requests.Response) -> bool:
+    """Only successful JSON lookups are worth caching"""
+    if response.status_code != 200:
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return not (isinstance(body, dict) and body.get('success') is False)
+
+def _track_limits(response: requests.Response):
+    """Feed the `limits` block of a 429 body back into the scheduler"""
+    if scheduler is None or response.status_code != 429:
+        return
+    try:
+        limits = response.json().get('limits')
+    except ValueError:
+        return
+    if limits:
+        scheduler.update(limits)
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Send a GET request through the shared pools"""
+    return request('GET', url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Send a POST request through the shared pools"""
+    return request('POST', url, **kwargs)
+
+def request_json(method: str, url: str, raise_for_status: bool = True, coalesce: bool = True, **kwargs):
+    """
+    Send a request and parse the JSON body
+
+    Concurrent identical calls (same method, URL, params and JSON body)
+    share one network call and one parsed result, so treat the result
+    as read-only.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        raise_for_status: Raise requests.HTTPError on 4xx/5xx
+        coalesce: Share in-flight results with identical calls
+        **kwargs: Passed through to requests (params, json, headers...)
+
+    Returns:
+        Parsed JSON body
+    """
+    def fetch():
+        response = request(method, url, **kwargs)
+        if raise_for_status:
+            response.raise_for_status()
+        return response.json()
+
+    if not coalesce:
+        return fetch()
+
+    key = _request_key(method, url, kwargs)
+    return inflight.do((key, raise_for_status), fetch)
+
+def get_json(url: str, **kwargs):
+    """Send a GET request and parse the JSON body (coalesced)"""
+    return request_json('GET', url, **kwargs)
+
+def post_json(url: str, **kwargs):
+    """Send a POST request and parse the JSON body (coalesced)"""
+    return request_json('POST', url, **kwargs)
+
+def close():
+    """Close every pooled connection"""
+    api_session.close()
+    cdn_session.close()
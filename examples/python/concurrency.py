@@ -0,0 +1,293 @@
+"""
+Cognima API - Adaptive Concurrency (Python)
+
+An AIMD (additive increase, multiplicative decrease) limiter per
+endpoint family. While calls succeed within the latency target the
+in-flight limit grows by one per window; a 429, 502 or timeout halves
+it. Slow yt-dlp endpoints and fast search endpoints each settle at the
+concurrency they can sustain, without hand-tuning.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from pipeline import Outcome
+
+class AIMDLimiter:
+    """
+    Thread-safe AIMD concurrency limit
+
+    Args:
+        initial: Starting in-flight limit
+        minimum: Lower bound for the limit
+        maximum: Upper bound for the limit
+        latency_target: Seconds; slower successes don't grow the limit
+        backoff: Factor applied to the limit on overload
+    """
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 32,
+                 latency_target: float = 5.0, backoff: float = 0.5):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.backoff = backoff
+
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        # (loop, future) of coroutines waiting in acquire_async()
+        self._async_waiters: List = []
+
+    @property
+    def limit(self) -> int:
+        """Current in-flight limit"""
+        return int(self._limit)
+
+    def acquire(self):
+        """Block until a slot under the current limit is free"""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self):
+        """Wait on the event loop until a slot under the current limit is free"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self._cond:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self, latency: float, overloaded: bool = False):
+        """
+        Free a slot and adjust the limit
+
+        Args:
+            latency: Seconds the call took
+            overloaded: True for 429, 502 or a timeout
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if overloaded:
+                self._limit = max(self.minimum, self._limit * self.backoff)
+            elif latency <= self.latency_target:
+                # +1 per full window of successful calls
+                self._limit = min(self.maximum, self._limit + 1.0 / max(1.0, self._limit))
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, waiter)
+
+    def stats(self) -> Dict:
+        """
+        Get the limiter state
+
+        Returns:
+            Dictionary with the limit and calls in flight
+        """
+        with self._cond:
+            return {'limit': self.limit, 'in_flight': self._in_flight}
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+OVERLOAD_STATUSES = frozenset({429, 502, 503, 504})
+
+# Endpoint families keyed by path prefix under /api/v1
+FAMILIES: Dict[str, AIMDLimiter] = {
+    'ytdlp': AIMDLimiter(initial=2, maximum=8, latency_target=30.0),
+    'search': AIMDLimiter(initial=4, maximum=32, latency_target=3.0),
+    'default': AIMDLimiter(initial=4, maximum=16, latency_target=10.0),
+}
+
+FAMILY_PREFIXES = {
+    '/alldl': 'ytdlp',
+    '/twitch/download': 'ytdlp',
+    '/vimeo/download': 'ytdlp',
+    '/dailymotion/download': 'ytdlp',
+    '/search': 'search',
+    '/spotify/search': 'search',
+    '/spotify/search-one': 'search',
+    '/soundcloud/search': 'search',
+    '/soundcloud/search-one': 'search',
+    '/apps': 'search',
+}
+
+def family_for(url: str) -> str:
+    """
+    Classify a URL into an endpoint family
+
+    Args:
+        url: Absolute API URL
+
+    Returns:
+        Family name (a key of FAMILIES)
+    """
+    path = urlsplit(url).path
+    if path.startswith('/api/v1'):
+        path = path[len('/api/v1'):]
+
+    for prefix in sorted(FAMILY_PREFIXES, key=len, reverse=True):
+        if path == prefix or path.startswith(prefix + '/'):
+            return FAMILY_PREFIXES[prefix]
+
+    return 'default'
+
+def limiter_for(url: str) -> AIMDLimiter:
+    """Get the limiter for a URL's endpoint family"""
+    return FAMILIES[family_for(url)]
+
+def limited(url: str, send: Callable[[], requests.Response]) -> requests.Response:
+    """
+    Run one request under its family's concurrency limit
+
+    Args:
+        url: Absolute API URL (picks the family)
+        send: Callable that performs the request
+
+    Returns:
+        The response from send()
+    """
+    limiter = limiter_for(url)
+    limiter.acquire()
+    start = time.monotonic()
+
+    try:
+        response = send()
+    except requests.exceptions.Timeout:
+        limiter.release(time.monotonic() - start, overloaded=True)
+        raise
+    except Exception:
+        limiter.release(time.monotonic() - start)
+        raise
+
+    limiter.release(time.monotonic() - start, response.status_code in OVERLOAD_STATUSES)
+    return response
+
+async def limited_async(url: str, send: Callable[[], Awaitable[requests.Response]]) -> requests.Response:
+    """
+    Awaitable limited(): the same family limiters, so coroutines and
+    threads share one concurrency limit
+
+    Args:
+        url: Absolute API URL (picks the family)
+        send: Coroutine function that performs the request
+
+    Returns:
+        The response from send()
+    """
+    limiter = limiter_for(url)
+    await limiter.acquire_async()
+    start = time.monotonic()
+
+    try:
+        response = await send()
+    except asyncio.TimeoutError:
+        limiter.release(time.monotonic() - start, overloaded=True)
+        raise
+    except BaseException:
+        limiter.release(time.monotonic() - start)
+        raise
+
+    limiter.release(time.monotonic() - start, response.status_code in OVERLOAD_STATUSES)
+    return response
+
+def map_concurrent(func: Callable, items: Iterable, max_workers: Optional[int] = None) -> List:
+    """
+    Apply func to every item on a thread pool, keeping input order
+
+    The pool only bounds threads; how many calls actually run at once
+    is decided by the per-family limiters inside client.request().
+
+    Args:
+        func: Function to call with each item
+        items: Inputs
+        max_workers: Thread count (defaults to the largest family maximum)
+
+    Returns:
+        List of results in the same order as items
+    """
+    workers = max_workers or max(l.maximum for l in FAMILIES.values())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
+
+def fan_out(func: Callable, items: Iterable, ordered: bool = True,
+            max_workers: Optional[int] = None, timeout: Optional[float] = None) -> Iterator[Outcome]:
+    """
+    Apply func to every item on a thread pool, yielding each outcome
+
+    Like map_concurrent, the per-family limiters inside client.request()
+    decide how many calls actually run at once, so every batch shares
+    them; unlike it, one failed item doesn't fail the batch.
+
+    Args:
+        func: Function to call with each item
+        items: Inputs
+        ordered: Yield in input order (each outcome as soon as it and
+            all earlier ones are done); False yields in completion order
+        max_workers: Thread count (defaults to the largest family maximum)
+        timeout: Seconds for the whole batch; items still running then
+            get a TimeoutError and are not waited for
+
+    Yields:
+        pipeline.Outcome per item, with index set to its input position
+        and error set instead of value if func raised
+    """
+    items = list(items)
+    workers = max_workers or max(l.maximum for l in FAMILIES.values())
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(items))))
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def outcome(future) -> Outcome:
+        index = futures[future]
+        result = Outcome(items[index], index=index)
+        try:
+            result.value = future.result(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        except FuturesTimeoutError:
+            future.cancel()
+            result.error = TimeoutError(f'No result within {timeout:g}s')
+        except Exception as e:
+            result.error = e
+        return result
+
+    try:
+        futures = {pool.submit(func, item): index for index, item in enumerate(items)}
+        if ordered:
+            for future in futures:
+                yield outcome(future)
+            return
+
+        finished = set()
+        try:
+            for future in as_completed(futures, timeout):
+                finished.add(future)
+                yield outcome(future)
+        except FuturesTimeoutError:
+            # Out of time: report the rest as timed out, in input order
+            for future in futures:
+                if future not in finished:
+                    yield outcome(future)
+    finally:
+        # A caller that stops iterating early drops the queued calls; after
+        # a timeout the stragglers finish in the background
+        pool.shutdown(wait=deadline is None, cancel_futures=True)
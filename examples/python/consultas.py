@@ -1,5 +1,6 @@
 import os
 import requests
+import client
 from typing import Dict, Optional
 
 API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -11,7 +12,7 @@ def check_status() -> Dict:
     print('=== Checking Telegram Bot Status ===\n')
     
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/consulta/status',
             headers={'X-API-Key': API_KEY}
         )
@@ -46,7 +47,7 @@ def perform_query(query_type: str, data: str) -> Dict:
     print(f'Data: {data}\n')
     
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/consulta',
             params={'type': query_type, 'dados': data},
             headers={'X-API-Key': API_KEY}
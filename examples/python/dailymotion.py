@@ -1,4 +1,5 @@
-import requests
+import client
+import formats
 
 API_BASE = 'https://cog.api.br/api/v1'
 
@@ -13,7 +14,7 @@ def download_dailymotion(url: str) -> dict:
         dict: Download data or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/dailymotion/download', params={'url': url})
+        response = client.get(f'{API_BASE}/dailymotion/download', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -46,7 +47,7 @@ def get_dailymotion_formats(url: str) -> list:
         list: Available formats or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/dailymotion/formats', params={'url': url})
+        response = client.get(f'{API_BASE}/dailymotion/formats', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -67,6 +68,35 @@ def get_dailymotion_formats(url: str) -> list:
         print(f'Request Error: {str(e)}')
         return None
 
+def select_dailymotion_format(url: str, spec: str = 'best') -> dict:
+    """
+    Pick one format for a Dailymotion video
+    
+    Args:
+        url: Dailymotion video URL
+        spec: Format spec (see formats.parse), e.g. 'best <=720p under 200MB'
+        
+    Returns:
+        dict: Selected format (with its url) or None if error or nothing matches
+    """
+    try:
+        data = client.get_json(f'{API_BASE}/dailymotion/formats', params={'url': url}, raise_for_status=False)
+        
+        if data.get('success'):
+            selected = formats.select(data['formats'], spec)
+            if selected:
+                print(f"Selected ({spec}): {selected['formatId']}")
+            else:
+                print(f'No format matches: {spec}')
+            return selected
+        else:
+            print(f"Error: {data.get('error')}")
+            return None
+            
+    except Exception as e:
+        print(f'Request Error: {str(e)}')
+        return None
+
 def get_dailymotion_info(url: str) -> dict:
     """
     Get information about Dailymotion video
@@ -78,7 +108,7 @@ def get_dailymotion_info(url: str) -> dict:
         dict: Video information or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/dailymotion/info', params={'url': url})
+        response = client.get(f'{API_BASE}/dailymotion/info', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -118,3 +148,8 @@ if __name__ == '__main__':
     # Example 3: Get video info
     print(f'Getting video info: {dailymotion_url}')
     get_dailymotion_info(dailymotion_url)
+    
+    print('\n=== Dailymotion Format Selection Example ===\n')
+    
+    # Example 4: Pick the format to download
+    select_dailymotion_format(dailymotion_url, 'best <=720p under 200MB')
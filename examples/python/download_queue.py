@@ -0,0 +1,346 @@
+"""
+Cognima API - Persistent Download Queue (Python)
+
+A priority queue of download jobs kept in a SQLite file (WAL mode), so
+a batch survives crashes and deploys. Each job names a downloader
+endpoint family (alldl, vimeo, twitch, dailymotion, gdrive, mediafire,
+spotify, soundcloud, ... or auto, which lets routing.py choose), a
+source URL and an output path, plus a priority, an optional deadline
+and its retry state.
+
+A job runs in two steps, both recorded in the queue: resolving the
+source URL through the API to a downloadUrl, then transferring the file
+with the ranged downloader. After a restart, finished jobs are skipped,
+resolved jobs go straight to the transfer (which resumes its .part
+file) and jobs that were running are put back in line.
+
+    queue = DownloadQueue()
+    queue.add('vimeo', 'https://vimeo.com/123456789', 'downloads/talk.mp4', priority=10)
+    queue.run(workers=4)
+
+One process should work a queue file at a time.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import canonical
+import downloader
+import integrity
+import retry
+import routing
+from store import ContentStore
+
+QUEUE_PATH = os.getenv('COGNIMA_QUEUE_PATH', os.path.expanduser('~/.cache/cognima/downloads.sqlite'))
+
+# Delay between attempts of a failed job (full jitter, 30 s up to 1 h)
+RETRY_BACKOFF = retry.RetryPolicy(base_delay=30.0, max_delay=3600.0)
+
+# How each job kind turns its source URL into a downloadUrl; 'auto'
+# lets the router pick the fastest endpoint for the URL
+RESOLVERS: Dict[str, Callable[[str], Dict]] = dict(routing.RESOLVERS, auto=routing.resolve)
+
+# Kinds whose resolved size is exact enough to verify downloads against
+SIZE_CHECKED = ('alldl', 'gdrive')
+
+@dataclass
+class Job:
+    """One row of the queue"""
+    id: int
+    kind: str
+    url: str
+    output_path: str
+    priority: int
+    deadline: Optional[float]
+    state: str
+    attempts: int
+    max_attempts: int
+    next_attempt_at: float
+    last_error: Optional[str]
+    resolved: Optional[Dict]
+    result: Optional[Dict]
+
+_COLUMNS = ('id, kind, url, output_path, priority, deadline, state, attempts, max_attempts,'
+            ' next_attempt_at, last_error, resolved, result')
+
+def _job(row) -> Job:
+    values = list(row)
+    values[11] = json.loads(values[11]) if values[11] else None
+    values[12] = json.loads(values[12]) if values[12] else None
+    return Job(*values)
+
+class DownloadQueue:
+    """
+    SQLite-backed priority queue of download jobs
+
+    Job states: pending -> running -> done, or failed once max_attempts
+    is used up, or expired when the deadline passes first.
+
+    Args:
+        path: Database file
+        store: Content store to keep the files in (see store.py); output
+            paths become links into it and URLs it already holds are
+            not downloaded again
+    """
+
+    def __init__(self, path: str = QUEUE_PATH, store: Optional[ContentStore] = None):
+        self.path = path
+        self.store = store
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' id INTEGER PRIMARY KEY, kind TEXT, url TEXT, output_path TEXT,'
+            ' priority INTEGER, deadline REAL, state TEXT, attempts INTEGER, max_attempts INTEGER,'
+            ' next_attempt_at REAL, last_error TEXT, resolved TEXT, result TEXT,'
+            ' created_at REAL, updated_at REAL, UNIQUE (kind, url, output_path))'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, priority, deadline)')
+        # Whatever was running when the last process died goes back in line
+        self._db.execute("UPDATE jobs SET state = 'pending' WHERE state = 'running'")
+        self._db.commit()
+
+    def add(self, kind: str, url: str, output_path: str, priority: int = 0,
+            deadline: Optional[float] = None, max_attempts: int = 5) -> int:
+        """
+        Queue a download (adding the same job twice is a no-op, also
+        when the URL is spelled differently; see canonical.py)
+
+        Args:
+            kind: Key of RESOLVERS
+            url: Source URL (video page, file share, track link...)
+            output_path: Where to save the file
+            priority: Higher runs first
+            deadline: Unix time after which the job is dropped
+            max_attempts: Attempts before the job is marked failed
+
+        Returns:
+            Job id
+        """
+        if kind not in RESOLVERS:
+            raise ValueError(f'Unknown job kind: {kind}')
+        url = canonical.canonicalize(url)
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR IGNORE INTO jobs (kind, url, output_path, priority, deadline, state, attempts,'
+                " max_attempts, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, 'pending', 0, ?, 0, ?, ?)",
+                (kind, url, output_path, priority, deadline, max_attempts, now, now)
+            )
+            self._db.commit()
+            return self._db.execute(
+                'SELECT id FROM jobs WHERE kind = ? AND url = ? AND output_path = ?', (kind, url, output_path)
+            ).fetchone()[0]
+
+    def claim(self) -> Optional[Job]:
+        """
+        Take the most urgent ready job and mark it running
+
+        Ready means pending with its retry delay over. Higher priority
+        goes first, then the nearest deadline, then the oldest job.
+
+        Returns:
+            The claimed Job, or None if nothing is ready
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET state = 'expired', updated_at = ?"
+                " WHERE state = 'pending' AND deadline IS NOT NULL AND deadline <= ?", (now, now)
+            )
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE state = 'pending' AND next_attempt_at <= ?"
+                ' ORDER BY priority DESC, deadline IS NULL, deadline, id LIMIT 1', (now,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE jobs SET state = 'running', updated_at = ? WHERE id = ?", (now, row[0]))
+            self._db.commit()
+
+        if row is None:
+            return None
+        job = _job(row)
+        job.state = 'running'
+        return job
+
+    def set_resolved(self, job_id: int, resolved: Dict):
+        """Store the resolved downloadUrl so a restart can skip the API call"""
+        self._update(job_id, resolved=json.dumps(resolved))
+
+    def complete(self, job_id: int, result: Dict):
+        """Mark a job done"""
+        self._update(job_id, state='done', result=json.dumps(result), last_error=None)
+
+    def fail(self, job_id: int, error: str) -> str:
+        """
+        Record a failed attempt, scheduling a retry if attempts remain
+
+        Args:
+            job_id: Job id
+            error: Error message
+
+        Returns:
+            The job's new state ('pending' or 'failed')
+        """
+        with self._lock:
+            attempts, max_attempts = self._db.execute(
+                'SELECT attempts, max_attempts FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        attempts += 1
+        state = 'pending' if attempts < max_attempts else 'failed'
+        self._update(job_id, state=state, attempts=attempts, last_error=error,
+                     next_attempt_at=time.time() + RETRY_BACKOFF.backoff(attempts))
+        return state
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """Get one job"""
+        with self._lock:
+            row = self._db.execute(f'SELECT {_COLUMNS} FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def jobs(self, state: Optional[str] = None) -> List[Job]:
+        """List jobs, optionally only those in one state"""
+        with self._lock:
+            if state is None:
+                rows = self._db.execute(f'SELECT {_COLUMNS} FROM jobs ORDER BY id').fetchall()
+            else:
+                rows = self._db.execute(f'SELECT {_COLUMNS} FROM jobs WHERE state = ? ORDER BY id', (state,)).fetchall()
+        return [_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per state"""
+        with self._lock:
+            return dict(self._db.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+
+    def next_ready_in(self) -> Optional[float]:
+        """Seconds until the next pending job is ready (None if none is pending)"""
+        with self._lock:
+            row = self._db.execute("SELECT MIN(next_attempt_at) FROM jobs WHERE state = 'pending'").fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def run(self, workers: int = 4, stop_when_idle: bool = True, poll_interval: float = 1.0) -> Dict[str, int]:
+        """
+        Work the queue with concurrent worker threads
+
+        Args:
+            workers: Jobs processed at once
+            stop_when_idle: Return once nothing is pending or running
+            poll_interval: Longest sleep while waiting for ready jobs
+
+        Returns:
+            Number of jobs per state when the workers stopped
+        """
+        running = [0]
+        running_lock = threading.Lock()
+
+        def work():
+            while True:
+                # Claim and count under one lock, so no other worker can see
+                # the job neither pending nor running and stop early
+                with running_lock:
+                    job = self.claim()
+                    if job is not None:
+                        running[0] += 1
+                if job is None:
+                    wait = self.next_ready_in()
+                    with running_lock:
+                        idle = wait is None and running[0] == 0
+                    if idle and stop_when_idle:
+                        return
+                    time.sleep(min(poll_interval, wait if wait is not None else poll_interval))
+                    continue
+
+                try:
+                    process_job(self, job)
+                finally:
+                    with running_lock:
+                        running[0] -= 1
+
+        threads = [threading.Thread(target=work, name=f'queue-{i}', daemon=True) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return self.counts()
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+    def _update(self, job_id: int, **fields):
+        fields['updated_at'] = time.time()
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        with self._lock:
+            self._db.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+            self._db.commit()
+
+def process_job(queue: DownloadQueue, job: Job) -> bool:
+    """
+    Resolve (unless already resolved) and download one claimed job
+
+    Args:
+        queue: Queue the job came from
+        job: Claimed job
+
+    Returns:
+        True if the job finished
+    """
+    resolver = RESOLVERS[job.kind]
+
+    def re_resolve() -> str:
+        fresh = resolver(job.url)
+        queue.set_resolved(job.id, fresh)
+        return fresh['downloadUrl']
+
+    def download(output_path: str) -> Dict:
+        resolved = job.resolved
+        if resolved is None:
+            resolved = resolver(job.url)
+            queue.set_resolved(job.id, resolved)
+
+        kind = resolved.get('route', job.kind)
+        return downloader.download(
+            resolved['downloadUrl'], output_path, params=resolved.get('params'),
+            resolve=None if resolved.get('static') else re_resolve, job_class='bulk',
+            expected_size=integrity.expected_size(resolved) if kind in SIZE_CHECKED else None
+        )
+
+    try:
+        if queue.store is not None:
+            # Known URLs are linked without resolving or downloading
+            result = queue.store.fetch([job.url], job.output_path, download)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(job.output_path)), exist_ok=True)
+            result = download(job.output_path)
+    except Exception as e:
+        state = queue.fail(job.id, str(e))
+        print(f'❌ Job {job.id} ({job.kind}) {"will retry" if state == "pending" else "failed"}: {e}')
+        return False
+
+    queue.complete(job.id, result)
+    print(f'✅ Job {job.id} ({job.kind}) saved to {job.output_path}')
+    return True
+
+if __name__ == '__main__':
+    queue = DownloadQueue()
+
+    queue.add('vimeo', 'https://vimeo.com/123456789', 'downloads/vimeo.mp4', priority=10)
+    queue.add('gdrive', 'https://drive.google.com/file/d/1ABC123xyz/view', 'downloads/file.zip')
+    queue.add('auto', 'https://x.com/user/status/1234567890', 'downloads/tweet.mp4')
+    queue.add('spotify', 'https://open.spotify.com/track/4cOdK2wGLETKBW3PvgPWqT', 'downloads/track.mp3',
+              deadline=time.time() + 3600)
+
+    print(f'📋 Jobs: {queue.counts()}')
+    print(f'📋 Finished: {queue.run(workers=4)}')
+    queue.close()
@@ -0,0 +1,655 @@
+"""
+Cognima API - Ranged Downloader (Python)
+
+Downloads a `downloadUrl` over several connections at once. The first
+request asks for a single byte; a 206 answer tells us the file size and
+that the host accepts Range requests. Large files are then split into
+byte ranges fetched in parallel, each written straight to its offset in
+a preallocated file. Hosts without Range support get one plain stream,
+and so do API endpoints that stream a file themselves (such as
+/spotify/download): there every extra request would cost quota and
+could redo the work on the server.
+
+Data goes to `<output>.part` while a sidecar journal
+(`<output>.part.json`) records the byte ranges already on disk and the
+validators (ETag, Last-Modified, size) of the file they came from. A
+later call for the same output resumes the missing ranges, and an
+expired signed link is replaced through the `resolve` callback.
+
+Stream and stream_to hand the body to other consumers instead (byte
+chunks, file-like objects, sockets, several sinks at once) without
+writing it to disk first.
+"""
+
+import json
+import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+import bandwidth
+import client
+import integrity
+import streamcopy
+
+# Parallel connections per file and the smallest file worth splitting
+CONNECTIONS = int(os.getenv('COGNIMA_DOWNLOAD_CONNECTIONS', '4'))
+MIN_SPLIT_SIZE = 8 * 1024 * 1024
+
+# How often the journal is rewritten while data arrives
+CHECKPOINT_BYTES = 4 * 1024 * 1024
+CHECKPOINT_SECONDS = 2.0
+
+# When to fsync the .part file: 'off', 'end' (before it is renamed into
+# place) or 'checkpoint' (also before every journal write)
+FSYNC = os.getenv('COGNIMA_DOWNLOAD_FSYNC', 'end')
+
+# CDN answers that mean the signed downloadUrl is no longer valid (API
+# endpoints answering these are plain HTTP errors)
+EXPIRED_STATUSES = (401, 403, 404, 410)
+
+_CONTENT_RANGE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+_EMPTY_RANGE = re.compile(r'bytes\s+\*/0$')
+
+Range = Tuple[int, int]
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Parse a Content-Range header
+
+    Args:
+        value: Header value such as "bytes 0-0/1048576"
+
+    Returns:
+        (first byte, last byte, total size or None), or None if invalid
+    """
+    match = _CONTENT_RANGE.match(value or '')
+    if not match:
+        return None
+    first, last, total = match.groups()
+    return int(first), int(last), None if total == '*' else int(total)
+
+def split_ranges(size: int, parts: int) -> List[Range]:
+    """
+    Split a file into contiguous inclusive byte ranges
+
+    Args:
+        size: File size in bytes
+        parts: Number of ranges
+
+    Returns:
+        List of (first byte, last byte)
+    """
+    parts = max(1, min(parts, size))
+    step = -(-size // parts)
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """Sort inclusive ranges and merge the ones that touch or overlap"""
+    merged: List[List[int]] = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return [(first, last) for first, last in merged]
+
+def missing_ranges(size: int, done: List[Range]) -> List[Range]:
+    """
+    Get the byte ranges of a file that are not yet on disk
+
+    Args:
+        size: File size in bytes
+        done: Completed inclusive ranges
+
+    Returns:
+        Gaps as inclusive ranges
+    """
+    gaps = []
+    position = 0
+    for first, last in merge_ranges(done):
+        if first > position:
+            gaps.append((position, first - 1))
+        position = max(position, last + 1)
+    if position < size:
+        gaps.append((position, size - 1))
+    return gaps
+
+def plan_ranges(gaps: List[Range], connections: int, min_split_size: int) -> List[Range]:
+    """
+    Cut the missing ranges into roughly one piece per connection
+
+    Args:
+        gaps: Missing inclusive ranges
+        connections: Parallel connections available
+        min_split_size: Don't cut pieces smaller than this
+
+    Returns:
+        Ranges to fetch
+    """
+    remaining = sum(last - first + 1 for first, last in gaps)
+    if connections <= 1 or remaining < min_split_size:
+        return gaps
+
+    target = max(min_split_size // 2, -(-remaining // connections))
+    pieces = []
+    for first, last in gaps:
+        parts = max(1, (last - first + 1) // target)
+        pieces.extend((first + a, first + b) for a, b in split_ranges(last - first + 1, parts))
+    return pieces
+
+def preallocate(path: str, size: int):
+    """
+    Create (or truncate) a file of the given size
+
+    Args:
+        path: File path
+        size: Size in bytes
+    """
+    with open(path, 'wb') as f:
+        if size and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError:
+                # Not supported by every filesystem; a sparse file still works
+                pass
+        f.truncate(size)
+
+class Journal:
+    """
+    Sidecar record of the byte ranges of a .part file already on disk
+
+    Args:
+        path: Journal file path
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size: Optional[int] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.done: List[Range] = []
+
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    @classmethod
+    def load(cls, path: str) -> 'Journal':
+        """Read a journal, or start an empty one if missing or unreadable"""
+        journal = cls(path)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            journal.size = state.get('size')
+            journal.etag = state.get('etag')
+            journal.last_modified = state.get('last_modified')
+            journal.done = merge_ranges([tuple(r) for r in state.get('done', [])])
+        except (OSError, ValueError, TypeError):
+            pass
+        return journal
+
+    def matches(self, size: int, etag: Optional[str], last_modified: Optional[str]) -> bool:
+        """
+        Check whether the journal describes the same remote file
+
+        Args:
+            size: Current remote size
+            etag: Current ETag header
+            last_modified: Current Last-Modified header
+
+        Returns:
+            True if every validator known on both sides agrees
+        """
+        if self.size != size:
+            return False
+        if self.etag and etag and self.etag != etag:
+            return False
+        if self.last_modified and last_modified and self.last_modified != last_modified:
+            return False
+        return True
+
+    def reset(self, size: int, etag: Optional[str], last_modified: Optional[str]):
+        """Start over for a new remote file"""
+        with self._lock:
+            self.size, self.etag, self.last_modified = size, etag, last_modified
+            self.done = []
+        self.save()
+
+    def mark(self, first: int, last: int) -> bool:
+        """
+        Record that bytes first..last are on disk
+
+        Returns:
+            True when enough has changed that the journal should be saved
+        """
+        with self._lock:
+            self.done = merge_ranges(self.done + [(first, last)])
+            self._unsaved += last - first + 1
+            return self._unsaved >= CHECKPOINT_BYTES or time.monotonic() - self._saved_at >= CHECKPOINT_SECONDS
+
+    def contiguous_end(self, position: int) -> int:
+        """End (exclusive) of the completed run starting at position"""
+        with self._lock:
+            for first, last in self.done:
+                if first <= position <= last:
+                    return last + 1
+            return position
+
+    def completed(self) -> int:
+        """Bytes already on disk"""
+        with self._lock:
+            return sum(last - first + 1 for first, last in self.done)
+
+    def save(self):
+        """Write the journal atomically"""
+        with self._lock:
+            state = {'size': self.size, 'etag': self.etag, 'last_modified': self.last_modified,
+                     'done': [list(r) for r in self.done]}
+            tmp = f'{self.path}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp, self.path)
+            self._unsaved = 0
+            self._saved_at = time.monotonic()
+
+    def remove(self):
+        """Delete the journal once the download is complete"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+class LinkExpired(requests.exceptions.HTTPError):
+    """The CDN rejected a downloadUrl that used to work"""
+
+class RangeIgnored(requests.exceptions.InvalidHeader):
+    """A range request got the whole file (the file changed or Range was dropped)"""
+
+def _raise_for_status(response: requests.Response, url: str):
+    if response.status_code in EXPIRED_STATUSES and not client.is_api_url(url):
+        raise LinkExpired(f'{response.status_code} for downloadUrl', response=response)
+    response.raise_for_status()
+
+def _if_range(etag: Optional[str], last_modified: Optional[str]) -> Dict:
+    """If-Range header so a changed file answers 200 instead of a wrong slice"""
+    if etag and not etag.startswith('W/'):
+        return {'If-Range': etag}
+    if last_modified:
+        return {'If-Range': last_modified}
+    return {}
+
+def _fetch_range(url: str, path: str, first: int, last: int, options: 'Options', journal: Journal,
+                 on_write: Callable[[int, memoryview], None], throttle: Optional[Callable[[int], None]]) -> int:
+    """Fetch one byte range and write it at its offset"""
+    range_headers = dict(options.headers, Range=f'bytes={first}-{last}',
+                         **_if_range(journal.etag, journal.last_modified))
+    with client.get(url, headers=range_headers, params=options.params, stream=True, timeout=(15, 120)) as response:
+        _raise_for_status(response, url)
+        if response.status_code != 206:
+            raise RangeIgnored(f'Host ignored Range for bytes {first}-{last}')
+        with open(path, 'r+b', buffering=0) as f:
+            def write_and_checkpoint(offset: int, data: memoryview):
+                # Writes are unbuffered, so the data is in the file before
+                # the journal can claim it
+                if journal.mark(offset, offset + len(data) - 1):
+                    if FSYNC == 'checkpoint':
+                        os.fsync(f.fileno())
+                    journal.save()
+                on_write(offset, data)
+
+            return streamcopy.copy_to_file(response, f, first, last - first + 1, write_and_checkpoint, throttle)
+
+@dataclass
+class Options:
+    """Settings for one download (see download() for their meaning)"""
+    connections: int = CONNECTIONS
+    min_split_size: int = MIN_SPLIT_SIZE
+    headers: Dict = field(default_factory=dict)
+    params: Optional[Dict] = None
+    job_class: str = 'interactive'
+    hash_algorithm: Optional[str] = integrity.HASH_ALGORITHM
+    expected_size: Optional[int] = None
+    expected_hash: Optional[str] = None
+
+def _finish(part_path: str, output_path: str, journal: Journal, options: Options, size: int,
+            hasher: Optional[integrity.OrderedHasher]) -> Dict:
+    """Verify the .part file and move it into place"""
+    digest = hasher.hexdigest() if hasher is not None else None
+    try:
+        integrity.verify(size, hasher.position if hasher is not None else size, digest,
+                         options.expected_size, options.expected_hash)
+    except integrity.IntegrityError:
+        # Don't resume from data that is known to be wrong
+        os.remove(part_path)
+        journal.remove()
+        raise
+
+    if FSYNC != 'off':
+        streamcopy.fsync_path(part_path)
+    os.replace(part_path, output_path)
+    journal.remove()
+    return {
+        'size': size,
+        'hash': digest,
+        'hash_algorithm': options.hash_algorithm if hasher is not None else None,
+        'hash_read_back': hasher.read_back if hasher is not None else 0
+    }
+
+def _transfer_whole(response: requests.Response, output_path: str, part_path: str, journal: Journal,
+                    options: Options, throttle: Optional[Callable[[int], None]]) -> Dict:
+    """Write a whole-file response in order; nothing can be resumed, but it is hashed as it is written"""
+    hash_on = bool(options.hash_algorithm) and options.hash_algorithm != 'off'
+    info = {'content_type': response.headers.get('Content-Type'),
+            'content_disposition': response.headers.get('Content-Disposition')}
+    journal.remove()
+    hasher = integrity.OrderedHasher(part_path, options.hash_algorithm, lambda p: p) if hash_on else None
+    on_write = (lambda offset, data: hasher.update(offset, data)) if hasher is not None else None
+    with open(part_path, 'wb', buffering=0) as f:
+        size = 0 if response.status_code == 416 else streamcopy.copy_to_file(
+            response, f, on_write=on_write, throttle=throttle)
+    return dict(info, resumed_bytes=0, **_finish(part_path, output_path, journal, options, size, hasher))
+
+def _transfer(url: str, output_path: str, part_path: str, journal: Journal, options: Options) -> Dict:
+    """One pass: probe, then fetch whatever the journal says is missing"""
+    throttle = bandwidth.throttle_for(url, options.job_class)
+    hash_on = bool(options.hash_algorithm) and options.hash_algorithm != 'off'
+
+    if client.is_api_url(url):
+        # One request: a Range probe or range chunks would each be an API call
+        with client.get(url, headers=options.headers, params=options.params, stream=True,
+                        timeout=(15, 120)) as response:
+            _raise_for_status(response, url)
+            return _transfer_whole(response, output_path, part_path, journal, options, throttle)
+
+    # Ask for one byte: a 206 reveals the size and Range support, a 200
+    # is simply the whole file and is streamed as-is
+    probe = client.get(url, headers=dict(options.headers, Range='bytes=0-0'), params=options.params,
+                       stream=True, timeout=(15, 120))
+    try:
+        if probe.status_code == 416 and _EMPTY_RANGE.match(probe.headers.get('Content-Range', '')):
+            # Even byte 0 is out of range: the file is empty
+            return _transfer_whole(probe, output_path, part_path, journal, options, throttle)
+        _raise_for_status(probe, url)
+        content_range = parse_content_range(probe.headers.get('Content-Range'))
+
+        if probe.status_code != 206 or content_range is None or content_range[2] is None:
+            return _transfer_whole(probe, output_path, part_path, journal, options, throttle)
+        info = {'content_type': probe.headers.get('Content-Type'),
+                'content_disposition': probe.headers.get('Content-Disposition')}
+    finally:
+        probe.close()
+
+    size = content_range[2]
+    etag, last_modified = probe.headers.get('ETag'), probe.headers.get('Last-Modified')
+
+    if os.path.exists(part_path) and journal.matches(size, etag, last_modified):
+        resumed = journal.completed()
+    else:
+        preallocate(part_path, size)
+        journal.reset(size, etag, last_modified)
+        resumed = 0
+
+    hasher = integrity.OrderedHasher(part_path, options.hash_algorithm, journal.contiguous_end) if hash_on else None
+    hash_lock = threading.Lock()
+
+    def on_write(offset: int, data: memoryview):
+        if hasher is None:
+            return
+        # Data at the cursor is hashed from memory; anything else is
+        # already on disk and picked up by whoever holds the lock next
+        if hash_lock.acquire(blocking=offset == hasher.position):
+            try:
+                hasher.update(offset, data)
+            finally:
+                hash_lock.release()
+
+    ranges = plan_ranges(missing_ranges(size, journal.done), connections=options.connections,
+                         min_split_size=options.min_split_size)
+    try:
+        if len(ranges) <= 1:
+            for first, last in ranges:
+                _fetch_range(url, part_path, first, last, options, journal, on_write, throttle)
+        else:
+            with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='range') as pool:
+                futures = [pool.submit(_fetch_range, url, part_path, first, last, options, journal, on_write, throttle)
+                           for first, last in ranges]
+                for future in futures:
+                    future.result()
+
+        if hasher is not None:
+            # Resumed ranges (or ones that finished ahead of the cursor)
+            hasher.catch_up()
+    finally:
+        journal.save()
+        if hasher is not None:
+            hasher.close()
+
+    return dict(info, resumed_bytes=resumed, **_finish(part_path, output_path, journal, options, size, hasher))
+
+def download(url: str, output_path: str, connections: int = CONNECTIONS,
+             min_split_size: int = MIN_SPLIT_SIZE, headers: Optional[Dict] = None,
+             params: Optional[Dict] = None, resolve: Optional[Callable[[], str]] = None,
+             attempts: int = 3, job_class: str = 'interactive',
+             hash_algorithm: Optional[str] = integrity.HASH_ALGORITHM,
+             expected_size: Optional[int] = None, expected_hash: Optional[str] = None) -> Dict:
+    """
+    Download a file, splitting it across connections when the host allows
+
+    Interrupted downloads leave `<output_path>.part` and its journal
+    behind; calling again with the same output_path resumes them. The
+    body is hashed while it is written and checked against the expected
+    size and hash (when given) before the file is moved into place.
+
+    Args:
+        url: File URL (usually a downloadUrl returned by the API)
+        output_path: Where to save the file
+        connections: Parallel range requests for large files
+        min_split_size: Files smaller than this use one connection
+        headers: Extra request headers
+        params: Query parameters
+        resolve: Callable returning a fresh URL when the link has expired
+        attempts: Passes to make before giving up on transient errors
+            (at least 1)
+        job_class: Bandwidth class ('interactive' or 'bulk')
+        hash_algorithm: See integrity.new_hash (None or 'off' disables)
+        expected_size: Exact size reported by the API, if any
+        expected_hash: Known hex digest, if any
+
+    Returns:
+        Dictionary with size, resumed_bytes, hash, hash_algorithm,
+        hash_read_back, content_type and content_disposition
+
+    Raises:
+        ValueError: If attempts is less than 1
+        integrity.IntegrityError: If the file doesn't match
+        requests.exceptions.RequestException: If the download still fails
+    """
+    if attempts < 1:
+        raise ValueError(f'attempts must be at least 1, got {attempts}')
+    options = Options(connections, min_split_size, headers or {}, params, job_class,
+                      hash_algorithm, expected_size, expected_hash)
+    if hash_algorithm and hash_algorithm != 'off':
+        # Fail on a bad algorithm name before anything touches the disk
+        integrity.new_hash(hash_algorithm)
+    part_path = f'{output_path}.part'
+    journal = Journal.load(f'{part_path}.json')
+
+    for attempt in range(1, attempts + 1):
+        try:
+            return _transfer(url, output_path, part_path, journal, options)
+        except LinkExpired:
+            if resolve is None or attempt == attempts:
+                raise
+            url = resolve()
+        except RangeIgnored:
+            # Whatever is in the .part file can't be trusted any more
+            if attempt == attempts:
+                raise
+            journal.size = None
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout):
+            if attempt == attempts:
+                raise
+
+class Stream:
+    """
+    A download as an iterator of byte chunks, for consumers that don't
+    want a file (uploads, transcoders, sockets)
+
+    Chunks are memoryviews of one reused buffer, valid only until the
+    next chunk is requested. If the connection drops midway, the stream
+    continues from the current position with a Range request (and a
+    fresh URL from `resolve` if the link expired), so the consumer never
+    sees a gap or a repeated byte. API endpoints are not resumed, since
+    every retry would be another API call.
+
+    Attributes:
+        size: Total size if the server announced it, else None
+        position: Bytes yielded so far
+        content_type: Content-Type of the response
+        content_disposition: Content-Disposition of the response
+
+    Args:
+        See download()
+    """
+
+    def __init__(self, url: str, headers: Optional[Dict] = None, params: Optional[Dict] = None,
+                 resolve: Optional[Callable[[], str]] = None, attempts: int = 3,
+                 job_class: str = 'interactive'):
+        if attempts < 1:
+            raise ValueError(f'attempts must be at least 1, got {attempts}')
+        self.url = url
+        self.headers = headers or {}
+        self.params = params
+        self.resolve = resolve
+        self.attempts = attempts
+        self.job_class = job_class
+
+        self.size: Optional[int] = None
+        self.position = 0
+        self.content_type: Optional[str] = None
+        self.content_disposition: Optional[str] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for attempt in range(1, self.attempts + 1):
+            try:
+                yield from self._pass()
+                return
+            except LinkExpired:
+                if self.resolve is None or attempt == self.attempts:
+                    raise
+                self.url = self.resolve()
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout):
+                if attempt == self.attempts or self.position and client.is_api_url(self.url):
+                    raise
+
+    def _pass(self) -> Iterator[memoryview]:
+        """One request, from the current position to the end"""
+        headers = dict(self.headers)
+        if self.position:
+            headers.update(Range=f'bytes={self.position}-', **_if_range(self._etag, self._last_modified))
+
+        with client.get(self.url, headers=headers, params=self.params, stream=True, timeout=(15, 120)) as response:
+            _raise_for_status(response, self.url)
+            if self.position and response.status_code != 206:
+                # Bytes already handed out can't be taken back
+                raise RangeIgnored(f'Host ignored Range at byte {self.position}')
+            if not self.position:
+                self.content_type = response.headers.get('Content-Type')
+                self.content_disposition = response.headers.get('Content-Disposition')
+                length = response.headers.get('Content-Length')
+                self.size = int(length) if length and length.isdigit() else None
+                self._etag = response.headers.get('ETag')
+                self._last_modified = response.headers.get('Last-Modified')
+
+            remaining = None if self.size is None else self.size - self.position
+            throttle = bandwidth.throttle_for(self.url, self.job_class)
+            for chunk in streamcopy.iter_body(response, remaining, throttle):
+                yield chunk
+                self.position += len(chunk)
+
+        if self.size is not None and self.position != self.size:
+            raise requests.exceptions.ChunkedEncodingError(
+                f'Body ended after {self.position} of {self.size} bytes')
+
+def sink_writer(sink) -> Callable[[memoryview], None]:
+    """
+    Get a function that writes a chunk to a sink
+
+    Args:
+        sink: A socket, a binary file-like object (anything with write()),
+            a hash object (anything with update()) or a callable
+
+    Returns:
+        Callable taking a memoryview
+    """
+    if isinstance(sink, socket.socket):
+        return sink.sendall
+    if hasattr(sink, 'write'):
+        return lambda data: streamcopy.write_all(sink, data)
+    if hasattr(sink, 'update'):
+        return sink.update
+    if callable(sink):
+        return sink
+    raise TypeError(f'Not a sink: {sink!r}')
+
+def stream_to(url: str, *sinks, headers: Optional[Dict] = None, params: Optional[Dict] = None,
+              resolve: Optional[Callable[[], str]] = None, attempts: int = 3,
+              job_class: str = 'interactive', hash_algorithm: Optional[str] = integrity.HASH_ALGORITHM,
+              expected_size: Optional[int] = None, expected_hash: Optional[str] = None) -> Dict:
+    """
+    Tee a download into any number of sinks without touching the disk
+
+    Every sink receives the same memoryview of each chunk, in order, so
+    the body is never copied; a sink that needs to keep data must copy
+    it. The body is hashed on the way through unless hashing is off.
+
+        with open('track.mp3', 'wb') as f, socket.create_connection(addr) as sock:
+            stream_to(url, f, sock, upload.write)
+
+    Args:
+        url: File URL
+        *sinks: Sockets, file-like objects, hash objects or callables
+            (see sink_writer)
+        Others: See download()
+
+    Returns:
+        Dictionary with size, hash, hash_algorithm, content_type and
+        content_disposition
+
+    Raises:
+        integrity.IntegrityError: If the body doesn't match (after every
+            sink has already received it)
+        requests.exceptions.RequestException: If the download fails
+    """
+    writers = [sink_writer(sink) for sink in sinks]
+    hasher = None
+    if hash_algorithm and hash_algorithm != 'off':
+        hasher = integrity.new_hash(hash_algorithm)
+        writers.append(hasher.update)
+
+    stream = Stream(url, headers, params, resolve, attempts, job_class)
+    for chunk in stream:
+        for write in writers:
+            write(chunk)
+
+    digest = hasher.hexdigest() if hasher is not None else None
+    integrity.verify(stream.position, stream.position, digest, expected_size, expected_hash)
+    return {
+        'size': stream.position,
+        'hash': digest,
+        'hash_algorithm': hash_algorithm if hasher is not None else None,
+        'content_type': stream.content_type,
+        'content_disposition': stream.content_disposition
+    }
@@ -5,7 +5,9 @@ This file demonstrates how to use the Facebook download endpoints
 to download videos with multiple quality options.
 """
 
-import requests
+import client
+import concurrency
+import formats
 from typing import List, Dict, Optional
 
 # API Configuration
@@ -32,10 +34,7 @@ def download_facebook_video(url: str) -> List[Dict]:
     
     params = {'url': url}
     
-    response = requests.get(f'{BASE_URL}/facebook/download', params=params, headers=headers)
-    response.raise_for_status()
-    
-    data = response.json()
+    data = client.get_json(f'{BASE_URL}/facebook/download', params=params, headers=headers)
     
     if data['success']:
         videos = data['videos']
@@ -68,10 +67,7 @@ def download_facebook_video_hd(url: str) -> Dict:
     
     params = {'url': url}
     
-    response = requests.get(f'{BASE_URL}/facebook/download-hd', params=params, headers=headers)
-    response.raise_for_status()
-    
-    data = response.json()
+    data = client.get_json(f'{BASE_URL}/facebook/download-hd', params=params, headers=headers)
     
     if data['success']:
         video = data['video']
@@ -109,10 +105,7 @@ def download_multiple_videos(urls: List[str]) -> List[Dict]:
     for url in urls:
         try:
             params = {'url': url}
-            response = requests.get(f'{BASE_URL}/facebook/download-hd', params=params, headers=headers)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = client.get_json(f'{BASE_URL}/facebook/download-hd', params=params, headers=headers)
             
             results.append({
                 'url': url,
@@ -135,13 +128,35 @@ def download_multiple_videos(urls: List[str]) -> List[Dict]:
     
     return results
 
+def pick_quality(videos: List[Dict], preferred_resolution: str) -> Dict:
+    """
+    Pick the entry of a `videos` list closest to a preferred resolution
+    
+    Args:
+        videos: The `videos` list from /facebook/download
+        preferred_resolution: A height such as "720p" picks the best
+            quality not above it (else the smallest there is); anything
+            else ("HD", "1280x720") picks the first entry whose label
+            contains it, else the first entry
+    
+    Returns:
+        One entry of videos
+    """
+    try:
+        return formats.select(videos, f'best <={preferred_resolution}') or formats.select(videos, 'worst')
+    except ValueError:
+        return next(
+            (v for v in videos if preferred_resolution.lower() in v['resolution'].lower()),
+            videos[0]
+        )
+
 def download_specific_quality(url: str, preferred_resolution: str) -> Dict:
     """
     Get specific quality from Facebook video
     
     Args:
         url: Facebook video URL
-        preferred_resolution: Preferred resolution (e.g., "720p", "1080p")
+        preferred_resolution: Preferred resolution (see pick_quality)
     
     Returns:
         Video information for preferred quality
@@ -151,19 +166,12 @@ def download_specific_quality(url: str, preferred_resolution: str) -> Dict:
     
     params = {'url': url}
     
-    response = requests.get(f'{BASE_URL}/facebook/download', params=params, headers=headers)
-    response.raise_for_status()
-    
-    data = response.json()
+    data = client.get_json(f'{BASE_URL}/facebook/download', params=params, headers=headers)
     
     if data['success']:
         videos = data['videos']
         
-        # Find preferred quality
-        video = next(
-            (v for v in videos if preferred_resolution.lower() in v['resolution'].lower()),
-            videos[0]
-        )
+        video = pick_quality(videos, preferred_resolution)
         
         print('✅ Download URL Ready!\n')
         print(f"Resolution: {video['resolution']}")
@@ -189,10 +197,7 @@ def get_video_info(url: str) -> Dict:
     
     params = {'url': url}
     
-    response = requests.get(f'{BASE_URL}/facebook/download', params=params, headers=headers)
-    response.raise_for_status()
-    
-    data = response.json()
+    data = client.get_json(f'{BASE_URL}/facebook/download', params=params, headers=headers)
     
     if data['success']:
         videos = data['videos']
@@ -206,11 +211,7 @@ def get_video_info(url: str) -> Dict:
             print(f"   Needs Rendering: {'Yes' if video['shouldRender'] else 'No'}")
         
         # Find best quality
-        best_quality = (
-            next((v for v in videos if '1080p' in v['resolution']), None) or
-            next((v for v in videos if '720p' in v['resolution']), None) or
-            videos[0]
-        )
+        best_quality = formats.select(videos, 'best')
         
         print(f"\n🏆 Best Quality: {best_quality['resolution']}")
         
@@ -237,10 +238,7 @@ def compare_qualities(url: str) -> List[Dict]:
     
     params = {'url': url}
     
-    response = requests.get(f'{BASE_URL}/facebook/download', params=params, headers=headers)
-    response.raise_for_status()
-    
-    data = response.json()
+    data = client.get_json(f'{BASE_URL}/facebook/download', params=params, headers=headers)
     
     if data['success']:
         videos = data['videos']
@@ -279,27 +277,24 @@ def download_best_from_multiple_sources(urls: List[str]) -> List[Dict]:
     """
     print('\n=== Downloading Best Quality from Multiple Sources ===\n')
     
-    best_videos = []
-    
-    for i, url in enumerate(urls, 1):
-        print(f'Processing {i}/{len(urls)}...')
-        
+    def process(url: str) -> Dict:
         try:
             video = download_facebook_video_hd(url)
-            best_videos.append({
+            return {
                 'url': url,
                 'video': video,
                 'success': True
-            })
+            }
         except Exception as e:
             print(f'❌ Error: {str(e)}')
-            best_videos.append({
+            return {
                 'url': url,
                 'error': str(e),
                 'success': False
-            })
-        
-        print()
+            }
+    
+    # Runs in parallel; the adaptive limiter decides how many at once
+    best_videos = concurrency.map_concurrent(process, urls)
     
     successful = len([v for v in best_videos if v['success']])
     print(f'✅ Successfully downloaded {successful}/{len(urls)} videos')
@@ -322,23 +317,12 @@ def filter_by_resolution(url: str, min_resolution: str = '720p') -> List[Dict]:
     
     params = {'url': url}
     
-    response = requests.get(f'{BASE_URL}/facebook/download', params=params, headers=headers)
-    response.raise_for_status()
-    
-    data = response.json()
+    data = client.get_json(f'{BASE_URL}/facebook/download', params=params, headers=headers)
     
     if data['success']:
         videos = data['videos']
         
-        # Simple resolution filtering
-        resolution_order = {'1080p': 3, '720p': 2, '480p': 1, '360p': 0}
-        min_value = resolution_order.get(min_resolution, 1)
-        
-        filtered = [
-            v for v in videos
-            if any(res in v['resolution'] for res in resolution_order.keys()
-                   if resolution_order[res] >= min_value)
-        ]
+        filtered = formats.rank(videos, f'best >={min_resolution}')
         
         print(f'Found {len(filtered)} qualities >= {min_resolution}:\n')
         for video in filtered:
@@ -348,6 +332,31 @@ def filter_by_resolution(url: str, min_resolution: str = '720p') -> List[Dict]:
     
     return []
 
+def analyze_video(url: str) -> Dict:
+    """
+    Get info, quality comparison and HD-filtered list at the same time
+    
+    The three lookups run concurrently; since they all hit
+    /facebook/download with the same URL, the client coalesces them
+    into a single API call.
+    
+    Args:
+        url: Facebook video URL
+    
+    Returns:
+        Dictionary with info, comparison and filtered qualities
+    """
+    info, comparison, filtered = concurrency.map_concurrent(
+        lambda fn: fn(url),
+        [get_video_info, compare_qualities, filter_by_resolution]
+    )
+    
+    return {
+        'info': info,
+        'comparison': comparison,
+        'filtered': filtered
+    }
+
 # ===================
 # EXAMPLES
 # ===================
@@ -384,6 +393,9 @@ def main():
         # Example 8: Filter by resolution
         filter_by_resolution(test_url, '720p')
         
+        # Example 9: Several lookups of the same video, one API call
+        analyze_video(test_url)
+        
     except Exception as e:
         print(f'Error: {str(e)}')
         exit(1)
@@ -0,0 +1,301 @@
+"""
+Cognima API - Federated Track Search (Python)
+
+Searches Spotify, SoundCloud and YouTube for one query at the same
+time, so a search takes as long as the slowest provider instead of the
+sum of all three. Results are merged as each provider answers: the same
+song found on several providers becomes one Track, matched by
+normalized title, artist and duration ("Queen - Bohemian Rhapsody
+(Official Video)" on YouTube is Spotify's "Bohemian Rhapsody" by
+Queen). Tracks are ranked by a scorer, score() unless another one is
+passed.
+
+    for partial in federated.iter_search('bohemian rhapsody'):
+        show(partial.results)        # refine the list as providers answer
+
+    tracks = federated.search('bohemian rhapsody', deadline=3.0)
+
+A provider that hasn't answered by the deadline is left out; the
+results of the others are returned.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import client
+import concurrency
+import soundcloud
+import spotify
+import youtube
+
+# Seconds a whole federated search may take
+DEADLINE = 8.0
+
+# Largest duration difference (seconds) between two copies of a song
+DURATION_TOLERANCE = 5.0
+
+# Weights of the default scorer
+MATCH_WEIGHT = 2.0    # share of the query's words in artist and title
+SOURCE_WEIGHT = 1.0   # per provider that found the track
+RANK_WEIGHT = 1.0     # times 1 / (1 + best position in a provider's list)
+
+# Bracketed or trailing title parts that don't name the song
+_NOISE = re.compile(
+    r'[(\[][^)\]]*\b(?:official|video|audio|lyrics?|letra|clipe|visuali[sz]er|hd|4k|remaster\w*|feat|ft|prod)\b[^)\]]*[)\]]'
+    r'|\s(?:feat|ft|featuring|prod)\.?\s.*$'
+    r'|\s-\s[^-]*\b(?:remaster\w*|version|mix|edit|live)\b.*$'
+    r'|\.(?:mp3|m4a|wav|flac|ogg)$',
+    re.IGNORECASE
+)
+_CHANNEL_NOISE = re.compile(r'\s*-\s*topic$|vevo$|\s+official$', re.IGNORECASE)
+_ARTIST_SEPARATORS = re.compile(r',|&|\bfeat\.?|\bft\.?|\bx\b|\be\b|\band\b', re.IGNORECASE)
+_TITLE_SEPARATOR = re.compile(r'\s[-–—]\s')
+_ISO_DURATION = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?$')
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[^\w]+', ' ', text).split())
+
+def _artist_names(artist: Optional[str]) -> frozenset:
+    if not artist:
+        return frozenset()
+    artist = _CHANNEL_NOISE.sub('', artist)
+    return frozenset(filter(None, (normalize(name) for name in _ARTIST_SEPARATORS.split(artist))))
+
+def _same_artist(names: frozenset, others: frozenset) -> bool:
+    """Some name on one side is spelled out in a name on the other ("Mock" in "Mock Artist")"""
+    return any(set(a.split()) <= set(b.split()) or set(b.split()) <= set(a.split()) for a in names for b in others)
+
+def _seconds(value) -> Optional[float]:
+    """Durations as seconds, "PT3M25S" or "3:25" (None if unknown)"""
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    if not isinstance(value, str):
+        return None
+    iso = _ISO_DURATION.match(value)
+    if iso:
+        hours, minutes, seconds = (int(part or 0) for part in iso.groups())
+        return float(hours * 3600 + minutes * 60 + seconds) or None
+    if re.fullmatch(r'\d+(?::\d{1,2})+', value):
+        total = 0
+        for part in value.split(':'):
+            total = total * 60 + int(part)
+        return float(total) or None
+    return None
+
+@dataclass
+class Track:
+    """
+    One song, merged across the providers that found it
+
+    Attributes:
+        title: Title as the first provider spelled it
+        artist: Artist name(s), if any provider reported them
+        duration: Seconds, if any provider reported it
+        url: Link on the first provider that found it
+        sources: Provider name -> that provider's raw result
+        positions: Provider name -> position in its result list (0 = first)
+        score: Value from the scorer (higher ranks first)
+    """
+    title: str
+    artist: Optional[str]
+    duration: Optional[float]
+    url: str
+    sources: Dict[str, Dict] = field(default_factory=dict)
+    positions: Dict[str, int] = field(default_factory=dict)
+    score: float = 0.0
+
+    @property
+    def title_key(self) -> str:
+        return normalize(_NOISE.sub('', self.title))
+
+    @property
+    def artist_names(self) -> frozenset:
+        return _artist_names(self.artist)
+
+    def matches(self, other: 'Track') -> bool:
+        """Same title; same artist and duration unless one side doesn't know"""
+        if self.title_key != other.title_key:
+            return False
+        if self.artist_names and other.artist_names and not _same_artist(self.artist_names, other.artist_names):
+            return False
+        if self.duration is not None and other.duration is not None:
+            return abs(self.duration - other.duration) <= DURATION_TOLERANCE
+        return True
+
+    def merge(self, other: 'Track'):
+        """
+        Add another copy of this song; when one provider lists it twice,
+        its better-ranked result is the one kept in sources
+        """
+        for provider, result in other.sources.items():
+            position = other.positions.get(provider)
+            current = self.positions.get(provider)
+            if provider not in self.sources or (position is not None and (current is None or position < current)):
+                self.sources[provider] = result
+            if position is not None:
+                self.positions[provider] = position if current is None else min(position, current)
+        self.artist = self.artist or other.artist
+        self.duration = self.duration or other.duration
+
+def _split_artist(title: str, artist: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Uploads are usually titled "Artist - Song"; the uploader may be anyone"""
+    parts = _TITLE_SEPARATOR.split(title, 1)
+    if len(parts) == 2:
+        artist, title = (part.strip() for part in parts)
+    return title, artist
+
+# ===================
+# PROVIDERS
+# ===================
+
+def _spotify(query: str, limit: int) -> List[Track]:
+    response = client.get(f'{spotify.BASE_URL}/spotify/search', params={'q': query, 'limit': limit})
+    response.raise_for_status()
+    data = response.json()
+    if not data.get('success'):
+        return []
+    return [Track(title=r['name'], artist=r.get('artists'), duration=_seconds(r.get('duration')), url=r['link'],
+                  sources={'spotify': r}) for r in data['results'][:limit]]
+
+def _soundcloud(query: str, limit: int) -> List[Track]:
+    response = client.get(f'{soundcloud.BASE_URL}/soundcloud/search', params={'q': query, 'limit': limit},
+                          headers=soundcloud.headers)
+    response.raise_for_status()
+    tracks = []
+    for r in response.json()['results'][:limit]:
+        # `artist` is a numeric user ID; names only appear in titles
+        title, artist = _split_artist(r['title'], None)
+        tracks.append(Track(title=title, artist=artist, duration=_seconds(r.get('duration')),
+                            url=r['permalink_url'], sources={'soundcloud': r}))
+    return tracks
+
+def _youtube(query: str, limit: int) -> List[Track]:
+    response = client.post(f'{youtube.BASE_URL}/youtube/search', json={'query': query},
+                           headers={'X-API-Key': youtube.API_KEY})
+    response.raise_for_status()
+    tracks = []
+    for r in response.json()['data']['results'][:limit]:
+        title, artist = _split_artist(r['title'], (r.get('channel') or {}).get('name'))
+        tracks.append(Track(title=title, artist=artist, duration=_seconds(r.get('duration')), url=r['url'],
+                            sources={'youtube': r}))
+    return tracks
+
+# Provider name -> search(query, limit) returning Tracks, best first
+PROVIDERS: Dict[str, Callable[[str, int], List[Track]]] = {
+    'spotify': _spotify,
+    'soundcloud': _soundcloud,
+    'youtube': _youtube,
+}
+
+# ===================
+# RANKING
+# ===================
+
+def score(track: Track, query: str) -> float:
+    """
+    Default scorer: query match, then agreement between providers, then
+    each provider's own ranking (see the *_WEIGHT constants)
+
+    Args:
+        track: Merged track
+        query: The search query
+
+    Returns:
+        Score (higher is better)
+    """
+    words = set(normalize(query).split())
+    found = set(normalize(f'{track.artist or ""} {track.title}').split())
+    match = len(words & found) / len(words) if words else 0.0
+    best_position = min(track.positions.values(), default=0)
+    return MATCH_WEIGHT * match + SOURCE_WEIGHT * len(track.sources) + RANK_WEIGHT / (1 + best_position)
+
+def rank(tracks: List[Track], query: str, scorer: Callable[[Track, str], float] = score) -> List[Track]:
+    """Score tracks and sort them best first"""
+    for track in tracks:
+        track.score = scorer(track, query)
+    return sorted(tracks, key=lambda track: track.score, reverse=True)
+
+class Partial(NamedTuple):
+    """
+    State of a federated search after one provider answered
+
+    Attributes:
+        provider: Provider that just answered (or failed, or timed out)
+        error: Its exception, if it failed or missed the deadline
+        results: Every track so far, merged and ranked
+        pending: Providers still running
+    """
+    provider: str
+    error: Optional[BaseException]
+    results: List[Track]
+    pending: Tuple[str, ...]
+
+def iter_search(query: str, limit: int = 10, deadline: float = DEADLINE,
+                providers: Optional[Dict[str, Callable[[str, int], List[Track]]]] = None,
+                scorer: Callable[[Track, str], float] = score) -> Iterator[Partial]:
+    """
+    Search every provider at once, yielding the merged ranking as each
+    one answers
+
+    Args:
+        query: Track name or artist
+        limit: Results asked from each provider
+        deadline: Seconds for the whole search; providers still running
+            then are yielded with a TimeoutError
+        providers: Provider name -> search function (default PROVIDERS)
+        scorer: Called with (track, query); higher ranks first
+
+    Yields:
+        Partial per provider, in the order they finish
+    """
+    providers = providers or PROVIDERS
+    names = list(providers)
+    pending = set(names)
+    merged: List[Track] = []
+
+    def run(name: str) -> List[Track]:
+        tracks = providers[name](query, limit)
+        for position, track in enumerate(tracks):
+            track.positions[name] = position
+        return tracks
+
+    for outcome in concurrency.fan_out(run, names, ordered=False, max_workers=len(names), timeout=deadline):
+        pending.discard(outcome.item)
+        for track in outcome.value or []:
+            same = next((existing for existing in merged if existing.matches(track)), None)
+            if same is None:
+                merged.append(track)
+            else:
+                same.merge(track)
+        yield Partial(outcome.item, outcome.error, rank(merged, query, scorer), tuple(sorted(pending)))
+
+def search(query: str, limit: int = 10, deadline: float = DEADLINE,
+           providers: Optional[Dict[str, Callable[[str, int], List[Track]]]] = None,
+           scorer: Callable[[Track, str], float] = score) -> List[Track]:
+    """
+    Search every provider at once and return the merged ranking
+
+    Args:
+        See iter_search
+
+    Returns:
+        Tracks from every provider that answered by the deadline, best first
+    """
+    results: List[Track] = []
+    for partial in iter_search(query, limit, deadline, providers, scorer):
+        if partial.error is not None:
+            print(f'⚠️ {partial.provider} left out: {partial.error}')
+        results = partial.results
+    return results
+
+if __name__ == '__main__':
+    for partial in iter_search('Bohemian Rhapsody Queen', limit=5):
+        status = 'failed' if partial.error else 'answered'
+        print(f'\n=== {partial.provider} {status}; waiting for: {", ".join(partial.pending) or "nobody"} ===')
+        for i, track in enumerate(partial.results[:5], 1):
+            print(f'{i}. {track.title} - {track.artist or "?"} [{", ".join(track.sources)}] score {track.score:.2f}')
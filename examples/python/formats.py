@@ -0,0 +1,305 @@
+"""
+Cognima API - Format Selection (Python)
+
+One engine for picking a format from any of the API's format lists:
+/alldl media items, /facebook/download videos and the /{vimeo,
+dailymotion,twitch,streamable,bandcamp}/formats lists. Each entry is
+reduced to the same facts (height, fps, codec, audio bitrate and sample
+rate, container, file size) whichever fields the endpoint uses, then
+filtered by constraints and ranked.
+
+Constraints are written as a short spec:
+
+    select(media, 'best <=720p h264 under 200MB')
+    select(formats, 'smallest >=480p mp4')
+    select(media, 'best audio >=128kbps m4a')
+
+Words: best / smallest / worst; video / audio / image; <=720p, >=480p,
+720p (exactly) or 1080p60 (height and frame rate); <=30fps, >=60fps;
+codecs (h264, h265, vp9, av1, aac); containers (mp4, webm, mkv, m4a,
+ogg); mp3, opus and flac match either the codec or the container; under
+200MB or <=200MB (K/M/G); >=128kbps, <=320kbps. `<`, `>`, `under` and
+`over` are strict, `<=` and `>=` (or `≤` and `≥`) are not.
+
+`best` prefers the entry the API marks isBest among those that meet
+every constraint. `smallest` is the bandwidth saver: the smallest file
+that meets every constraint, rather than the best one. Entries that
+don't report a codec are rejected by codec constraints; entries that
+don't report a size are not rejected by size limits.
+"""
+
+import functools
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+CODECS = {
+    'h264': ('h264', 'avc'), 'h265': ('h265', 'hevc', 'hev1', 'hvc1'), 'vp9': ('vp9', 'vp09'),
+    'av1': ('av1', 'av01'), 'aac': ('aac', 'mp4a'), 'opus': ('opus',), 'mp3': ('mp3',),
+    'vorbis': ('vorbis',), 'flac': ('flac',)
+}
+CONTAINERS = ('mp4', 'webm', 'mkv', 'mov', 'm4a', 'mp3', 'ogg', 'opus', 'flac', 'wav', 'jpg', 'png', 'webp')
+MEDIA_TYPES = ('video', 'audio', 'image')
+
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+_DIMENSIONS = re.compile(r'(\d{2,5})\s*x\s*(\d{2,5})')
+_HEIGHT = re.compile(r'(?<!\d)(\d{3,4})p(\d{2,3})?', re.IGNORECASE)
+_BITRATE = re.compile(r'(?<!\d)(\d{2,4})\s*k', re.IGNORECASE)
+
+_TERM = re.compile(
+    r'(?P<op><=|>=|≤|≥|<|>|under\s+|over\s+)?\s*(?P<value>\d+(?:\.\d+)?)\s*'
+    r'(?P<unit>p(?P<fps>\d{2,3})?|fps|kbps|[kmg]i?b|b)\b',
+    re.IGNORECASE
+)
+
+@dataclass(frozen=True)
+class Constraints:
+    """
+    What a format must satisfy and how to rank the ones that do
+
+    Attributes:
+        prefer: 'best' (highest quality), 'smallest' (smallest file)
+            or 'worst' (lowest quality)
+        media_type: 'video', 'audio' or 'image' (None = any)
+        min_height / max_height: Video height bounds in pixels
+        min_fps / max_fps: Frame rate bounds
+        min_abr / max_abr: Audio bitrate bounds in kbps
+        max_filesize: Largest acceptable size in bytes
+        codecs: Acceptable codec names (see CODECS; empty = any)
+        containers: Acceptable extensions (empty = any)
+        codecs_or_containers: Names that may match either the audio
+            codec or the extension, such as mp3 (empty = any)
+        strict: Names of the bounds above that exclude their value
+            (e.g. 'max_height' for <720p)
+    """
+    prefer: str = 'best'
+    media_type: Optional[str] = None
+    min_height: Optional[int] = None
+    max_height: Optional[int] = None
+    min_fps: Optional[float] = None
+    max_fps: Optional[float] = None
+    min_abr: Optional[float] = None
+    max_abr: Optional[float] = None
+    max_filesize: Optional[int] = None
+    codecs: FrozenSet[str] = field(default_factory=frozenset)
+    containers: FrozenSet[str] = field(default_factory=frozenset)
+    codecs_or_containers: FrozenSet[str] = field(default_factory=frozenset)
+    strict: FrozenSet[str] = field(default_factory=frozenset)
+
+@dataclass
+class Format:
+    """A format entry reduced to comparable facts (None = not reported)"""
+    raw: Dict
+    media_type: Optional[str]
+    height: Optional[int]
+    fps: Optional[float]
+    vcodec: Optional[str]
+    acodec: Optional[str]
+    abr: Optional[float]
+    asr: Optional[int]
+    container: Optional[str]
+    filesize: Optional[int]
+
+def _codec(value: Optional[str]) -> Optional[str]:
+    """Map codec strings such as 'avc1.64001F' to a CODECS name"""
+    if not value or value == 'none':
+        return None
+    value = value.lower()
+    return next((name for name, prefixes in CODECS.items() if value.startswith(prefixes)), value)
+
+def _number(value) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and value > 0 else None
+
+def describe(entry: Dict) -> Format:
+    """
+    Extract the comparable facts from one format entry
+
+    Understands the field names of every format list the API returns;
+    resolution is read from width/height, "1920x1080", "720p (HD)" or a
+    formatId such as "720p60" or "1080".
+
+    Args:
+        entry: One item of a format or media list
+
+    Returns:
+        Format
+    """
+    height = entry.get('height') if isinstance(entry.get('height'), int) else None
+    fps = _number(entry.get('fps'))
+    abr = _number(entry.get('abr'))
+    format_id = str(entry.get('formatId') or '')
+
+    for text in (entry.get('resolution'), entry.get('quality'), format_id):
+        if height is not None:
+            break
+        if not isinstance(text, str):
+            continue
+        dimensions = _DIMENSIONS.search(text)
+        named = _HEIGHT.search(text)
+        if dimensions:
+            height = int(dimensions.group(2))
+        elif named:
+            height = int(named.group(1))
+            fps = fps or _number(int(named.group(2) or 0))
+    if height is None and format_id.isdigit() and 144 <= int(format_id) <= 4320:
+        # Dailymotion names formats by height
+        height = int(format_id)
+
+    if abr is None and height is None:
+        for text in (entry.get('quality'), format_id):
+            match = _BITRATE.search(text or '') or re.search(r'-(\d{2,3})$', text or '')
+            if match:
+                abr = float(match.group(1))
+                break
+
+    media_type = entry.get('type')
+    if media_type is None and height is None and abr is not None:
+        media_type = 'audio'
+
+    filesize = entry.get('filesize') or entry.get('filesize_approx')
+    container = entry.get('ext') or entry.get('format')
+    return Format(
+        raw=entry,
+        media_type=media_type,
+        height=height,
+        fps=fps,
+        vcodec=_codec(entry.get('vcodec')),
+        acodec=_codec(entry.get('acodec')),
+        abr=abr,
+        asr=entry.get('asr') if isinstance(entry.get('asr'), int) else None,
+        container=container.lower() if isinstance(container, str) else None,
+        filesize=filesize if isinstance(filesize, int) and filesize > 0 else None
+    )
+
+@functools.lru_cache(maxsize=256)
+def parse(spec: str) -> Constraints:
+    """
+    Turn a spec such as "best <=720p h264 under 200MB" into Constraints
+
+    Args:
+        spec: Words and terms from the module docstring, in any order
+
+    Returns:
+        Constraints
+
+    Raises:
+        ValueError: For words it doesn't understand
+    """
+    values = {'codecs': set(), 'containers': set(), 'codecs_or_containers': set(), 'strict': set()}
+    rest = _TERM.sub(lambda match: _apply_term(match, values) or ' ', spec.replace('≤', '<=').replace('≥', '>='))
+
+    for word in rest.lower().split():
+        if word in ('best', 'smallest', 'worst'):
+            values['prefer'] = word
+        elif word in MEDIA_TYPES:
+            values['media_type'] = word
+        elif word in CODECS and word in CONTAINERS:
+            values['codecs_or_containers'].add(word)
+        elif word in CODECS:
+            values['codecs'].add(word)
+        elif word in CONTAINERS:
+            values['containers'].add(word)
+        else:
+            raise ValueError(f'Unknown format spec word: {word!r} in {spec!r}')
+
+    for name in ('codecs', 'containers', 'codecs_or_containers', 'strict'):
+        values[name] = frozenset(values[name])
+    return Constraints(**values)
+
+def _apply_term(match: 're.Match', values: Dict):
+    op = (match.group('op') or '').strip().lower()
+    value = float(match.group('value'))
+    unit = match.group('unit').lower()
+    strict = op in ('<', '>', 'under', 'over')
+
+    if unit[0] == 'p' or unit in ('fps', 'kbps'):
+        bounds = [('height', int(value))] if unit[0] == 'p' else [({'fps': 'fps', 'kbps': 'abr'}[unit], value)]
+        if match.group('fps'):
+            # 1080p60: height and frame rate under the same operator
+            bounds.append(('fps', float(match.group('fps'))))
+        for name, number in bounds:
+            if op in ('<=', '<', 'under'):
+                names = [f'max_{name}']
+            elif op in ('>=', '>', 'over'):
+                names = [f'min_{name}']
+            else:
+                names = [f'min_{name}', f'max_{name}']
+            for bound in names:
+                values[bound] = number
+                if strict:
+                    values['strict'].add(bound)
+    else:
+        if op not in ('<=', '<', 'under'):
+            raise ValueError(f'File sizes can only be upper bounds: {match.group(0)!r}')
+        values['max_filesize'] = int(value * _SIZE_UNITS[unit[0].upper() if unit != 'b' else ''])
+        if strict:
+            values['strict'].add('max_filesize')
+
+def _accepts(fmt: Format, c: Constraints) -> bool:
+    if c.media_type and fmt.media_type and fmt.media_type != c.media_type:
+        return False
+    if c.media_type == 'audio' and fmt.media_type is None and fmt.height is not None:
+        return False
+    checks = (('height', fmt.height, c.min_height, c.max_height), ('fps', fmt.fps, c.min_fps, c.max_fps),
+              ('abr', fmt.abr, c.min_abr, c.max_abr))
+    for name, value, low, high in checks:
+        if (low is not None or high is not None) and value is None:
+            return False
+        if low is not None and (value < low or value == low and f'min_{name}' in c.strict):
+            return False
+        if high is not None and (value > high or value == high and f'max_{name}' in c.strict):
+            return False
+    if c.max_filesize is not None and fmt.filesize is not None:
+        if fmt.filesize > c.max_filesize or fmt.filesize == c.max_filesize and 'max_filesize' in c.strict:
+            return False
+    if c.codecs and not {fmt.vcodec, fmt.acodec} & c.codecs:
+        return False
+    if c.containers and fmt.container not in c.containers:
+        return False
+    if c.codecs_or_containers and not {fmt.acodec, fmt.container} & c.codecs_or_containers:
+        return False
+    return True
+
+def _quality(fmt: Format) -> Tuple:
+    """Higher is better"""
+    return (fmt.height or 0, fmt.fps or 0, fmt.abr or 0, fmt.asr or 0)
+
+def rank(formats: Iterable[Dict], spec='best') -> List[Dict]:
+    """
+    Filter and order a format list by a spec
+
+    Args:
+        formats: Entries of any format or media list
+        spec: Spec string (see parse) or Constraints
+
+    Returns:
+        Entries that satisfy the constraints, preferred first
+    """
+    constraints = parse(spec) if isinstance(spec, str) else spec
+    candidates = [fmt for fmt in map(describe, formats) if _accepts(fmt, constraints)]
+
+    # Unknown sizes sort after known ones when size matters
+    size = lambda fmt: fmt.filesize if fmt.filesize is not None else float('inf')
+    if constraints.prefer == 'smallest':
+        candidates.sort(key=lambda fmt: (size(fmt), tuple(-x for x in _quality(fmt))))
+    elif constraints.prefer == 'worst':
+        candidates.sort(key=lambda fmt: (_quality(fmt), size(fmt)))
+    else:
+        # The API's own pick first, then by quality; equal quality: the smaller file
+        candidates.sort(key=lambda fmt: (not fmt.raw.get('isBest'), tuple(-x for x in _quality(fmt)), size(fmt)))
+    return [fmt.raw for fmt in candidates]
+
+def select(formats: Iterable[Dict], spec='best') -> Optional[Dict]:
+    """
+    Pick one entry from a format list
+
+    Args:
+        formats: Entries of any format or media list
+        spec: Spec string (see parse) or Constraints
+
+    Returns:
+        The preferred entry, or None if nothing satisfies the spec
+    """
+    ranked = rank(formats, spec)
+    return ranked[0] if ranked else None
@@ -1,6 +1,6 @@
 import os
 import requests
-import time
+import client
 from typing import List, Dict, Optional
 
 API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -12,7 +12,7 @@ def get_service_info() -> Dict:
     print('=== Free Fire Likes - Service Info ===\n')
     
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/freefire/info',
             headers={'X-API-Key': API_KEY}
         )
@@ -47,7 +47,7 @@ def send_likes(player_id: str) -> Dict:
     print(f'\n=== Sending Likes to Player {player_id} ===\n')
     
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/freefire/sendlikes',
             params={'playerId': player_id},
             headers={'X-API-Key': API_KEY}
@@ -128,9 +128,6 @@ def send_likes_to_multiple_players(player_ids: List[str]) -> Dict[str, List[str]
                 results['not_counted'].append(player_id)
             else:
                 results['failed'].append(player_id)
-            
-            # Wait 2 seconds between requests to avoid rate limiting
-            time.sleep(2)
         except Exception:
             results['failed'].append(player_id)
     
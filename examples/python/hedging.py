@@ -0,0 +1,202 @@
+"""
+Cognima API - Hedged Requests (Python)
+
+For idempotent metadata endpoints (info/formats), if a call hasn't
+answered by a chosen percentile of that endpoint's recent latency, a
+duplicate is sent and the first acceptable answer (below 500, not 429)
+wins. requests can't abort a call in progress, so the loser is not
+cancelled: it runs to completion on its thread and its response is
+closed then. A budget caps hedges to a fraction of traffic so hedging
+can never multiply load on a struggling API.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+# Idempotent lookups that may be hedged (path prefixes under /api/v1)
+HEDGE_ENDPOINTS = (
+    '/vimeo/info', '/vimeo/formats',
+    '/dailymotion/info', '/dailymotion/formats',
+    '/twitch/info', '/twitch/formats',
+    '/streamable/info', '/streamable/formats',
+    '/bandcamp/info', '/bandcamp/formats',
+    '/likee/info', '/reddit/info',
+    '/twitter/info', '/gdrive/info', '/mediafire/info',
+    '/apps/details',
+)
+
+class LatencyTracker:
+    """
+    Rolling window of latencies for one endpoint
+
+    Args:
+        window: Number of recent samples kept
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float, min_samples: int = 20) -> Optional[float]:
+        """
+        Get a latency percentile
+
+        Args:
+            p: Percentile between 0 and 100
+            min_samples: Return None until this many samples exist
+
+        Returns:
+            Latency in seconds, or None if there isn't enough data
+        """
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+class Hedger:
+    """
+    Sends a backup request when the first one is slow
+
+    Args:
+        percentile: Hedge after this percentile of recent latency
+        budget_ratio: Most hedges per request sent (0.05 = +5% load)
+        min_delay: Never hedge sooner than this many seconds
+        max_workers: Threads used to run attempts
+    """
+
+    def __init__(self, percentile: float = 95.0, budget_ratio: float = 0.05,
+                 min_delay: float = 0.05, max_workers: int = 32):
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_delay = min_delay
+
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._tokens = 1.0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+        self.stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0}
+
+    def applies_to(self, url: str) -> bool:
+        """Check whether a URL is on the hedging allow-list"""
+        path = urlsplit(url).path
+        if path.startswith('/api/v1'):
+            path = path[len('/api/v1'):]
+        return path.startswith(HEDGE_ENDPOINTS)
+
+    def call(self, url: str, send: Callable[[], requests.Response],
+             permit: Optional[Callable[[], bool]] = None) -> requests.Response:
+        """
+        Send a request, hedging it if it runs past the latency percentile
+
+        Args:
+            url: Absolute API URL (picks the latency tracker)
+            send: Callable that performs one attempt
+            permit: Extra check before hedging (e.g. a quota token)
+
+        Returns:
+            The first acceptable response, else the first response
+        """
+        tracker = self._tracker(url)
+        with self._lock:
+            self.stats['requests'] += 1
+            self._tokens = min(10.0, self._tokens + self.budget_ratio)
+
+        delay = tracker.percentile(self.percentile)
+        primary = _Attempt(self._pool, send, tracker)
+
+        if delay is None:
+            return primary.future.result()
+
+        # The hedge delay counts from when the call starts, not from
+        # when it was queued behind other calls on the pool
+        primary.started.wait()
+        elapsed = time.monotonic() - primary.start
+        done, _ = wait([primary.future], timeout=max(0.0, max(self.min_delay, delay) - elapsed))
+        if done or not self._take_token() or (permit is not None and not permit()):
+            return primary.future.result()
+
+        backup = _Attempt(self._pool, send, tracker)
+        with self._lock:
+            self.stats['hedged'] += 1
+
+        pending = {primary.future, backup.future}
+        fallback = None
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+
+                response = future.result()
+                if not _acceptable(response):
+                    # Returned only if the other attempt does no better
+                    if fallback is None:
+                        fallback = response
+                    else:
+                        response.close()
+                    continue
+
+                # Winner found: close whatever the other attempt returns
+                for loser in (done | pending) - {future}:
+                    loser.add_done_callback(_close_result)
+                if fallback is not None:
+                    fallback.close()
+                if future is backup.future:
+                    with self._lock:
+                        self.stats['hedge_wins'] += 1
+                return response
+
+        if fallback is not None:
+            return fallback
+        raise error
+
+    def _tracker(self, url: str) -> LatencyTracker:
+        path = urlsplit(url).path
+        with self._lock:
+            if path not in self._trackers:
+                self._trackers[path] = LatencyTracker()
+            return self._trackers[path]
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+class _Attempt:
+    """One send() on the pool, timed from when it actually starts running"""
+
+    def __init__(self, pool: ThreadPoolExecutor, send: Callable[[], requests.Response], tracker: LatencyTracker):
+        self.started = threading.Event()
+        self.start = 0.0
+        self.future = pool.submit(self._run, send, tracker)
+
+    def _run(self, send: Callable[[], requests.Response], tracker: LatencyTracker) -> requests.Response:
+        self.start = time.monotonic()
+        self.started.set()
+        response = send()
+        # Every attempt counts, the hedge loser included
+        tracker.record(time.monotonic() - self.start)
+        return response
+
+def _acceptable(response: requests.Response) -> bool:
+    """An answer worth returning over the other attempt's"""
+    return response.status_code < 500 and response.status_code != 429
+
+def _close_result(future):
+    if future.exception() is None:
+        future.result().close()
@@ -1,4 +1,4 @@
-import requests
+import client
 import os
 
 API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -14,7 +14,7 @@ def download_instagram():
         'url': 'https://www.instagram.com/p/ABC123xyz/'
     }
     
-    response = requests.post(url, json=data, headers=headers)
+    response = client.post(url, json=data, headers=headers)
     
     if response.status_code == 200:
         result = response.json()
@@ -0,0 +1,144 @@
+"""
+Cognima API - Inline Hashing (Python)
+
+Hashes download bodies while they are written, so files don't need a
+second read for checksums or deduplication. Multi-connection downloads
+write ranges out of order; OrderedHasher hashes data in memory whenever
+it lands at the hash cursor and reads back (from the page cache, right
+after it was written) only the bytes that arrived ahead of it.
+
+COGNIMA_DOWNLOAD_HASH picks the algorithm: sha256 (default), blake2b,
+blake2s, sha1, md5, xxh64, xxh3_64 or xxh3_128 (the xxh* ones need the
+optional `xxhash` package), or 'off'.
+"""
+
+import hashlib
+import os
+from typing import Callable, Dict, Optional
+
+import requests
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+HASH_ALGORITHM = os.getenv('COGNIMA_DOWNLOAD_HASH', 'sha256')
+READ_BACK_SIZE = 1024 * 1024
+
+class IntegrityError(requests.exceptions.RequestException):
+    """A downloaded file doesn't match its expected size or hash"""
+
+def new_hash(algorithm: str):
+    """
+    Create a hash object
+
+    Args:
+        algorithm: Name from the module docstring
+
+    Returns:
+        Object with update() and hexdigest()
+
+    Raises:
+        ValueError: For unknown names, or xxh* without xxhash installed
+    """
+    if algorithm.startswith('xxh'):
+        if xxhash is None:
+            raise ValueError(f'{algorithm} needs the xxhash package (pip install xxhash)')
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+def expected_size(data: Dict) -> Optional[int]:
+    """
+    Get an exact byte size from an API response, if it has one
+
+    Args:
+        data: `data` block from /gdrive/info, /gdrive/download, or a
+            media item from /alldl
+
+    Returns:
+        Size in bytes, or None (human-readable sizes like "15.32 MB"
+        are not exact enough to check against)
+    """
+    for key in ('fileSizeBytes', 'filesize'):
+        value = data.get(key)
+        if isinstance(value, int) and value > 0:
+            return value
+    return None
+
+class OrderedHasher:
+    """
+    Hashes a file whose parts may be written out of order
+
+    Args:
+        path: File being written
+        algorithm: Hash name (see new_hash)
+        contiguous_end: Callable giving, for a position, the end
+            (exclusive) of the written region starting there
+    """
+
+    def __init__(self, path: str, algorithm: str, contiguous_end: Callable[[int], int]):
+        self.path = path
+        self.algorithm = algorithm
+        self.contiguous_end = contiguous_end
+        self.position = 0
+        self.read_back = 0
+
+        self._hash = new_hash(algorithm)
+        self._fd: Optional[int] = None
+
+    def update(self, offset: int, data: memoryview):
+        """
+        Feed bytes that were just written at offset (caller serializes)
+
+        Args:
+            offset: File offset of data
+            data: The bytes written
+        """
+        if offset == self.position:
+            self._hash.update(data)
+            self.position += len(data)
+        self.catch_up()
+
+    def catch_up(self):
+        """Hash whatever is already on disk right after the cursor"""
+        end = self.contiguous_end(self.position)
+        while self.position < end:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDONLY)
+            chunk = os.pread(self._fd, min(READ_BACK_SIZE, end - self.position), self.position)
+            if not chunk:
+                break
+            self._hash.update(chunk)
+            self.position += len(chunk)
+            self.read_back += len(chunk)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+def verify(size: int, hashed: int, digest: Optional[str], expected_size: Optional[int] = None,
+           expected_hash: Optional[str] = None):
+    """
+    Check a finished download against what the API reported
+
+    Args:
+        size: Bytes written
+        hashed: Bytes that went through the hash
+        digest: Hex digest (None if hashing is off)
+        expected_size: Size reported by the API, if known
+        expected_hash: Known digest, if any
+
+    Raises:
+        IntegrityError: On any mismatch
+    """
+    if expected_size is not None and size != expected_size:
+        raise IntegrityError(f'Size mismatch: got {size} bytes, API reported {expected_size}')
+    if digest is not None and hashed != size:
+        raise IntegrityError(f'Only {hashed} of {size} bytes were hashed')
+    if expected_hash is not None and digest is not None and digest != expected_hash.lower():
+        raise IntegrityError(f'Hash mismatch: got {digest}, expected {expected_hash}')
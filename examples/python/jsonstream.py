@@ -0,0 +1,267 @@
+"""
+Cognima API - Streaming Base64 Fields (Python)
+
+Endpoints such as /youtube/mp3 and /youtube/mp4 return the whole file
+as a base64 string inside the JSON body (`data.buffer`). Parsing that
+with response.json() holds the body text, the base64 string and the
+decoded bytes in memory together. This module walks the body as it
+arrives instead: the small metadata around the field is kept and parsed
+normally, while the field's value is decoded in fixed-size blocks and
+written straight to a file, so memory use doesn't grow with the file.
+"""
+
+import binascii
+import json
+from typing import BinaryIO, Callable, Dict, Iterable, Optional, Tuple
+
+import requests
+
+READ_SIZE = 256 * 1024
+# Base64 text decoded per block (a multiple of 4)
+DECODE_BLOCK = 1024 * 1024
+
+_WHITESPACE = b' \t\r\n'
+
+# Simple JSON escapes (backslash + one character)
+_ESCAPES = {
+    ord('"'): b'"', ord('\\'): b'\\', ord('/'): b'/', ord('b'): b'\b',
+    ord('f'): b'\f', ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t',
+}
+
+class _Base64Writer:
+    """
+    Decodes base64 text in DECODE_BLOCK pieces and writes the bytes
+
+    Args:
+        f: Binary file for the decoded bytes, or None to skip the field
+    """
+
+    def __init__(self, f: Optional[BinaryIO]):
+        self.f = f
+        self.pending = bytearray()
+        # Incomplete escape sequence at the end of the last piece
+        self.carry = b''
+        self.written = 0
+
+    @property
+    def escape(self) -> bool:
+        """The last piece ended in a backslash that escapes the next character"""
+        return self.carry == b'\\'
+
+    def feed(self, text: bytes):
+        if self.carry:
+            text = self.carry + text
+            self.carry = b''
+        if b'\\' in text:
+            text, self.carry = _unescape(text)
+            # Escaped line breaks (wrapped base64) would shift the 4-character groups
+            text = text.translate(None, _WHITESPACE)
+
+        self.pending += text
+        if len(self.pending) >= DECODE_BLOCK:
+            cut = len(self.pending) - len(self.pending) % DECODE_BLOCK
+            with memoryview(self.pending) as view, view[:cut] as block:
+                self._decode(block)
+            del self.pending[:cut]
+
+    def close(self):
+        if self.carry:
+            raise ValueError('Base64 field ends inside an escape sequence')
+        if self.pending:
+            self._decode(self.pending)
+            self.pending.clear()
+
+    def _decode(self, block):
+        if self.f is None:
+            return
+        data = binascii.a2b_base64(block)
+        self.f.write(data)
+        self.written += len(data)
+
+def _unescape(text: bytes) -> Tuple[bytes, bytes]:
+    """
+    Resolve the JSON escapes in a piece of a string value
+
+    Returns:
+        (unescaped text, trailing incomplete escape to prepend to the next piece)
+
+    Raises:
+        ValueError: On an escape JSON doesn't allow
+    """
+    out = bytearray()
+    i = 0
+    while True:
+        j = text.find(b'\\', i)
+        if j == -1:
+            out += text[i:]
+            return bytes(out), b''
+        out += text[i:j]
+        if j + 1 == len(text):
+            return bytes(out), text[j:]
+
+        c = text[j + 1]
+        if c == 0x75:  # \uXXXX
+            if j + 6 > len(text):
+                return bytes(out), text[j:]
+            out += chr(int(text[j + 2:j + 6], 16)).encode('utf-8')
+            i = j + 6
+        elif c in _ESCAPES:
+            out += _ESCAPES[c]
+            i = j + 2
+        else:
+            raise ValueError(f'Invalid JSON escape {text[j:j + 2]!r}')
+
+class Base64FieldParser:
+    """
+    Incremental form of save_base64_field(): feed() the body's chunks as
+    they arrive (from any source, e.g. an aiohttp stream), then close()
+
+    Args:
+        key: Name of the base64 field (e.g. 'buffer')
+        f: Binary file the decoded bytes are written to, or None to
+            skip the field without decoding it
+        container: Name of the top-level object holding the field
+    """
+
+    def __init__(self, key: str, f: Optional[BinaryIO], container: str = 'data'):
+        self.skeleton = bytearray()
+        self.target = json.dumps(key).encode()
+        self.parent = json.dumps(container).encode()
+
+        self.in_string = False
+        self.escaped = False
+        self.token_start = 0
+        self.last_string = b''
+        # Key of each open container, so we know we're inside "data"
+        self.stack = []
+        # 0: idle, 1: saw the field's key and colon, 2: inside its value
+        self.field_state = 0
+        self.writer = _Base64Writer(f)
+
+    def feed(self, chunk: bytes):
+        """Parse the next piece of the body"""
+        skeleton = self.skeleton
+        writer = self.writer
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if self.field_state == 2:
+                end = chunk.find(b'"', i)
+                # A quote preceded by a backslash is escaped, not the end
+                while end != -1 and _is_escaped(chunk, i, end, writer.escape):
+                    end = chunk.find(b'"', end + 1)
+                if end == -1:
+                    writer.feed(chunk[i:])
+                    break
+                writer.feed(chunk[i:end])
+                writer.close()
+                skeleton += b'"'
+                self.field_state = 0
+                i = end + 1
+                continue
+
+            c = chunk[i]
+            skeleton.append(c)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif c == 0x5C:  # backslash
+                    self.escaped = True
+                elif c == 0x22:  # closing quote
+                    self.in_string = False
+                    self.last_string = bytes(skeleton[self.token_start:])
+            elif c == 0x22:
+                self.in_string = True
+                self.token_start = len(skeleton) - 1
+                if self.field_state == 1:
+                    self.field_state = 2
+            elif c in (0x7B, 0x5B):  # { [
+                self.stack.append(self.last_string)
+                self.last_string = b''
+                self.field_state = 0
+            elif c in (0x7D, 0x5D):  # } ]
+                if self.stack:
+                    self.stack.pop()
+                self.field_state = 0
+            elif c == 0x3A:  # colon after a key
+                at_field = (self.last_string == self.target and len(self.stack) == 2
+                            and self.stack[1] == self.parent)
+                self.field_state = 1 if at_field else 0
+            elif c not in _WHITESPACE:
+                self.field_state = 0
+            i += 1
+
+    def close(self) -> Tuple[Dict, int]:
+        """
+        Finish parsing
+
+        Returns:
+            (parsed body with the field set to '', bytes written)
+
+        Raises:
+            ValueError: If the body is not valid JSON or the base64 is invalid
+        """
+        body = json.loads(bytes(self.skeleton))
+        return body, self.writer.written
+
+def save_base64_field(chunks: Iterable[bytes], key: str, f: Optional[BinaryIO],
+                      container: str = 'data') -> Tuple[Dict, int]:
+    """
+    Parse a JSON body, decoding one base64 string field into a file
+
+    Args:
+        chunks: Body as an iterable of byte chunks
+        key: Name of the base64 field (e.g. 'buffer')
+        f: Binary file the decoded bytes are written to, or None to
+            skip the field
+        container: Name of the top-level object holding the field
+
+    Returns:
+        (parsed body with the field set to '', bytes written)
+
+    Raises:
+        ValueError: If the body is not valid JSON or the base64 is invalid
+    """
+    parser = Base64FieldParser(key, f, container)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+def _is_escaped(chunk: bytes, start: int, quote: int, carried: bool) -> bool:
+    """Check whether the quote at chunk[quote] follows an odd run of backslashes"""
+    count = 0
+    j = quote - 1
+    while j >= start and chunk[j] == 0x5C:
+        count += 1
+        j -= 1
+    if j < start and carried:
+        count += 1
+    return count % 2 == 1
+
+def save_response_field(response: requests.Response, key: str, f: Optional[BinaryIO], container: str = 'data',
+                        throttle: Optional[Callable[[int], None]] = None) -> Tuple[Dict, int]:
+    """
+    Stream a response opened with stream=True through save_base64_field()
+
+    Args:
+        response: Streamed response
+        key: Name of the base64 field
+        f: Binary file the decoded bytes are written to, or None to
+            skip the field
+        container: Name of the top-level object holding the field
+        throttle: Called with each chunk's size; may block to pace the
+            transfer (see bandwidth.throttle_for)
+
+    Returns:
+        (parsed body with the field set to '', bytes written)
+    """
+    chunks = response.iter_content(chunk_size=READ_SIZE)
+    if throttle is not None:
+        chunks = _throttled(chunks, throttle)
+    return save_base64_field(chunks, key, f, container)
+
+def _throttled(chunks: Iterable[bytes], throttle: Callable[[int], None]) -> Iterable[bytes]:
+    for chunk in chunks:
+        throttle(len(chunk))
+        yield chunk
@@ -1,4 +1,4 @@
-import requests
+import client
 
 API_BASE = 'https://cog.api.br/api/v1'
 
@@ -13,7 +13,7 @@ def download_likee(url: str) -> dict:
         dict: Download data or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/likee/download', params={'url': url})
+        response = client.get(f'{API_BASE}/likee/download', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -47,7 +47,7 @@ def get_likee_info(url: str) -> dict:
         dict: Video information or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/likee/info', params={'url': url})
+        response = client.get(f'{API_BASE}/likee/info', params={'url': url})
         data = response.json()
         
         if data.get('success'):
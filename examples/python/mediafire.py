@@ -1,4 +1,7 @@
 import requests
+import client
+import downloader
+import integrity
 import os
 
 API_KEY = os.environ.get('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -9,7 +12,7 @@ def get_mediafire_info():
     try:
         url = 'https://www.mediafire.com/file/abc123xyz/arquivo.zip/file'
         
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/mediafire/info',
             params={'url': url},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -36,7 +39,7 @@ def download_mediafire():
     try:
         url = 'https://www.mediafire.com/file/abc123xyz/arquivo.zip/file'
         
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/mediafire/download',
             params={'url': url},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -52,34 +55,60 @@ def download_mediafire():
     except requests.exceptions.RequestException as e:
         print(f'❌ Erro: {e}')
 
+def _download_data(mediafire_url: str) -> dict:
+    """Pedir à API um downloadUrl (assinado) para o arquivo"""
+    response = client.get(
+        f'{BASE_URL}/mediafire/download',
+        params={'url': mediafire_url},
+        headers={'Authorization': f'Bearer {API_KEY}'}
+    )
+    response.raise_for_status()
+    return response.json()['data']
+
 def download_file_to_disk(mediafire_url: str, output_path: str):
     """Baixar arquivo diretamente para o disco"""
     try:
-        # Primeiro, obter o link de download
-        response = requests.get(
-            f'{BASE_URL}/mediafire/download',
-            params={'url': mediafire_url},
-            headers={'Authorization': f'Bearer {API_KEY}'}
-        )
-        response.raise_for_status()
+        def resolve():
+            # Links assinados expiram; pedir um novo à API quando preciso
+            return _download_data(mediafire_url)
         
-        download_url = response.json()['data']['downloadUrl']
-        file_name = response.json()['data']['fileName']
+        # Primeiro, obter o link de download
+        data = resolve()
+        download_url = data['downloadUrl']
+        file_name = data['fileName']
         
-        # Depois, baixar o arquivo
+        # Depois, baixar o arquivo (retoma um .part existente)
         print(f'⬇️  Baixando {file_name}...')
-        file_response = requests.get(download_url, stream=True)
-        file_response.raise_for_status()
-        
-        with open(output_path, 'wb') as f:
-            for chunk in file_response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # O tamanho informado pela API é conferido ao final
+        result = downloader.download(download_url, output_path, resolve=lambda: resolve()['downloadUrl'],
+                                     expected_size=integrity.expected_size(data))
+        if result['resumed_bytes']:
+            print(f"↩️  Retomado a partir de {result['resumed_bytes']} bytes")
+        if result['hash']:
+            print(f"🔒 {result['hash_algorithm']}: {result['hash']}")
         
         print(f'✅ Arquivo salvo em: {output_path}')
         
     except requests.exceptions.RequestException as e:
         print(f'❌ Erro: {e}')
 
+def stream_file(mediafire_url: str, *sinks) -> dict:
+    """
+    Enviar o arquivo para outros destinos sem gravar no disco
+
+    Args:
+        mediafire_url: Link do arquivo
+        *sinks: Sockets, arquivos abertos em modo binário, objetos de
+            hash ou funções; todos recebem os mesmos bytes, em ordem
+
+    Returns:
+        Dicionário com size, hash e hash_algorithm
+    """
+    data = _download_data(mediafire_url)
+    return downloader.stream_to(data['downloadUrl'], *sinks,
+                                resolve=lambda: _download_data(mediafire_url)['downloadUrl'],
+                                expected_size=integrity.expected_size(data))
+
 if __name__ == '__main__':
     print('=== MediaFire API Examples ===\n')
     get_mediafire_info()
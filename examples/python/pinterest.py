@@ -1,4 +1,4 @@
-import requests
+import client
 import os
 
 API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -14,7 +14,7 @@ def search_pinterest():
         'query': 'modern interior design'
     }
     
-    response = requests.post(url, json=data, headers=headers)
+    response = client.post(url, json=data, headers=headers)
     
     if response.status_code == 200:
         result = response.json()
@@ -35,7 +35,7 @@ def download_pinterest():
         'url': 'https://pinterest.com/pin/123456789/'
     }
     
-    response = requests.post(url, json=data, headers=headers)
+    response = client.post(url, json=data, headers=headers)
     
     if response.status_code == 200:
         result = response.json()
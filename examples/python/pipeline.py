@@ -0,0 +1,129 @@
+"""
+Cognima API - Staged Pipelines (Python)
+
+Runs a batch through a chain of stages (e.g. resolve metadata, then
+download bytes) with each stage on its own worker threads, connected by
+bounded queues. Upcoming items are resolved while earlier ones are
+still transferring, each stage keeps its own concurrency limit, and a
+full queue holds the stage before it back so work never piles up
+between stages.
+"""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# (name, function, worker threads)
+Stage = Tuple[str, Callable[[Any], Any], int]
+
+_DONE = object()
+
+@dataclass
+class Outcome:
+    """
+    What happened to one input item
+
+    Attributes:
+        item: The input item
+        value: Output of the last stage (None if a stage failed)
+        error: Exception raised by the failing stage, if any
+        stage: Name of the failing stage, if any
+        index: Position of the item in the input
+    """
+    item: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+    stage: Optional[str] = None
+    index: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def run(items: Iterable, stages: List[Stage], queue_size: Optional[int] = None,
+        on_done: Optional[Callable[[Outcome], None]] = None) -> List[Outcome]:
+    """
+    Push every item through the stages
+
+    Each stage's function receives the previous stage's output. An item
+    whose stage raises skips the remaining stages.
+
+    Args:
+        items: Inputs for the first stage
+        stages: (name, function, worker threads) in order
+        queue_size: Capacity of each queue between stages (defaults to
+            twice the receiving stage's workers)
+        on_done: Called from worker threads as each item finishes; if it
+            raises, the error is recorded on that item's Outcome (stage
+            'on_done') unless a stage already failed it
+
+    Returns:
+        One Outcome per item, in input order
+    """
+    items = list(items)
+    outcomes = [Outcome(item, index=index) for index, item in enumerate(items)]
+    queues = [queue.Queue(maxsize=queue_size or 2 * workers) for _, _, workers in stages]
+    lock = threading.Lock()
+    remaining = [workers for _, _, workers in stages]
+
+    def finish(index: int):
+        if on_done is None:
+            return
+        try:
+            on_done(outcomes[index])
+        except Exception as e:
+            # A failing callback mustn't kill the worker (run() would wait forever)
+            outcome = outcomes[index]
+            if outcome.error is None:
+                outcome.error = e
+                outcome.stage = 'on_done'
+
+    def worker(position: int):
+        name, func, _ = stages[position]
+        inbox = queues[position]
+        last = position == len(stages) - 1
+
+        while True:
+            entry = inbox.get()
+            if entry is _DONE:
+                break
+
+            index, value = entry
+            try:
+                result = func(value)
+            except Exception as e:
+                outcomes[index].error = e
+                outcomes[index].stage = name
+                finish(index)
+                continue
+
+            if last:
+                outcomes[index].value = result
+                finish(index)
+            else:
+                queues[position + 1].put((index, result))
+
+        # The last worker out of a stage tells the next stage to stop
+        with lock:
+            remaining[position] -= 1
+            stage_finished = remaining[position] == 0
+        if stage_finished and not last:
+            for _ in range(stages[position + 1][2]):
+                queues[position + 1].put(_DONE)
+
+    threads = [threading.Thread(target=worker, args=(position,), name=f'pipeline-{name}', daemon=True)
+               for position, (name, _, workers) in enumerate(stages) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    # Feeding blocks while the first queue is full
+    for index, item in enumerate(items):
+        queues[0].put((index, item))
+    for _ in range(stages[0][2]):
+        queues[0].put(_DONE)
+
+    for thread in threads:
+        thread.join()
+
+    return outcomes
@@ -0,0 +1,171 @@
+"""
+Cognima API - Quota Scheduler (Python)
+
+A token bucket filled from the `limits` block of GET /api/v1/status.
+Requests are released immediately while hourly and daily quota remain;
+once the bucket is empty, callers block until the hourly `reset_at` and
+the bucket is refilled from a fresh /status read.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+def parse_reset_at(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a `reset_at` timestamp
+
+    Args:
+        value: ISO 8601 string such as "2024-11-07T11:00:00Z"
+
+    Returns:
+        Unix timestamp, or None if missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+def remaining_from_limits(limits: Dict) -> float:
+    """
+    Compute how many requests are left from a `limits` block
+
+    Args:
+        limits: The `limits` dict from /status or from a 429 body
+
+    Returns:
+        The smaller of the hourly and daily remaining counts
+    """
+    remaining = math.inf
+
+    hourly = limits.get('hourly') or {}
+    if hourly.get('remaining') is not None:
+        remaining = min(remaining, hourly['remaining'])
+
+    daily = (limits.get('daily') or {}).get('requests') or {}
+    if daily.get('remaining') is not None:
+        remaining = min(remaining, daily['remaining'])
+
+    return remaining
+
+class QuotaScheduler:
+    """
+    Thread-safe token bucket driven by the API's own quota counters
+
+    Args:
+        fetch_limits: Callable returning the `limits` dict from /status
+        reserve: Requests to keep back for interactive use
+        retry_interval: Seconds to wait before re-reading /status when it
+            fails or gives no reset time
+    """
+
+    def __init__(self, fetch_limits: Callable[[], Dict], reserve: int = 0, retry_interval: float = 60.0):
+        self.fetch_limits = fetch_limits
+        self.reserve = reserve
+        self.retry_interval = retry_interval
+
+        self._cond = threading.Condition()
+        self._tokens: Optional[float] = None
+        self._refill_at = 0.0
+        # A thread is re-reading /status; the others wait for its answer
+        self._refreshing = False
+
+    def update(self, limits: Dict):
+        """
+        Reset the bucket from a `limits` block (from /status or a 429 body)
+
+        Args:
+            limits: Dict with `hourly` and optionally `daily` entries
+        """
+        with self._cond:
+            self._apply(limits)
+            self._cond.notify_all()
+
+    def acquire(self):
+        """Block until one request may be sent, then take its token"""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+
+                if self._tokens is None or now >= self._refill_at:
+                    if self._refreshing:
+                        self._cond.wait()
+                    else:
+                        self._refresh()
+                    continue
+
+                if self._tokens > 0:
+                    self._tokens -= 1
+                    return
+
+                self._cond.wait(timeout=max(0.0, self._refill_at - time.monotonic()))
+
+    def refresh_if_stale(self):
+        """Re-read /status if the bucket is empty of data or past its refill time, or wait for the thread already doing so"""
+        with self._cond:
+            while self._tokens is None or time.monotonic() >= self._refill_at:
+                if self._refreshing:
+                    self._cond.wait()
+                else:
+                    self._refresh()
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token only if one is available right now
+
+        Returns:
+            True if a token was taken
+        """
+        with self._cond:
+            if self._tokens is None or time.monotonic() >= self._refill_at or self._tokens <= 0:
+                return False
+            self._tokens -= 1
+            return True
+
+    def stats(self) -> Dict:
+        """
+        Get the current bucket state
+
+        Returns:
+            Dictionary with remaining tokens and seconds until refill
+        """
+        with self._cond:
+            return {
+                'tokens': self._tokens,
+                'refill_in': max(0.0, self._refill_at - time.monotonic())
+            }
+
+    def _refresh(self):
+        """Re-read the quota; called with _cond held, which is released during the fetch"""
+        self._refreshing = True
+        self._cond.release()
+        try:
+            limits = self.fetch_limits()
+        except Exception:
+            limits = None
+        finally:
+            self._cond.acquire()
+            self._refreshing = False
+            self._cond.notify_all()
+
+        if limits is None:
+            # Unknown quota: don't block, but look again soon
+            self._tokens = math.inf
+            self._refill_at = time.monotonic() + self.retry_interval
+        else:
+            self._apply(limits)
+
+    def _apply(self, limits: Dict):
+        now = time.monotonic()
+        self._tokens = max(0, remaining_from_limits(limits) - self.reserve)
+
+        reset_at = parse_reset_at((limits.get('hourly') or {}).get('reset_at'))
+        if reset_at is None:
+            self._refill_at = now + self.retry_interval
+        else:
+            # Convert wall-clock reset time to the monotonic clock
+            self._refill_at = now + max(1.0, reset_at - time.time())
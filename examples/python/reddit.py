@@ -1,4 +1,4 @@
-import requests
+import client
 
 API_BASE = 'https://cog.api.br/api/v1'
 
@@ -13,7 +13,7 @@ def download_reddit(url: str) -> dict:
         dict: Download data or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/reddit/download', params={'url': url})
+        response = client.get(f'{API_BASE}/reddit/download', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -47,7 +47,7 @@ def get_reddit_info(url: str) -> dict:
         dict: Post information or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/reddit/info', params={'url': url})
+        response = client.get(f'{API_BASE}/reddit/info', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -1,5 +1,5 @@
 import os
-import requests
+import client
 
 API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
 BASE_URL = 'https://cog.api.br/api/v1'
@@ -15,7 +15,7 @@ def remove_background():
         'url': 'https://files.catbox.moe/ldsyfx.jpg'
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = client.post(url, json=payload, headers=headers)
 
     if response.status_code == 200:
         data = response.json()
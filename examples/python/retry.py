@@ -0,0 +1,291 @@
+"""
+Cognima API - Retry Policy (Python)
+
+Central retry rules for API calls:
+
+- 429 (rate limited): sleep until `limits.hourly.reset_at` from the
+  response body (or the Retry-After header), then try again; a reset
+  further away than max_rate_limit_wait raises RateLimitExceeded
+- 502/503/504 and connection errors: full-jitter exponential backoff
+- Each endpoint has its own attempt limit and retry budget, so a
+  broken upstream cannot turn a batch into a retry storm
+"""
+
+import asyncio
+import copy
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+import requests
+
+from quota import parse_reset_at
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+class RateLimitExceeded(requests.exceptions.HTTPError):
+    """
+    A 429 whose reset is further away than the policy will sleep
+
+    Attributes:
+        wait: Seconds until the limit resets
+        response: The 429 response
+    """
+
+    def __init__(self, *args, wait: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait = wait
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent traffic
+
+    Every first attempt deposits `ratio` tokens and every retry withdraws
+    one, so retries can add at most `ratio` extra load on top of normal
+    traffic. `min_tokens` lets low-traffic endpoints still retry.
+
+    Args:
+        ratio: Retries allowed per request sent
+        min_tokens: Tokens available even without recent traffic
+        max_tokens: Upper bound on saved-up tokens
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Record a first attempt"""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Try to spend one retry
+
+        Returns:
+            True if the retry is allowed
+        """
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+class RetryPolicy:
+    """
+    Retry rules for one endpoint (or family of endpoints)
+
+    Args:
+        max_attempts: Total attempts including the first one
+        base_delay: Backoff base in seconds
+        max_delay: Backoff ceiling in seconds
+        statuses: HTTP statuses worth retrying
+        retry_errors: Retry connection errors and timeouts
+        max_rate_limit_wait: Longest sleep accepted for a 429 reset; a
+            longer one raises RateLimitExceeded
+        budget: Shared retry budget (a new one by default)
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0,
+                 statuses=RETRY_STATUSES, retry_errors: bool = True, max_rate_limit_wait: float = 300.0,
+                 budget: Optional[RetryBudget] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = frozenset(statuses)
+        self.retry_errors = retry_errors
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.budget = budget or RetryBudget()
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff
+
+        Args:
+            attempt: Number of attempts already made (1 for the first retry)
+
+        Returns:
+            Seconds to sleep, uniform in [0, min(max_delay, base * 2^attempt)]
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, send: Callable[[], requests.Response],
+             on_response: Optional[Callable[[requests.Response], None]] = None) -> requests.Response:
+        """
+        Send a request, retrying according to this policy
+
+        Args:
+            send: Callable that performs one attempt
+            on_response: Called with every response before it is judged
+
+        Returns:
+            The final response (which may still be an error status)
+
+        Raises:
+            RateLimitExceeded: If a 429 asks for a longer wait than
+                max_rate_limit_wait
+        """
+        self.budget.deposit()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            try:
+                response = send()
+            except RETRY_EXCEPTIONS:
+                if not self.retry_errors or not self._may_retry(attempt):
+                    raise
+                time.sleep(self.backoff(attempt))
+                continue
+
+            if on_response is not None:
+                on_response(response)
+
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                return response
+
+            response.close()
+            time.sleep(delay)
+
+    async def call_async(self, send: Callable[[], Awaitable[requests.Response]],
+                         on_response: Optional[Callable[[requests.Response], None]] = None,
+                         errors: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS) -> requests.Response:
+        """
+        Awaitable call(): same rules and budget, sleeping on the event loop
+
+        Args:
+            send: Coroutine function that performs one attempt
+            on_response: Called with every response before it is judged
+            errors: Exceptions treated as connection errors and timeouts
+                (the async client's own, e.g. aiohttp's)
+
+        Returns:
+            The final response (which may still be an error status)
+
+        Raises:
+            RateLimitExceeded: As in call()
+        """
+        self.budget.deposit()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            try:
+                response = await send()
+            except errors:
+                if not self.retry_errors or not self._may_retry(attempt):
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+
+            if on_response is not None:
+                on_response(response)
+
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                return response
+
+            response.close()
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a response, or None to return it"""
+        if response.status_code not in self.statuses:
+            return None
+
+        wait = rate_limit_wait(response) if response.status_code == 429 else None
+        if wait is not None and wait > self.max_rate_limit_wait:
+            raise RateLimitExceeded(
+                f'Rate limited for {wait:.0f}s, longer than max_rate_limit_wait ({self.max_rate_limit_wait:.0f}s)',
+                response=response, wait=wait
+            )
+
+        if not self._may_retry(attempt):
+            return None
+        if wait is not None:
+            # Small jitter so a whole batch doesn't wake at once
+            return wait + random.uniform(0, 1.0)
+        return self.backoff(attempt)
+
+    def _may_retry(self, attempt: int) -> bool:
+        return attempt < self.max_attempts and self.budget.withdraw()
+
+def rate_limit_wait(response: requests.Response) -> Optional[float]:
+    """
+    Work out how long a 429 asks us to wait
+
+    Args:
+        response: A 429 response
+
+    Returns:
+        Seconds until the limit resets, or None if the response doesn't say
+    """
+    retry_after = response.headers.get('Retry-After')
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+
+    try:
+        limits = response.json().get('limits') or {}
+    except ValueError:
+        return None
+
+    reset_at = parse_reset_at((limits.get('hourly') or {}).get('reset_at'))
+    if reset_at is None:
+        return None
+
+    return max(0.0, reset_at - time.time())
+
+# Default rules, plus per-endpoint overrides keyed by path prefix under /api/v1
+# Settings for endpoints not listed below; each such endpoint gets its
+# own copy with its own budget (see policy_for)
+DEFAULT_POLICY = RetryPolicy()
+
+ENDPOINT_POLICIES: Dict[str, RetryPolicy] = {
+    # yt-dlp backed endpoints are slow: fewer, longer-spaced attempts
+    '/alldl': RetryPolicy(max_attempts=3, base_delay=2.0),
+    '/twitch/download': RetryPolicy(max_attempts=3, base_delay=2.0),
+    '/vimeo/download': RetryPolicy(max_attempts=3, base_delay=2.0),
+    # Not safe to repeat after the server may have done the work: only retry 429
+    '/completion': RetryPolicy(statuses={429}, retry_errors=False),
+    '/freefire/sendlikes': RetryPolicy(statuses={429}, retry_errors=False),
+}
+
+_default_policies: Dict[str, RetryPolicy] = {}
+_default_lock = threading.Lock()
+
+def policy_for(url: str) -> RetryPolicy:
+    """
+    Find the retry policy for a URL (longest matching path prefix)
+
+    Args:
+        url: Absolute API URL
+
+    Returns:
+        The matching RetryPolicy, or a copy of DEFAULT_POLICY with a
+        retry budget of its own for that endpoint path
+    """
+    path = urlsplit(url).path
+    if path.startswith('/api/v1'):
+        path = path[len('/api/v1'):]
+
+    best = None
+    for prefix in ENDPOINT_POLICIES:
+        if (path == prefix or path.startswith(prefix + '/')) and (best is None or len(prefix) > len(best)):
+            best = prefix
+
+    if best:
+        return ENDPOINT_POLICIES[best]
+
+    with _default_lock:
+        if path not in _default_policies:
+            policy = copy.copy(DEFAULT_POLICY)
+            policy.budget = RetryBudget()
+            _default_policies[path] = policy
+        return _default_policies[path]
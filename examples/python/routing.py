@@ -0,0 +1,246 @@
+"""
+Cognima API - URL Router (Python)
+
+Any link can go to /alldl, but that runs a full yt-dlp extraction and
+costs seconds per item; the dedicated endpoints (/vimeo/download,
+/reddit/download, /twitter/download, /gdrive/download, ...) answer much
+faster. The router classifies a URL locally, with one precompiled regex
+over hostname and path shape, and resolves it through the matching
+dedicated endpoint, keeping /alldl as the fallback for unknown sites
+and for dedicated calls that fail.
+
+Every resolve is timed. When a URL has more than one candidate route,
+they are tried in order of measured latency (an EWMA per route; a
+failure counts as its time plus FAILURE_PENALTY), so a dedicated
+endpoint that turns out slower than /alldl, or keeps failing, is
+demoted. Unmeasured dedicated routes are tried first, and a demoted
+one gets one probe every PROBE_INTERVAL seconds to win its place back.
+
+    resolved = routing.resolve('https://x.com/user/status/1234567890')
+    resolved['downloadUrl'], resolved['route']   # ..., 'twitter'
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import client
+import formats
+
+# Which /alldl media item to download (see formats.parse); e.g.
+# 'smallest >=720p' to save bandwidth
+ALLDL_FORMAT = os.getenv('COGNIMA_ALLDL_FORMAT', 'best video')
+
+# Expected resolve time in seconds until a route has been measured
+# (0 for dedicated routes: try them first)
+DEDICATED_PRIOR = 0.0
+ALLDL_PRIOR = 5.0
+
+# Seconds added to a failed resolve's time in the latency average
+FAILURE_PENALTY = 5.0
+
+# How often a route that isn't first gets tried first anyway
+PROBE_INTERVAL = 60.0
+
+# Weight of the newest sample in a route's latency average
+EWMA_ALPHA = 0.3
+
+def _api_headers() -> Dict:
+    return {'X-API-Key': client.API_KEY}
+
+def _resolve_alldl(url: str) -> Dict:
+    data = client.get_json(f'{client.BASE_URL}/alldl', params={'url': url}, headers=_api_headers())
+    if not data.get('success'):
+        raise ValueError(data.get('error') or 'alldl failed')
+    best = formats.select(data['data']['media'], ALLDL_FORMAT)
+    if best is None:
+        raise ValueError(f'no media matches {ALLDL_FORMAT!r}')
+    return {'downloadUrl': best['url'], 'filesize': best.get('filesize'),
+            'title': data['data']['metadata'].get('title')}
+
+def _resolve_download_endpoint(family: str) -> Callable[[str], Dict]:
+    """Resolver for endpoints answering {'data': {'downloadUrl': ...}}"""
+    def resolve(url: str) -> Dict:
+        response = client.get(f'{client.BASE_URL}/{family}/download', params={'url': url}, headers=_api_headers())
+        response.raise_for_status()
+        data = response.json()
+        if not data.get('success', True) or not data.get('data', {}).get('downloadUrl'):
+            raise ValueError(data.get('error') or f'{family} returned no downloadUrl')
+        return data['data']
+    return resolve
+
+def _resolve_twitter(url: str) -> Dict:
+    response = client.get(f'{client.BASE_URL}/twitter/download', params={'url': url}, headers=_api_headers())
+    response.raise_for_status()
+    data = response.json()['data']
+    if not data.get('downloads'):
+        raise ValueError('tweet has no media')
+    # The first download is the best quality
+    return dict(data, downloadUrl=data['downloads'][0]['url'])
+
+def _resolve_spotify(url: str) -> Dict:
+    # /spotify/download streams the audio itself; the link never expires
+    return {'downloadUrl': f'{client.BASE_URL}/spotify/download', 'params': {'url': url}, 'static': True}
+
+# How each route turns a source URL into a downloadUrl
+RESOLVERS: Dict[str, Callable[[str], Dict]] = {
+    'alldl': _resolve_alldl,
+    'vimeo': _resolve_download_endpoint('vimeo'),
+    'twitch': _resolve_download_endpoint('twitch'),
+    'dailymotion': _resolve_download_endpoint('dailymotion'),
+    'streamable': _resolve_download_endpoint('streamable'),
+    'bandcamp': _resolve_download_endpoint('bandcamp'),
+    'reddit': _resolve_download_endpoint('reddit'),
+    'gdrive': _resolve_download_endpoint('gdrive'),
+    'mediafire': _resolve_download_endpoint('mediafire'),
+    'soundcloud': _resolve_download_endpoint('soundcloud'),
+    'twitter': _resolve_twitter,
+    'spotify': _resolve_spotify,
+}
+
+# Dedicated routes and the URL shapes they accept, matched against
+# "host/path" with www., m. and mobile. stripped from the host
+ROUTES: List[Tuple[str, str]] = [
+    ('gdrive', r'(?:drive|docs)\.google\.com/(?:file/d/|open\b|uc\b)'),
+    ('mediafire', r'mediafire\.com/(?:file|view|download)/'),
+    ('twitter', r'(?:twitter|x)\.com/(?:\w+|i(?:/web)?)/status(?:es)?/\d+'),
+    ('reddit', r'(?:(?:old\.|new\.)?reddit\.com/r/\w+/comments/|v\.redd\.it/|redd\.it/)'),
+    ('vimeo', r'(?:player\.)?vimeo\.com/(?:video/|channels/\w+/)?\d+'),
+    ('dailymotion', r'(?:dailymotion\.com/video/|dai\.ly/)\w+'),
+    ('twitch', r'(?:clips\.twitch\.tv/[\w-]+|twitch\.tv/(?:videos/\d+|\w+/clip/[\w-]+))'),
+    ('streamable', r'streamable\.com/\w+'),
+    ('bandcamp', r'[\w-]+\.bandcamp\.com/(?:track|album)/'),
+    ('soundcloud', r'soundcloud\.com/[\w-]+/[\w-]+'),
+    ('spotify', r'open\.spotify\.com/(?:intl-[\w-]+/)?track/\w+'),
+]
+
+_HOST_PREFIXES = ('www.', 'm.', 'mobile.')
+
+def _compile(routes: Iterable[Tuple[str, str]]) -> 're.Pattern':
+    """One alternation with a named group per route; lastgroup names the match"""
+    return re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in routes), re.IGNORECASE)
+
+def _match_key(url: str) -> str:
+    parts = urlsplit(url if '://' in url else f'https://{url}')
+    host = (parts.hostname or '').lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    return f'{host}{parts.path}'
+
+class Router:
+    """
+    Classifies URLs and resolves them through the fastest route
+
+    Args:
+        routes: (name, pattern) pairs of dedicated routes; names must be
+            keys of resolvers
+        resolvers: Resolver per route name, including 'alldl'
+        alpha: EWMA weight of the newest latency sample
+    """
+
+    def __init__(self, routes: Iterable[Tuple[str, str]] = ROUTES,
+                 resolvers: Optional[Dict[str, Callable[[str], Dict]]] = None, alpha: float = EWMA_ALPHA):
+        self.resolvers = resolvers or RESOLVERS
+        self.alpha = alpha
+        self._pattern = _compile(routes)
+        self._latency: Dict[str, float] = {}
+        self._last_tried: Dict[str, float] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, url: str) -> Optional[str]:
+        """
+        Name the dedicated route for a URL
+
+        Returns:
+            Route name, or None for sites only /alldl handles
+        """
+        match = self._pattern.match(_match_key(url))
+        return match.lastgroup if match else None
+
+    def candidates(self, url: str) -> List[str]:
+        """Routes able to resolve a URL, expected fastest first"""
+        dedicated = self.classify(url)
+        if dedicated is None:
+            return ['alldl']
+        with self._lock:
+            expected = {
+                dedicated: self._latency.get(dedicated, DEDICATED_PRIOR),
+                'alldl': self._latency.get('alldl', ALLDL_PRIOR)
+            }
+            routes = sorted(expected, key=expected.get)
+            now = time.monotonic()
+            demoted = routes[1] != 'alldl'
+            if demoted and now - self._last_tried.get(routes[1], 0.0) >= PROBE_INTERVAL:
+                # Re-measure the dedicated route that lost, in case it recovered
+                routes.reverse()
+            self._last_tried[routes[0]] = now
+        return routes
+
+    def record(self, route: str, seconds: float, ok: bool):
+        """
+        Add one resolve to a route's statistics
+
+        Failures count FAILURE_PENALTY extra, so a failing route drops
+        behind the fallback.
+        """
+        with self._lock:
+            counts = self._counts.setdefault(route, {'ok': 0, 'failed': 0})
+            counts['ok' if ok else 'failed'] += 1
+            previous = self._latency.get(route)
+            if not ok:
+                seconds += FAILURE_PENALTY
+            self._latency[route] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+
+    def resolve(self, url: str) -> Dict:
+        """
+        Resolve a URL to a downloadUrl through the fastest route
+
+        Args:
+            url: Source URL (any site)
+
+        Returns:
+            The resolver's dictionary (downloadUrl and endpoint fields)
+            plus `route`, the name of the route that answered
+
+        Raises:
+            Exception: The last route's error if every route failed
+        """
+        routes = self.candidates(url)
+        for position, route in enumerate(routes):
+            start = time.monotonic()
+            try:
+                result = self.resolvers[route](url)
+            except Exception:
+                self.record(route, time.monotonic() - start, ok=False)
+                if position == len(routes) - 1:
+                    raise
+                continue
+            self.record(route, time.monotonic() - start, ok=True)
+            return dict(result, route=route)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Average latency (seconds) and outcome counts per route"""
+        with self._lock:
+            return {route: dict(self._counts.get(route, {}), latency=latency)
+                    for route, latency in self._latency.items()}
+
+# Shared by the queue and the examples
+router = Router()
+
+def resolve(url: str) -> Dict:
+    """Resolve a URL with the shared router (see Router.resolve)"""
+    return router.resolve(url)
+
+if __name__ == '__main__':
+    for url in ('https://x.com/user/status/1234567890',
+                'https://www.reddit.com/r/videos/comments/abc123/title/',
+                'https://vimeo.com/123456789',
+                'https://drive.google.com/file/d/1ABC123xyz/view',
+                'https://www.youtube.com/watch?v=dQw4w9WgXcQ'):
+        print(f"{router.classify(url) or 'alldl':12} {url}")
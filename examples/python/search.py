@@ -1,4 +1,6 @@
 import requests
+import client
+import concurrency
 import os
 
 API_KEY = os.environ.get('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -7,7 +9,7 @@ BASE_URL = 'https://cog.api.br/api/v1'
 def search_web(query: str, max_results: int = 10):
     """Pesquisa web geral usando DuckDuckGo"""
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/search',
             params={'q': query, 'max': max_results},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -33,7 +35,7 @@ def search_web(query: str, max_results: int = 10):
 def search_news(query: str, max_results: int = 10):
     """Pesquisa de notícias"""
     try:
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/search/news',
             params={'q': query, 'max': max_results},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -54,31 +56,48 @@ def search_news(query: str, max_results: int = 10):
     except requests.exceptions.RequestException as e:
         print(f'❌ Erro: {e}')
 
+def _search_results(query: str) -> list:
+    response = client.get(
+        f'{BASE_URL}/search',
+        params={'q': query, 'max': 3},
+        headers={'Authorization': f'Bearer {API_KEY}'}
+    )
+    response.raise_for_status()
+    return response.json()['data']['results']
+
+def iter_multi_search(queries: list, ordered: bool = True):
+    """
+    Pesquisa múltipla em paralelo, entregando cada consulta ao terminar
+    
+    As consultas dividem os limites de taxa do client (o limitador
+    adaptativo decide quantas rodam por vez).
+    
+    Args:
+        queries: Lista de consultas
+        ordered: Entregar na ordem das consultas; False entrega cada uma
+            assim que termina
+    
+    Yields:
+        pipeline.Outcome por consulta: item é a consulta, value a lista
+        de resultados e error a exceção, se houve
+    """
+    return concurrency.fan_out(_search_results, queries, ordered=ordered)
+
 def multi_search(queries: list):
     """Pesquisa múltipla"""
     print('🔎 Pesquisa Múltipla:\n')
     
     results = {}
-    for query in queries:
-        try:
-            response = requests.get(
-                f'{BASE_URL}/search',
-                params={'q': query, 'max': 3},
-                headers={'Authorization': f'Bearer {API_KEY}'}
-            )
-            response.raise_for_status()
-            
-            data = response.json()['data']
-            results[query] = data['results']
-            
-            print(f'Query: "{query}"')
-            for r in data['results']:
-                print(f'  • {r["title"]}')
-            print('')
-            
-        except Exception as e:
-            print(f'Erro em "{query}": {e}')
-            results[query] = []
+    for outcome in iter_multi_search(queries):
+        if not outcome.ok:
+            print(f'Erro em "{outcome.item}": {outcome.error}')
+        results[outcome.item] = outcome.value or []
+    
+    for query, found in results.items():
+        print(f'Query: "{query}"')
+        for r in found:
+            print(f'  • {r["title"]}')
+        print('')
     
     return results
 
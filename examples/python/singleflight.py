@@ -0,0 +1,98 @@
+"""
+Cognima API - Request Coalescing (Python)
+
+While a request is in flight, identical requests (same method, path,
+normalized params/body and headers) wait for it and share its parsed result instead
+of hitting the API again. Results are shared objects: treat them as
+read-only.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+def request_key(method: str, url: str, params: Optional[Dict] = None, body: Any = None,
+                headers: Optional[Dict] = None) -> str:
+    """
+    Build a stable key for a request
+
+    Params given in the URL query string and via `params` are merged and
+    sorted, so argument order doesn't matter. Headers (an X-API-Key, for
+    instance, can change the answer) are folded in as a digest, so keys
+    never carry credentials.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        params: Query parameters
+        body: JSON body
+        headers: Request headers
+
+    Returns:
+        Key string
+    """
+    parts = urlsplit(url)
+    query = sorted(parse_qsl(parts.query) + [(str(k), str(v)) for k, v in (params or {}).items()])
+    key = f'{method.upper()} {parts.netloc.lower()}{parts.path}?{query}'
+
+    if body is not None:
+        key += ' ' + json.dumps(body, sort_keys=True, separators=(',', ':'))
+
+    if headers:
+        normalized = sorted((str(k).lower(), str(v)) for k, v in headers.items())
+        key += ' #' + hashlib.sha256(json.dumps(normalized).encode()).hexdigest()[:32]
+
+    return key
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class Group:
+    """Runs at most one call per key at a time and shares its result"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'coalesced': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Request key (see request_key)
+            fn: Callable that performs the request
+
+        Returns:
+            fn's result (the same object for every caller)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['calls'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -5,9 +5,13 @@ This file demonstrates how to use the SoundCloud endpoints
 to search and download tracks.
 """
 
-import requests
-import time
-from typing import List, Dict
+import client
+import concurrency
+import downloader
+import os
+import pipeline
+from store import ContentStore
+from typing import Iterator, List, Dict, Optional
 
 # API Configuration
 BASE_URL = 'https://cog.api.br/api/v1'
@@ -36,7 +40,7 @@ def search_soundcloud(query: str, limit: int = 10) -> List[Dict]:
         'limit': limit
     }
     
-    response = requests.get(f'{BASE_URL}/soundcloud/search', params=params, headers=headers)
+    response = client.get(f'{BASE_URL}/soundcloud/search', params=params, headers=headers)
     response.raise_for_status()
     
     data = response.json()
@@ -69,7 +73,7 @@ def search_one_track(query: str) -> Dict:
     
     params = {'q': query}
     
-    response = requests.get(f'{BASE_URL}/soundcloud/search-one', params=params, headers=headers)
+    response = client.get(f'{BASE_URL}/soundcloud/search-one', params=params, headers=headers)
     response.raise_for_status()
     
     data = response.json()
@@ -86,6 +90,30 @@ def search_one_track(query: str) -> Dict:
     
     return track
 
+def find_track(query: str) -> Dict:
+    """Search one track without printing it (for concurrent batches)"""
+    response = client.get(f'{BASE_URL}/soundcloud/search-one', params={'q': query}, headers=headers)
+    response.raise_for_status()
+    return response.json()['result']
+
+def iter_search_tracks(queries: List[str], ordered: bool = True) -> Iterator[pipeline.Outcome]:
+    """
+    Search for many tracks concurrently
+    
+    The searches share the client's rate limits, so a long list runs as
+    fast as the API allows without overloading it.
+    
+    Args:
+        queries: List of track names
+        ordered: Yield in query order; False yields each search as soon
+            as it finishes
+    
+    Yields:
+        pipeline.Outcome per query: item is the query, value the track
+        and error the exception, if the search failed
+    """
+    return concurrency.fan_out(find_track, queries, ordered=ordered)
+
 def search_multiple_tracks(queries: List[str]) -> List[Dict]:
     """
     Search for multiple different tracks
@@ -94,20 +122,19 @@ def search_multiple_tracks(queries: List[str]) -> List[Dict]:
         queries: List of track names
     
     Returns:
-        List of tracks found
+        List of tracks found, in the same order as queries (failed
+        searches are reported and skipped)
     """
     print('\n=== Searching Multiple Tracks ===\n')
     
     all_results = []
     
-    for query in queries:
-        params = {'q': query}
-        response = requests.get(f'{BASE_URL}/soundcloud/search-one', params=params, headers=headers)
-        response.raise_for_status()
-        
-        result = response.json()['result']
-        all_results.append(result)
-        print(f"✅ Found: {result['title']}")
+    for outcome in iter_search_tracks(queries):
+        if outcome.ok:
+            all_results.append(outcome.value)
+            print(f"✅ Found: {outcome.value['title']}")
+        else:
+            print(f'❌ Failed to search: {outcome.item} - {str(outcome.error)}')
     
     print(f'\n📋 Total tracks found: {len(all_results)}')
     return all_results
@@ -130,7 +157,7 @@ def get_recommendations(query: str, count: int = 5) -> List[Dict]:
         'limit': count
     }
     
-    response = requests.get(f'{BASE_URL}/soundcloud/search', params=params, headers=headers)
+    response = client.get(f'{BASE_URL}/soundcloud/search', params=params, headers=headers)
     response.raise_for_status()
     
     results = response.json()['results']
@@ -157,7 +184,7 @@ def download_track(url: str) -> Dict:
     
     params = {'url': url}
     
-    response = requests.get(f'{BASE_URL}/soundcloud/download', params=params, headers=headers)
+    response = client.get(f'{BASE_URL}/soundcloud/download', params=params, headers=headers)
     response.raise_for_status()
     
     data = response.json()
@@ -188,7 +215,7 @@ def search_and_download(query: str) -> Dict:
     
     params = {'q': query}
     
-    response = requests.get(f'{BASE_URL}/soundcloud/search-download', params=params, headers=headers)
+    response = client.get(f'{BASE_URL}/soundcloud/search-download', params=params, headers=headers)
     response.raise_for_status()
     
     data = response.json()
@@ -233,7 +260,7 @@ def search_by_genre(genre: str, limit: int = 10) -> List[Dict]:
         'limit': limit
     }
     
-    response = requests.get(f'{BASE_URL}/soundcloud/search', params=params, headers=headers)
+    response = client.get(f'{BASE_URL}/soundcloud/search', params=params, headers=headers)
     response.raise_for_status()
     
     results = response.json()['results']
@@ -264,7 +291,7 @@ def get_trending_tracks(query: str, limit: int = 10) -> List[Dict]:
         'limit': limit
     }
     
-    response = requests.get(f'{BASE_URL}/soundcloud/search', params=params, headers=headers)
+    response = client.get(f'{BASE_URL}/soundcloud/search', params=params, headers=headers)
     response.raise_for_status()
     
     results = response.json()['results']
@@ -280,30 +307,65 @@ def get_trending_tracks(query: str, limit: int = 10) -> List[Dict]:
     
     return trending
 
-def download_multiple_tracks(queries: List[str]) -> List[Dict]:
+def download_multiple_tracks(queries: List[str], output_dir: Optional[str] = None,
+                             resolve_workers: int = 4, download_workers: int = 2,
+                             store: Optional[ContentStore] = None) -> List[Dict]:
     """
     Search and download multiple tracks
     
+    With output_dir, files are saved while the next tracks are still
+    being resolved; each stage has its own worker count.
+    
     Args:
         queries: List of track searches
+        output_dir: Optional directory to save the files
+        resolve_workers: Concurrent search-download calls
+        download_workers: Concurrent file transfers
+        store: Optional content store; saved files become links into it
+            and tracks it already holds are not downloaded again
     
     Returns:
         List of download results
     """
     print('\n=== Downloading Multiple Tracks ===\n')
     
-    downloads = []
-    
-    for query in queries:
-        try:
-            result = search_and_download(query)
-            downloads.append(result)
-            print(f"✅ Downloaded: {result['download']['title']}")
-            time.sleep(1)  # Delay to avoid rate limiting
-        except Exception as e:
-            print(f"❌ Failed to download: {query} - {str(e)}")
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    def resolve(item):
+        i, query = item
+        result = search_and_download(query)
+        if not result:
+            raise ValueError('no results')
+        return i, result
+    
+    def fetch(item):
+        i, result = item
+        if not output_dir:
+            return result
+        output_path = os.path.join(output_dir, f'track_{i}.mp3')
         
-        print()
+        def download(path):
+            return downloader.download(result['download']['downloadUrl'], path, job_class='bulk')
+        
+        if store is not None:
+            store.fetch([result['track']['permalink_url']], output_path, download)
+        else:
+            download(output_path)
+        return dict(result, path=output_path)
+    
+    def report(outcome):
+        if outcome.ok:
+            print(f"✅ Downloaded: {outcome.value['download']['title']}\n")
+        else:
+            print(f"❌ Failed to download: {outcome.item[1]} - {str(outcome.error)}\n")
+    
+    outcomes = pipeline.run(
+        enumerate(queries, 1),
+        [('resolve', resolve, resolve_workers), ('download', fetch, download_workers)],
+        on_done=report
+    )
+    downloads = [outcome.value for outcome in outcomes if outcome.ok]
     
     print(f'\n📋 Downloaded {len(downloads)} tracks')
     return downloads
@@ -322,15 +384,14 @@ def create_playlist_from_searches(queries: List[str]) -> List[Dict]:
     
     playlist = []
     
-    for i, query in enumerate(queries, 1):
-        print(f'Adding track {i}/{len(queries)}...')
+    for outcome in iter_search_tracks(queries):
+        print(f'Adding track {outcome.index + 1}/{len(queries)}...')
         
-        try:
-            track = search_one_track(query)
-            playlist.append(track)
-            print(f'✅ Added: {track["title"]}\n')
-        except Exception as e:
-            print(f'❌ Failed to add: {query} - {str(e)}\n')
+        if outcome.ok:
+            playlist.append(outcome.value)
+            print(f'✅ Added: {outcome.value["title"]}\n')
+        else:
+            print(f'❌ Failed to add: {outcome.item} - {str(outcome.error)}\n')
     
     print(f'\n📋 Playlist created with {len(playlist)} tracks')
     return playlist
@@ -1,6 +1,9 @@
-import requests
-import time
-from typing import List, Dict, Optional
+import client
+import concurrency
+import downloader
+import pipeline
+from store import ContentStore
+from typing import Iterator, List, Dict, Optional
 from urllib.parse import quote
 
 BASE_URL = 'https://cog.api.br/api/v1'
@@ -23,7 +26,7 @@ def search_spotify(query: str, limit: int = 10) -> Dict:
         'limit': limit
     }
     
-    response = requests.get(f'{BASE_URL}/spotify/search', params=params)
+    response = client.get(f'{BASE_URL}/spotify/search', params=params)
     response.raise_for_status()
     
     data = response.json()
@@ -55,7 +58,7 @@ def search_one_track(query: str) -> Optional[Dict]:
     
     params = {'q': query}
     
-    response = requests.get(f'{BASE_URL}/spotify/search-one', params=params)
+    response = client.get(f'{BASE_URL}/spotify/search-one', params=params)
     response.raise_for_status()
     
     data = response.json()
@@ -71,6 +74,31 @@ def search_one_track(query: str) -> Optional[Dict]:
     
     return None
 
+def find_track(query: str) -> Optional[Dict]:
+    """Search one track without printing it (for concurrent batches)"""
+    response = client.get(f'{BASE_URL}/spotify/search-one', params={'q': query})
+    response.raise_for_status()
+    data = response.json()
+    return data['result'] if data['success'] else None
+
+def iter_search_tracks(queries: List[str], ordered: bool = True) -> Iterator[pipeline.Outcome]:
+    """
+    Search for many tracks concurrently
+    
+    The searches share the client's rate limits, so a long list runs as
+    fast as the API allows without overloading it.
+    
+    Args:
+        queries: List of search queries
+        ordered: Yield in query order; False yields each search as soon
+            as it finishes
+    
+    Yields:
+        pipeline.Outcome per query: item is the query, value the track
+        (or None if nothing matched) and error the exception, if any
+    """
+    return concurrency.fan_out(find_track, queries, ordered=ordered)
+
 def search_multiple_tracks(queries: List[str]) -> List[Dict]:
     """
     Search for multiple tracks from different artists
@@ -79,22 +107,18 @@ def search_multiple_tracks(queries: List[str]) -> List[Dict]:
         queries: List of search queries
     
     Returns:
-        List of results
+        List of results, in the same order as queries
     """
     print('\n=== Searching Multiple Tracks ===\n')
     
     results = []
     
-    for query in queries:
-        try:
-            result = search_one_track(query)
-            results.append({'query': query, 'result': result})
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
-        except Exception as e:
-            print(f'Failed to search: {query} - {str(e)}')
-            results.append({'query': query, 'error': str(e)})
+    for outcome in iter_search_tracks(queries):
+        if outcome.ok:
+            results.append({'query': outcome.item, 'result': outcome.value})
+        else:
+            print(f'Failed to search: {outcome.item} - {str(outcome.error)}')
+            results.append({'query': outcome.item, 'error': str(outcome.error)})
     
     return results
 
@@ -116,7 +140,7 @@ def get_recommendations(query: str, count: int = 5) -> List[Dict]:
         'limit': count
     }
     
-    response = requests.get(f'{BASE_URL}/spotify/search', params=params)
+    response = client.get(f'{BASE_URL}/spotify/search', params=params)
     response.raise_for_status()
     
     data = response.json()
@@ -142,16 +166,13 @@ def create_playlist_from_searches(queries: List[str]) -> List[Dict]:
     
     playlist = []
     
-    for query in queries:
-        try:
-            track = search_one_track(query)
-            if track:
-                playlist.append(track)
-                print(f"✅ Added: {track['name']} - {track['artists']}")
-        except Exception as e:
-            print(f"❌ Could not add: {query} - {str(e)}")
-        
-        time.sleep(0.5)
+    for outcome in iter_search_tracks(queries):
+        if not outcome.ok:
+            print(f"❌ Could not add: {outcome.item} - {str(outcome.error)}")
+        elif outcome.value:
+            track = outcome.value
+            playlist.append(track)
+            print(f"✅ Added: {track['name']} - {track['artists']}")
     
     print(f'\n📋 Playlist created with {len(playlist)} tracks')
     return playlist
@@ -180,13 +201,17 @@ def search_by_artist(artist: str, limit: int = 10) -> List[Dict]:
     print(f'\nFiltered to {len(filtered)} tracks by {artist}')
     return filtered
 
-def download_track(url: str, output_path: Optional[str] = None) -> Dict:
+def download_track(url: str, output_path: Optional[str] = None, job_class: str = 'interactive',
+                   store: Optional[ContentStore] = None) -> Dict:
     """
     Download track from Spotify by URL
     
     Args:
         url: Spotify track URL
         output_path: Optional path to save file
+        job_class: Bandwidth class for the transfer ('interactive' or 'bulk')
+        store: Optional content store; output_path becomes a link into it
+            and tracks it already holds are not downloaded again
     
     Returns:
         Dictionary with download information
@@ -196,18 +221,35 @@ def download_track(url: str, output_path: Optional[str] = None) -> Dict:
     
     params = {'url': url}
     
-    response = requests.get(f'{BASE_URL}/spotify/download', params=params, stream=True)
+    # Se especificar caminho, salvar arquivo (via .part, em uma única requisição à API)
+    if output_path:
+        def download(path):
+            return downloader.download(f'{BASE_URL}/spotify/download', path, params=params, job_class=job_class)
+        
+        if store is not None:
+            result = store.fetch([url], output_path, download)
+            if result['cached']:
+                print('♻️  Já baixado antes, reutilizando arquivo do store')
+        else:
+            result = download(output_path)
+        print('✅ Download Completo!\n')
+        print(f'💾 Arquivo salvo em: {output_path}')
+        if result['hash']:
+            print(f"🔒 {result['hash_algorithm']}: {result['hash']}")
+        
+        return {
+            'success': True,
+            'size': result['size'],
+            'hash': result['hash'],
+            'content_type': result.get('content_type'),
+            'filename': (result.get('content_disposition') or '').split('filename=')[-1].strip('"') or 'track.mp3'
+        }
+    
+    response = client.get(f'{BASE_URL}/spotify/download', params=params, stream=True)
     response.raise_for_status()
     
     print('✅ Download Completo!\n')
     
-    # Se especificar caminho, salvar arquivo
-    if output_path:
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        print(f'💾 Arquivo salvo em: {output_path}')
-    
     return {
         'success': True,
         'size': len(response.content),
@@ -215,6 +257,28 @@ def download_track(url: str, output_path: Optional[str] = None) -> Dict:
         'filename': response.headers.get('content-disposition', '').split('filename=')[-1].strip('"') or 'track.mp3'
     }
 
+def stream_track(url: str, *sinks, job_class: str = 'interactive') -> Dict:
+    """
+    Stream a track from Spotify into sinks without saving it to disk
+    
+    Every sink receives the same bytes in order (e.g. an upload, a
+    transcoder's stdin and a local file at once).
+    
+    Args:
+        url: Spotify track URL
+        *sinks: Sockets, binary file-like objects, hash objects or callables
+        job_class: Bandwidth class for the transfer ('interactive' or 'bulk')
+    
+    Returns:
+        Dictionary with size, hash, hash_algorithm and content_type
+    
+    Example:
+        proc = subprocess.Popen(['ffmpeg', '-i', '-', 'track.ogg'], stdin=subprocess.PIPE)
+        stream_track(url, proc.stdin)
+        proc.stdin.close()
+    """
+    return downloader.stream_to(f'{BASE_URL}/spotify/download', *sinks, params={'url': url}, job_class=job_class)
+
 def search_and_download(query: str, output_path: Optional[str] = None) -> Dict:
     """
     Search and download track automatically
@@ -231,7 +295,7 @@ def search_and_download(query: str, output_path: Optional[str] = None) -> Dict:
     # Primeiro busca para obter informações
     params = {'q': query}
     
-    search_response = requests.get(f'{BASE_URL}/spotify/search-one', params=params)
+    search_response = client.get(f'{BASE_URL}/spotify/search-one', params=params)
     search_response.raise_for_status()
     
     search_data = search_response.json()
@@ -252,13 +316,22 @@ def search_and_download(query: str, output_path: Optional[str] = None) -> Dict:
     
     return {}
 
-def download_multiple_tracks(queries: List[str], output_dir: str = './downloads') -> List[Dict]:
+def download_multiple_tracks(queries: List[str], output_dir: str = './downloads',
+                             resolve_workers: int = 4, download_workers: int = 2,
+                             store: Optional[ContentStore] = None) -> List[Dict]:
     """
     Search and download multiple tracks
     
+    Searches for upcoming tracks run while earlier ones are still
+    downloading; each stage has its own worker count.
+    
     Args:
         queries: List of track searches
         output_dir: Directory to save files
+        resolve_workers: Concurrent searches
+        download_workers: Concurrent downloads
+        store: Optional content store shared by all downloads (see
+            download_track)
     
     Returns:
         List of download results
@@ -270,19 +343,30 @@ def download_multiple_tracks(queries: List[str], output_dir: str = './downloads'
     # Criar diretório se não existir
     os.makedirs(output_dir, exist_ok=True)
     
-    downloads = []
-    
-    for i, query in enumerate(queries, 1):
-        try:
-            output_path = os.path.join(output_dir, f'track_{i}.mp3')
-            result = search_and_download(query, output_path)
-            downloads.append(result)
-            print(f"✅ Downloaded: {result['track']['name']}")
-            time.sleep(1)  # Delay to avoid rate limiting
-        except Exception as e:
-            print(f"❌ Failed to download: {query} - {str(e)}")
-        
-        print()
+    def resolve(item):
+        i, query = item
+        track = search_one_track(query)
+        if not track:
+            raise ValueError('no results')
+        return i, track
+    
+    def fetch(item):
+        i, track = item
+        output_path = os.path.join(output_dir, f'track_{i}.mp3')
+        return {'track': track, 'download': download_track(track['link'], output_path, job_class='bulk', store=store)}
+    
+    def report(outcome):
+        if outcome.ok:
+            print(f"✅ Downloaded: {outcome.value['track']['name']}\n")
+        else:
+            print(f"❌ Failed to download: {outcome.item[1]} - {str(outcome.error)}\n")
+    
+    outcomes = pipeline.run(
+        enumerate(queries, 1),
+        [('resolve', resolve, resolve_workers), ('download', fetch, download_workers)],
+        on_done=report
+    )
+    downloads = [outcome.value for outcome in outcomes if outcome.ok]
     
     print(f'\n📋 Downloaded {len(downloads)} tracks to {output_dir}')
     return downloads
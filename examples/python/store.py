@@ -0,0 +1,253 @@
+"""
+Cognima API - Content-Addressed Download Store (Python)
+
+Keeps every downloaded file once, named by its hash and sharded into
+two levels of subdirectories:
+
+    ~/.cache/cognima/store/objects/sha256/3f/a2/3fa2...e1
+
+Output paths such as downloads/track_1.mp3 become hardlinks (or
+symlinks, or copies, see COGNIMA_STORE_LINK) to the stored object, so
+the same media reached through different URLs or endpoints takes disk
+space once. A SQLite index maps source URLs to hashes: once a URL has
+been downloaded, asking for it again only creates a link, with no API
+call and no transfer. URLs are indexed by canonical.media_key, so
+x.com and twitter.com links to one tweet share an entry.
+
+    store = ContentStore()
+    store.fetch(['https://vimeo.com/123456789'], 'downloads/talk.mp4',
+                lambda path: downloader.download(resolve_url(), path))
+
+Stored objects are made read-only, since every hardlink shares them.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import canonical
+import integrity
+import singleflight
+
+STORE_PATH = os.getenv('COGNIMA_STORE_PATH', os.path.expanduser('~/.cache/cognima/store'))
+
+# How output paths point into the store: 'hardlink' (falls back to
+# symlink across filesystems), 'symlink' or 'copy'
+LINK_MODE = os.getenv('COGNIMA_STORE_LINK', 'hardlink')
+
+# Used to hash files that were downloaded without inline hashing
+FALLBACK_ALGORITHM = 'sha256'
+
+def _hash_file(path: str, algorithm: str) -> str:
+    digest = integrity.new_hash(algorithm)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            chunk = f.read(integrity.READ_BACK_SIZE)
+            if not chunk:
+                return digest.hexdigest()
+            digest.update(chunk)
+
+class ContentStore:
+    """
+    Hash-addressed file store with a source URL index
+
+    Args:
+        root: Store directory (objects, temporary downloads and index)
+        link_mode: 'hardlink', 'symlink' or 'copy'
+    """
+
+    def __init__(self, root: str = STORE_PATH, link_mode: str = LINK_MODE):
+        if link_mode not in ('hardlink', 'symlink', 'copy'):
+            raise ValueError(f'Unknown link mode: {link_mode}')
+        self.root = os.path.abspath(root)
+        self.link_mode = link_mode
+        self.stats = {'hits': 0, 'downloads': 0, 'duplicates': 0}
+
+        self._lock = threading.Lock()
+        self._flights = singleflight.Group()
+
+        os.makedirs(os.path.join(self.root, 'tmp'), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.root, 'index.sqlite'), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS objects ('
+            ' algorithm TEXT, hash TEXT, size INTEGER, created_at REAL, PRIMARY KEY (algorithm, hash))'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS sources (key TEXT PRIMARY KEY, algorithm TEXT, hash TEXT, updated_at REAL)'
+        )
+        self._db.commit()
+
+    def object_path(self, algorithm: str, digest: str) -> str:
+        """Path of an object in the store"""
+        return os.path.join(self.root, 'objects', algorithm, digest[:2], digest[2:4], digest)
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """
+        Find the stored object for a source URL
+
+        Args:
+            key: Source URL (or any other key passed to add/fetch)
+
+        Returns:
+            Dictionary with hash, hash_algorithm, size and path, or None
+            if the key is unknown or its object was removed
+        """
+        key = canonical.media_key(key)
+        with self._lock:
+            row = self._db.execute(
+                'SELECT o.algorithm, o.hash, o.size FROM sources s'
+                ' JOIN objects o ON o.algorithm = s.algorithm AND o.hash = s.hash WHERE s.key = ?',
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        algorithm, digest, size = row
+        path = self.object_path(algorithm, digest)
+        if not os.path.exists(path):
+            # Someone cleaned the objects directory: forget the object
+            with self._lock:
+                self._db.execute('DELETE FROM objects WHERE algorithm = ? AND hash = ?', (algorithm, digest))
+                self._db.commit()
+            return None
+        return {'hash': digest, 'hash_algorithm': algorithm, 'size': size, 'path': path}
+
+    def add(self, path: str, keys: Iterable[str] = (), digest: Optional[str] = None,
+            algorithm: Optional[str] = None) -> Dict:
+        """
+        Move a finished file into the store
+
+        If the store already holds the same content, the file is deleted
+        instead. Either way the keys are pointed at the object.
+
+        Args:
+            path: File to take over (must be on any local filesystem)
+            keys: Source URLs to record for it
+            digest: Hex digest, if it was computed while downloading
+            algorithm: Algorithm of digest
+
+        Returns:
+            Dictionary with hash, hash_algorithm, size, path and
+            duplicate (True if the content was already stored)
+        """
+        if digest is None or not algorithm:
+            algorithm = FALLBACK_ALGORITHM
+            digest = _hash_file(path, algorithm)
+
+        size = os.path.getsize(path)
+        target = self.object_path(algorithm, digest)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        duplicate = os.path.exists(target)
+        if duplicate:
+            os.remove(path)
+        else:
+            os.chmod(path, 0o444)
+            try:
+                os.replace(path, target)
+            except OSError:
+                # Different filesystem: copy next to the target, then rename
+                shutil.copyfile(path, target + '.tmp')
+                os.chmod(target + '.tmp', 0o444)
+                os.replace(target + '.tmp', target)
+                os.remove(path)
+
+        now = time.time()
+        with self._lock:
+            self.stats['duplicates'] += duplicate
+            self._db.execute('INSERT OR IGNORE INTO objects VALUES (?, ?, ?, ?)', (algorithm, digest, size, now))
+            self._db.executemany(
+                'INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)',
+                [(canonical.media_key(key), algorithm, digest, now) for key in keys]
+            )
+            self._db.commit()
+
+        return {'hash': digest, 'hash_algorithm': algorithm, 'size': size, 'path': target, 'duplicate': duplicate}
+
+    def link(self, entry: Dict, output_path: str) -> str:
+        """
+        Point an output path at a stored object (replacing any file there)
+
+        Args:
+            entry: Result of lookup() or add()
+            output_path: Human-readable path to create
+
+        Returns:
+            How it was linked: 'hardlink', 'symlink' or 'copy'
+        """
+        output_path = os.path.abspath(output_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        tmp_path = output_path + '.link'
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+
+        modes = {'hardlink': ('hardlink', 'symlink', 'copy'), 'symlink': ('symlink', 'copy'), 'copy': ('copy',)}
+        for mode in modes[self.link_mode]:
+            try:
+                if mode == 'hardlink':
+                    os.link(entry['path'], tmp_path)
+                elif mode == 'symlink':
+                    os.symlink(entry['path'], tmp_path)
+                else:
+                    shutil.copyfile(entry['path'], tmp_path)
+                break
+            except OSError:
+                # Cross-device or unsupported: try the next kind of link
+                if mode == 'copy':
+                    raise
+
+        os.replace(tmp_path, output_path)
+        return mode
+
+    def fetch(self, keys: List[str], output_path: str, download: Callable[[str], Dict]) -> Dict:
+        """
+        Link output_path to the stored copy of a source, downloading it
+        only if none of its keys is known
+
+        Concurrent fetches of the same first key share one download.
+
+        Args:
+            keys: Source URLs for the media (at least one)
+            output_path: Human-readable path to create
+            download: Called with a temporary path inside the store; must
+                write the file there and return downloader.download's
+                result (or any dict with hash and hash_algorithm)
+
+        Returns:
+            Dictionary with hash, hash_algorithm, size, path (of the
+            object), output_path, link and cached (True if nothing was
+            downloaded), plus the download result's fields
+        """
+        entry = next(filter(None, map(self.lookup, keys)), None)
+        if entry is not None:
+            with self._lock:
+                self.stats['hits'] += 1
+                # Remember any new aliases for next time
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)',
+                    [(canonical.media_key(key), entry['hash_algorithm'], entry['hash'], time.time()) for key in keys]
+                )
+                self._db.commit()
+            entry = dict(entry, cached=True)
+        else:
+            entry = self._flights.do(canonical.media_key(keys[0]), lambda: self._download(keys, download))
+
+        return dict(entry, output_path=output_path, link=self.link(entry, output_path))
+
+    def _download(self, keys: List[str], download: Callable[[str], Dict]) -> Dict:
+        # Named after the key, so an interrupted download resumes its .part
+        tmp_path = os.path.join(self.root, 'tmp', hashlib.sha1(canonical.media_key(keys[0]).encode()).hexdigest())
+        result = download(tmp_path)
+        with self._lock:
+            self.stats['downloads'] += 1
+        entry = self.add(tmp_path, keys, result.get('hash'), result.get('hash_algorithm'))
+        return {**result, **entry, 'cached': False}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
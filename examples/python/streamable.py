@@ -1,4 +1,5 @@
-import requests
+import client
+import formats
 
 API_BASE = 'https://cog.api.br/api/v1'
 
@@ -13,7 +14,7 @@ def download_streamable(url: str) -> dict:
         dict: Download data or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/streamable/download', params={'url': url})
+        response = client.get(f'{API_BASE}/streamable/download', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -45,7 +46,7 @@ def get_streamable_formats(url: str) -> list:
         list: Available formats or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/streamable/formats', params={'url': url})
+        response = client.get(f'{API_BASE}/streamable/formats', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -66,6 +67,35 @@ def get_streamable_formats(url: str) -> list:
         print(f'Request Error: {str(e)}')
         return None
 
+def select_streamable_format(url: str, spec: str = 'best') -> dict:
+    """
+    Pick one format for a Streamable video
+    
+    Args:
+        url: Streamable video URL
+        spec: Format spec (see formats.parse), e.g. 'best <=720p under 200MB'
+        
+    Returns:
+        dict: Selected format (with its url) or None if error or nothing matches
+    """
+    try:
+        data = client.get_json(f'{API_BASE}/streamable/formats', params={'url': url}, raise_for_status=False)
+        
+        if data.get('success'):
+            selected = formats.select(data['formats'], spec)
+            if selected:
+                print(f"Selected ({spec}): {selected['formatId']}")
+            else:
+                print(f'No format matches: {spec}')
+            return selected
+        else:
+            print(f"Error: {data.get('error')}")
+            return None
+            
+    except Exception as e:
+        print(f'Request Error: {str(e)}')
+        return None
+
 def get_streamable_info(url: str) -> dict:
     """
     Get information about Streamable video
@@ -77,7 +107,7 @@ def get_streamable_info(url: str) -> dict:
         dict: Video information or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/streamable/info', params={'url': url})
+        response = client.get(f'{API_BASE}/streamable/info', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -116,3 +146,8 @@ if __name__ == '__main__':
     # Example 3: Get video info
     print(f'Getting video info: {streamable_url}')
     get_streamable_info(streamable_url)
+    
+    print('\n=== Streamable Format Selection Example ===\n')
+    
+    # Example 4: Pick the format to download
+    select_streamable_format(streamable_url, 'best <=720p under 200MB')
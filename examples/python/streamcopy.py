@@ -0,0 +1,191 @@
+"""
+Cognima API - Stream Copy Core (Python)
+
+Moves a streamed response body into a file with as little Python work
+per byte as possible. One buffer is allocated per transfer and reused:
+`response.raw.readinto` fills it and the file is written from a
+memoryview of it. (urllib3 2.x still builds a bytes object per read
+inside readinto and copies it into the buffer; what the loop saves is
+iter_content's generator and chunk handling on our side.) The
+read size adapts between 64 KB and 4 MB from the measured throughput,
+aiming for reads of about TARGET_READ_SECONDS each. iter_body exposes
+the same loop as a generator for consumers other than files.
+"""
+
+import os
+import time
+from typing import Callable, Iterator, Optional
+
+import requests
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+
+MIN_BUFFER = 64 * 1024
+MAX_BUFFER = 4 * 1024 * 1024
+TARGET_READ_SECONDS = 0.05
+
+class BufferSizer:
+    """
+    Picks the next read size from how fast the last reads filled
+
+    Args:
+        initial: First read size
+        minimum: Smallest read size
+        maximum: Largest read size
+        target: Seconds one read should take
+    """
+
+    def __init__(self, initial: int = MIN_BUFFER, minimum: int = MIN_BUFFER,
+                 maximum: int = MAX_BUFFER, target: float = TARGET_READ_SECONDS):
+        self.size = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target = target
+
+    def update(self, requested: int, received: int, seconds: float) -> int:
+        """
+        Adjust the read size after one read
+
+        Args:
+            requested: Bytes asked for
+            received: Bytes that arrived
+            seconds: How long the read took
+
+        Returns:
+            The next read size
+        """
+        if received == requested and seconds < self.target / 2:
+            # Data is waiting faster than we drain it: read more per call
+            self.size = min(self.maximum, self.size * 2)
+        elif seconds > self.target * 2:
+            self.size = max(self.minimum, self.size // 2)
+        return self.size
+
+def _raw_reader(response: requests.Response):
+    """
+    Get a readinto() that fills our buffer from urllib3
+
+    Only for bodies without Content-Encoding: response.raw doesn't decode
+    by default, so compressed bodies go through iter_content instead.
+    """
+    encoding = response.headers.get('Content-Encoding', 'identity').lower()
+    readinto = getattr(response.raw, 'readinto', None)
+    if encoding != 'identity' or readinto is None:
+        return None
+    return readinto
+
+def _read(readinto, view: memoryview) -> int:
+    """readinto() with urllib3's errors translated the way iter_content does"""
+    try:
+        return readinto(view)
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e)
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e)
+    except SSLError as e:
+        raise requests.exceptions.SSLError(e)
+
+def write_all(f, view: memoryview):
+    """Write a whole memoryview (raw files and sockets may accept less per call)"""
+    while view:
+        written = f.write(view)
+        if written is None:
+            # Buffered or foreign file-likes that don't report a count
+            return
+        view = view[written:]
+
+def iter_body(response: requests.Response, expected: Optional[int] = None,
+              throttle: Optional[Callable[[int], None]] = None) -> Iterator[memoryview]:
+    """
+    Yield a streamed response body as memoryviews of one reused buffer
+
+    Each view is only valid until the next one is requested; copy it
+    (bytes(view)) to keep it.
+
+    Args:
+        response: Response opened with stream=True
+        expected: Stop after this many bytes
+        throttle: Called with each read's byte count; may block to pace
+            the transfer (see bandwidth.throttle_for)
+    """
+    sizer = BufferSizer()
+    received = 0
+    readinto = _raw_reader(response)
+
+    if readinto is None:
+        for chunk in response.iter_content(chunk_size=sizer.size):
+            if throttle is not None:
+                throttle(len(chunk))
+            yield memoryview(chunk)
+        return
+
+    buffer = bytearray(sizer.size)
+    view = memoryview(buffer)
+    try:
+        while expected is None or received < expected:
+            want = sizer.size if expected is None else min(sizer.size, expected - received)
+            if want > len(buffer):
+                buffer = bytearray(sizer.maximum)
+                view.release()
+                view = memoryview(buffer)
+
+            start = time.monotonic()
+            n = _read(readinto, view[:want])
+            if not n:
+                break
+            sizer.update(want, n, time.monotonic() - start)
+            if throttle is not None:
+                throttle(n)
+            yield view[:n]
+            received += n
+    finally:
+        view.release()
+
+    if expected is None or received == expected:
+        # Body fully read: hand the connection back to the pool
+        response.raw.release_conn()
+
+def copy_to_file(response: requests.Response, f, offset: int = 0, expected: Optional[int] = None,
+                 on_write: Optional[Callable[[int, memoryview], None]] = None,
+                 throttle: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Copy a streamed response body into an open file
+
+    Args:
+        response: Response opened with stream=True
+        f: File opened unbuffered (buffering=0) in a binary write mode
+        offset: Position in the file of the first byte
+        expected: Body length to enforce (raises if it ends early)
+        on_write: Called with (file offset, bytes) after each write; the
+            memoryview is only valid during the call
+        throttle: Called with each read's byte count; may block to pace
+            the transfer (see bandwidth.throttle_for)
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        requests.exceptions.ChunkedEncodingError: If fewer than expected
+            bytes arrived
+    """
+    f.seek(offset)
+    written = 0
+    for chunk in iter_body(response, expected, throttle):
+        write_all(f, chunk)
+        if on_write is not None:
+            on_write(offset + written, chunk)
+        written += len(chunk)
+
+    if expected is not None and written != expected:
+        raise requests.exceptions.ChunkedEncodingError(
+            f'Body at {offset} ended after {written} of {expected} bytes')
+    return written
+
+def fsync_path(path: str):
+    """Flush a file's data to stable storage"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,47 @@
+"""
+Canonical spellings keep the access tokens the API needs
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('COGNIMA_CACHE', '0')
+os.environ.setdefault('COGNIMA_QUOTA', '0')
+
+import canonical
+import client
+
+class CanonicalTest(unittest.TestCase):
+
+    def test_unlisted_vimeo_keeps_hash(self):
+        for url in ('https://vimeo.com/123456789/abcdef1234',
+                    'https://player.vimeo.com/video/123456789?h=abcdef1234&badge=0'):
+            self.assertEqual(canonical.canonicalize(url), 'https://vimeo.com/123456789/abcdef1234')
+            self.assertEqual(canonical.media_key(url), 'vimeo:123456789')
+        self.assertEqual(canonical.canonicalize('https://vimeo.com/123456789?share=copy'), 'https://vimeo.com/123456789')
+
+    def test_drive_keeps_resource_key(self):
+        expected = 'https://drive.google.com/file/d/1ABC123xyzDEF/view?resourcekey=0-XyZ_ab'
+        for url in ('https://drive.google.com/file/d/1ABC123xyzDEF/view?usp=sharing&resourcekey=0-XyZ_ab',
+                    'https://drive.google.com/open?resourcekey=0-XyZ_ab&id=1ABC123xyzDEF'):
+            self.assertEqual(canonical.canonicalize(url), expected)
+            self.assertEqual(canonical.media_key(url), 'gdrive:1ABC123xyzDEF')
+        self.assertEqual(canonical.canonicalize('https://drive.google.com/uc?id=1ABC123xyzDEF&export=download'),
+                         'https://drive.google.com/file/d/1ABC123xyzDEF/view')
+
+    def test_unknown_site_query_untouched(self):
+        self.assertEqual(canonical.canonicalize('https://Files.example/dl?sig=AbC%3D&utm_source=x&exp=1'),
+                         'https://files.example/dl?sig=AbC%3D&exp=1')
+
+    def test_client_keys_on_canonical_url_only(self):
+        url = f'{client.BASE_URL}/vimeo/info'
+        short = {'params': {'url': 'https://vimeo.com/123456789/abcdef1234'}}
+        player = {'params': {'url': 'https://player.vimeo.com/video/123456789?h=abcdef1234'}}
+        self.assertEqual(client._request_key('GET', url, short), client._request_key('GET', url, player))
+        # The caller's kwargs (what is sent) are not rewritten
+        self.assertEqual(player['params']['url'], 'https://player.vimeo.com/video/123456789?h=abcdef1234')
+
+if __name__ == '__main__':
+    unittest.main()
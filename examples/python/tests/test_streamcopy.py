@@ -0,0 +1,95 @@
+"""
+Stream copy and resume when a body drops mid-read
+
+A local server announces the whole file but closes the connection after
+CUT bytes on the first request, then serves ranges normally.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+os.environ.setdefault('COGNIMA_CACHE', '0')
+os.environ.setdefault('COGNIMA_QUOTA', '0')
+
+import requests
+
+import client
+import downloader
+import streamcopy
+from mock_server import expected_file
+
+SIZE = 1024 * 1024
+CUT = 100 * 1024
+BODY = expected_file(SIZE)
+
+class _CuttingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        start, end = 0, SIZE - 1
+        ranged = self.headers.get('Range', '').startswith('bytes=')
+        if ranged:
+            first, _, last = self.headers['Range'][len('bytes='):].partition('-')
+            start, end = int(first), min(int(last) if last else SIZE - 1, SIZE - 1)
+
+        self.send_response(206 if ranged else 200)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        if ranged:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{SIZE}')
+        self.end_headers()
+
+        with self.server.lock:
+            cut = not self.server.cut_done and end - start + 1 > CUT
+            self.server.cut_done = self.server.cut_done or cut
+        if cut:
+            self.wfile.write(BODY[start:start + CUT])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(BODY[start:end + 1])
+
+class DroppedBodyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _CuttingHandler)
+        self.server.lock = threading.Lock()
+        self.server.cut_done = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/file.bin'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_iter_body_raises_requests_error(self):
+        response = client.get(self.url, stream=True)
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            for _ in streamcopy.iter_body(response):
+                pass
+
+    def test_download_resumes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'file.bin')
+            result = downloader.download(self.url, path, connections=1)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), BODY)
+        self.assertEqual(result['size'], SIZE)
+
+    def test_stream_to_resumes(self):
+        sink = io.BytesIO()
+        downloader.stream_to(self.url, sink)
+        self.assertEqual(sink.getvalue(), BODY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
-import requests
+import client
+import formats
 
 API_BASE = 'https://cog.api.br/api/v1'
 
@@ -13,7 +14,7 @@ def download_twitch(url: str) -> dict:
         dict: Download data or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/twitch/download', params={'url': url})
+        response = client.get(f'{API_BASE}/twitch/download', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -46,7 +47,7 @@ def get_twitch_formats(url: str) -> list:
         list: Available formats or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/twitch/formats', params={'url': url})
+        response = client.get(f'{API_BASE}/twitch/formats', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -67,6 +68,35 @@ def get_twitch_formats(url: str) -> list:
         print(f'Request Error: {str(e)}')
         return None
 
+def select_twitch_format(url: str, spec: str = 'best') -> dict:
+    """
+    Pick one format for a Twitch clip or VOD
+    
+    Args:
+        url: Twitch clip or VOD URL
+        spec: Format spec (see formats.parse), e.g. 'best <=720p under 200MB'
+        
+    Returns:
+        dict: Selected format (with its url) or None if error or nothing matches
+    """
+    try:
+        data = client.get_json(f'{API_BASE}/twitch/formats', params={'url': url}, raise_for_status=False)
+        
+        if data.get('success'):
+            selected = formats.select(data['formats'], spec)
+            if selected:
+                print(f"Selected ({spec}): {selected['formatId']}")
+            else:
+                print(f'No format matches: {spec}')
+            return selected
+        else:
+            print(f"Error: {data.get('error')}")
+            return None
+            
+    except Exception as e:
+        print(f'Request Error: {str(e)}')
+        return None
+
 def get_twitch_info(url: str) -> dict:
     """
     Get information about Twitch clip or VOD
@@ -78,7 +108,7 @@ def get_twitch_info(url: str) -> dict:
         dict: Video information or None if error
     """
     try:
-        response = requests.get(f'{API_BASE}/twitch/info', params={'url': url})
+        response = client.get(f'{API_BASE}/twitch/info', params={'url': url})
         data = response.json()
         
         if data.get('success'):
@@ -120,3 +150,8 @@ if __name__ == '__main__':
     # Example 3: Get video info
     print(f'Getting video info: {clip_url}')
     get_twitch_info(clip_url)
+    
+    print('\n=== Twitch Format Selection Example ===\n')
+    
+    # Example 4: Pick the format to download
+    select_twitch_format(vod_url, 'best <=720p under 200MB')
@@ -1,4 +1,6 @@
 import requests
+import client
+import downloader
 import os
 
 API_KEY = os.environ.get('COGNIMA_API_KEY', 'ck_your_api_key')
@@ -11,7 +13,7 @@ def get_tweet_info():
         # Também funciona com x.com:
         # url = 'https://x.com/elonmusk/status/1234567890123456789'
         
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/twitter/info',
             params={'url': url},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -60,7 +62,7 @@ def download_twitter_media():
     try:
         url = 'https://twitter.com/user/status/1234567890123456789'
         
-        response = requests.get(
+        response = client.get(
             f'{BASE_URL}/twitter/download',
             params={'url': url},
             headers={'Authorization': f'Bearer {API_KEY}'}
@@ -89,15 +91,18 @@ def download_twitter_media():
 def download_video_to_disk(tweet_url: str, output_path: str):
     """Baixar vídeo do tweet para o disco"""
     try:
-        # Primeiro, obter os links de download
-        response = requests.get(
-            f'{BASE_URL}/twitter/download',
-            params={'url': tweet_url},
-            headers={'Authorization': f'Bearer {API_KEY}'}
-        )
-        response.raise_for_status()
+        def resolve():
+            # Links assinados expiram; pedir um novo à API quando preciso
+            response = client.get(
+                f'{BASE_URL}/twitter/download',
+                params={'url': tweet_url},
+                headers={'Authorization': f'Bearer {API_KEY}'}
+            )
+            response.raise_for_status()
+            return response.json()['data']
         
-        data = response.json()['data']
+        # Primeiro, obter os links de download
+        data = resolve()
         
         if not data['downloads']:
             print('❌ Nenhuma mídia encontrada no tweet')
@@ -108,12 +113,11 @@ def download_video_to_disk(tweet_url: str, output_path: str):
         media_type = data['downloads'][0]['type']
         
         print(f'⬇️  Baixando {media_type}...')
-        file_response = requests.get(download_url, stream=True)
-        file_response.raise_for_status()
-        
-        with open(output_path, 'wb') as f:
-            for chunk in file_response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        result = downloader.download(download_url, output_path, resolve=lambda: resolve()['downloads'][0]['url'])
+        if result['resumed_bytes']:
+            print(f"↩️  Retomado a partir de {result['resumed_bytes']} bytes")
+        if result['hash']:
+            print(f"🔒 {result['hash_algorithm']}: {result['hash']}")
         
         print(f'✅ Arquivo salvo em: {output_path}')
         
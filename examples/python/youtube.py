@@ -1,6 +1,9 @@
-import requests
+import bandwidth
+import client
+import jsonstream
 import os
-import base64
+import re
+import tempfile
 
 API_KEY = os.getenv('COGNIMA_API_KEY', 'ck_your_api_key')
 BASE_URL = 'https://cog.api.br/api/v1'
@@ -15,7 +18,7 @@ def search_youtube():
         'query': 'python programming tutorial'
     }
     
-    response = requests.post(url, json=data, headers=headers)
+    response = client.post(url, json=data, headers=headers)
     
     if response.status_code == 200:
         result = response.json()
@@ -28,6 +31,46 @@ def search_youtube():
     else:
         print(f"Error {response.status_code}: {response.json()}")
 
+def safe_path(directory: str, filename, default: str) -> str:
+    """
+    Turn a server-supplied filename into a new path inside `directory`
+
+    Path parts, control and reserved characters and leading dots are
+    dropped, and an existing file is never overwritten ("name (1).mp3").
+    """
+    name = os.path.basename(str(filename or '').replace('\\', '/'))
+    name = re.sub(r'[\x00-\x1f<>:"|?*]', '_', name).strip().lstrip('.') or default
+    stem, ext = os.path.splitext(name)
+    path = os.path.join(directory, name)
+    n = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f'{stem} ({n}){ext}')
+        n += 1
+    return path
+
+def save_buffer(response, directory: str = '.'):
+    """
+    Decode `data.buffer` of a streamed mp3/mp4 response to disk
+
+    The file is saved under a sanitized `data.filename` (see safe_path);
+    the returned body has `buffer` set to '', plus `path` (where the file
+    went) and `size` (bytes written) entries.
+    """
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.part', delete=False) as f:
+        try:
+            throttle = bandwidth.throttle_for(response.url)
+            result, size = jsonstream.save_response_field(response, 'buffer', f, throttle=throttle)
+        except Exception:
+            os.remove(f.name)
+            raise
+    
+    # The filename is only known once the metadata has been parsed
+    path = safe_path(directory, result['data'].get('filename'), 'download.bin')
+    os.replace(f.name, path)
+    result['data']['path'] = path
+    result['data']['size'] = size
+    return result
+
 def download_mp3():
     url = f'{BASE_URL}/youtube/mp3'
     headers = {
@@ -38,20 +81,16 @@ def download_mp3():
         'url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
     }
     
-    response = requests.post(url, json=data, headers=headers)
+    # Stream the body: `buffer` is decoded to disk as it arrives
+    response = client.post(url, json=data, headers=headers, stream=True)
     
     if response.status_code == 200:
-        result = response.json()
+        result = save_buffer(response)
         print('Audio downloaded!')
         print(f"Title: {result['data']['title']}")
         print(f"Duration: {result['data']['duration']}s")
         print(f"Filename: {result['data']['filename']}")
-        
-        # Save file
-        audio_data = base64.b64decode(result['data']['buffer'])
-        with open(result['data']['filename'], 'wb') as f:
-            f.write(audio_data)
-        print(f"Saved to {result['data']['filename']}")
+        print(f"Saved to {result['data']['path']}")
     else:
         print(f"Error {response.status_code}: {response.json()}")
 
@@ -66,10 +105,11 @@ def download_mp4():
         'quality': '720p'
     }
     
-    response = requests.post(url, json=data, headers=headers)
+    # Stream the body: only the metadata is kept, `buffer` is skipped
+    response = client.post(url, json=data, headers=headers, stream=True)
     
     if response.status_code == 200:
-        result = response.json()
+        result, _ = jsonstream.save_response_field(response, 'buffer', None)
         print('Video downloaded!')
         print(f"Title: {result['data']['title']}")
         print(f"Quality: {result['data']['quality']}")